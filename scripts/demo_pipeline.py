@@ -5,6 +5,7 @@ This script demonstrates the pipeline flow without requiring actual LLM calls.
 """
 
 import asyncio
+import io
 import sys
 from pathlib import Path
 
@@ -17,11 +18,11 @@ from mle_star.tools.web_search import search_ml_models_with_fallback, get_fallba
 from mle_star.api.run_manager import RunManager, PipelineRun
 
 
-def demo_web_search():
+async def demo_web_search(out: io.StringIO):
     """Demonstrate web search with fallback."""
-    print("\n" + "="*60)
-    print("DEMO: Web Search with Fallback")
-    print("="*60)
+    print("\n" + "="*60, file=out)
+    print("DEMO: Web Search with Fallback", file=out)
+    print("="*60, file=out)
     
     # Test fallback models for different task types
     test_cases = [
@@ -31,24 +32,30 @@ def demo_web_search():
         ("classification", "image"),
     ]
     
-    for task_type, modality in test_cases:
-        result = search_ml_models_with_fallback(
+    # Each lookup may block on HTTP, so fan them out and print in case order
+    results = await asyncio.gather(*(
+        asyncio.to_thread(
+            search_ml_models_with_fallback,
             task_type=task_type,
             data_modality=modality,
             num_results=2,
         )
-        print(f"\n{modality.upper()} {task_type.upper()}:")
+        for task_type, modality in test_cases
+    ))
+    
+    for (task_type, modality), result in zip(test_cases, results):
+        print(f"\n{modality.upper()} {task_type.upper()}:", file=out)
         for model in result.results:
-            print(f"  - {model.model_name}: {model.snippet[:60]}...")
+            print(f"  - {model.model_name}: {model.snippet[:60]}...", file=out)
     
-    print("\n✅ Web search fallback working correctly!")
+    print("\n✅ Web search fallback working correctly!", file=out)
 
 
-def demo_run_manager():
+async def demo_run_manager(out: io.StringIO):
     """Demonstrate run manager functionality."""
-    print("\n" + "="*60)
-    print("DEMO: Run Manager")
-    print("="*60)
+    print("\n" + "="*60, file=out)
+    print("DEMO: Run Manager", file=out)
+    print("="*60, file=out)
     
     manager = RunManager()
     
@@ -68,58 +75,58 @@ def demo_run_manager():
     )
     
     # Create a run
-    run = manager.create_run("demo_run_001", task, config)
-    print(f"\n✅ Created run: {run.run_id}")
-    print(f"   Status: {run.status}")
-    print(f"   Phases initialized: {list(run.phases.keys())}")
+    run = await asyncio.to_thread(manager.create_run, "demo_run_001", task, config)
+    print(f"\n✅ Created run: {run.run_id}", file=out)
+    print(f"   Status: {run.status}", file=out)
+    print(f"   Phases initialized: {list(run.phases.keys())}", file=out)
     
     # Update agent status
     run.update_agent_status(1, "retriever", "running", "Searching for models...")
-    print(f"\n✅ Updated retriever status to 'running'")
+    print(f"\n✅ Updated retriever status to 'running'", file=out)
     
     run.update_agent_status(1, "retriever", "completed", "Found 4 models")
-    print(f"✅ Updated retriever status to 'completed'")
+    print(f"✅ Updated retriever status to 'completed'", file=out)
     
     # Update phase status
     run.update_phase_status(1, "running", progress=25.0)
-    print(f"\n✅ Phase 1 progress: {run.phases[1]['progress']}%")
+    print(f"\n✅ Phase 1 progress: {run.phases[1]['progress']}%", file=out)
     
     # Add log
     run.add_log("info", "Retriever", "Found XGBoost, LightGBM, CatBoost, RandomForest")
-    print(f"✅ Added log entry (total logs: {len(run.logs)})")
+    print(f"✅ Added log entry (total logs: {len(run.logs)})", file=out)
     
     # List runs
-    runs = manager.list_runs()
-    print(f"\n✅ Total runs in manager: {len(runs)}")
+    runs = await asyncio.to_thread(manager.list_runs)
+    print(f"\n✅ Total runs in manager: {len(runs)}", file=out)
 
 
-def demo_config():
+async def demo_config(out: io.StringIO):
     """Demonstrate configuration."""
-    print("\n" + "="*60)
-    print("DEMO: Configuration")
-    print("="*60)
+    print("\n" + "="*60, file=out)
+    print("DEMO: Configuration", file=out)
+    print("="*60, file=out)
     
     # Default config
     config = MLEStarConfig()
-    print(f"\nDefault Configuration:")
-    print(f"  num_retrieved_models: {config.num_retrieved_models}")
-    print(f"  inner_loop_iterations: {config.inner_loop_iterations}")
-    print(f"  outer_loop_iterations: {config.outer_loop_iterations}")
-    print(f"  ensemble_iterations: {config.ensemble_iterations}")
-    print(f"  model_id: {config.model_id}")
+    print(f"\nDefault Configuration:", file=out)
+    print(f"  num_retrieved_models: {config.num_retrieved_models}", file=out)
+    print(f"  inner_loop_iterations: {config.inner_loop_iterations}", file=out)
+    print(f"  outer_loop_iterations: {config.outer_loop_iterations}", file=out)
+    print(f"  ensemble_iterations: {config.ensemble_iterations}", file=out)
+    print(f"  model_id: {config.model_id}", file=out)
     
     # Serialize/deserialize
     config_dict = config.to_dict()
     restored = MLEStarConfig.from_dict(config_dict)
-    print(f"\n✅ Config serialization/deserialization works!")
+    print(f"\n✅ Config serialization/deserialization works!", file=out)
     assert restored.num_retrieved_models == config.num_retrieved_models
 
 
-def demo_task_parsing():
+async def demo_task_parsing(out: io.StringIO):
     """Demonstrate task description parsing."""
-    print("\n" + "="*60)
-    print("DEMO: Task Description Parsing")
-    print("="*60)
+    print("\n" + "="*60, file=out)
+    print("DEMO: Task Description Parsing", file=out)
+    print("="*60, file=out)
     
     # Parse from text
     text = """
@@ -129,38 +136,38 @@ def demo_task_parsing():
     """
     
     task = TaskDescription.parse_from_text(text)
-    print(f"\nParsed Task:")
-    print(f"  task_type: {task.task_type}")
-    print(f"  data_modality: {task.data_modality}")
-    print(f"  evaluation_metric: {task.evaluation_metric}")
-    print(f"  dataset_path: {task.dataset_path}")
+    print(f"\nParsed Task:", file=out)
+    print(f"  task_type: {task.task_type}", file=out)
+    print(f"  data_modality: {task.data_modality}", file=out)
+    print(f"  evaluation_metric: {task.evaluation_metric}", file=out)
+    print(f"  dataset_path: {task.dataset_path}", file=out)
     
-    print("\n✅ Task parsing works!")
+    print("\n✅ Task parsing works!", file=out)
 
 
-def demo_fallback_models():
+async def demo_fallback_models(out: io.StringIO):
     """Demonstrate fallback model catalog."""
-    print("\n" + "="*60)
-    print("DEMO: Fallback Model Catalog")
-    print("="*60)
+    print("\n" + "="*60, file=out)
+    print("DEMO: Fallback Model Catalog", file=out)
+    print("="*60, file=out)
     
     response = get_fallback_models("classification", "tabular", num_results=4)
     
-    print(f"\nTabular Classification Models:")
+    print(f"\nTabular Classification Models:", file=out)
     for i, model in enumerate(response.results, 1):
-        print(f"\n{i}. {model.model_name}")
-        print(f"   URL: {model.url}")
-        print(f"   Description: {model.description[:80]}...")
-        print(f"   Example code available: {'Yes' if model.example_code else 'No'}")
+        print(f"\n{i}. {model.model_name}", file=out)
+        print(f"   URL: {model.url}", file=out)
+        print(f"   Description: {model.description[:80]}...", file=out)
+        print(f"   Example code available: {'Yes' if model.example_code else 'No'}", file=out)
     
-    print("\n✅ Fallback models include example code for immediate use!")
+    print("\n✅ Fallback models include example code for immediate use!", file=out)
 
 
-async def demo_api_models():
+async def demo_api_models(out: io.StringIO):
     """Demonstrate API models."""
-    print("\n" + "="*60)
-    print("DEMO: API Models")
-    print("="*60)
+    print("\n" + "="*60, file=out)
+    print("DEMO: API Models", file=out)
+    print("="*60, file=out)
     
     from mle_star.api.models import (
         PipelineStartRequest,
@@ -184,10 +191,10 @@ async def demo_api_models():
         ),
     )
     
-    print(f"\nPipeline Start Request:")
-    print(f"  Task: {request.task_description.description[:50]}...")
-    print(f"  Type: {request.task_description.task_type}")
-    print(f"  Models to retrieve: {request.config.num_retrieved_models}")
+    print(f"\nPipeline Start Request:", file=out)
+    print(f"  Task: {request.task_description.description[:50]}...", file=out)
+    print(f"  Type: {request.task_description.task_type}", file=out)
+    print(f"  Models to retrieve: {request.config.num_retrieved_models}", file=out)
     
     # Create a response
     response = PipelineStartResponse(
@@ -196,11 +203,34 @@ async def demo_api_models():
         message="Pipeline started successfully",
     )
     
-    print(f"\nPipeline Start Response:")
-    print(f"  Run ID: {response.run_id}")
-    print(f"  Status: {response.status}")
+    print(f"\nPipeline Start Response:", file=out)
+    print(f"  Run ID: {response.run_id}", file=out)
+    print(f"  Status: {response.status}", file=out)
     
-    print("\n✅ API models work correctly!")
+    print("\n✅ API models work correctly!", file=out)
+
+
+async def run_demos() -> list[str]:
+    """Run all demos concurrently.
+    
+    The demos share no state, so they are dispatched together and each one
+    writes into its own buffer. Buffers are returned in declaration order so
+    the printed output stays stable regardless of completion order.
+    
+    Returns:
+        Captured output of each demo, in display order
+    """
+    demos = [
+        demo_config,
+        demo_task_parsing,
+        demo_web_search,
+        demo_fallback_models,
+        demo_run_manager,
+        demo_api_models,
+    ]
+    buffers = [io.StringIO() for _ in demos]
+    await asyncio.gather(*(demo(out) for demo, out in zip(demos, buffers)))
+    return [out.getvalue() for out in buffers]
 
 
 def main():
@@ -209,12 +239,8 @@ def main():
     print("#" + " "*20 + "MLE-STAR DEMO" + " "*20 + "#")
     print("#"*60)
     
-    demo_config()
-    demo_task_parsing()
-    demo_web_search()
-    demo_fallback_models()
-    demo_run_manager()
-    asyncio.run(demo_api_models())
+    for output in asyncio.run(run_demos()):
+        print(output, end="")
     
     print("\n" + "="*60)
     print("ALL DEMOS COMPLETED SUCCESSFULLY! ✅")
@@ -2,36 +2,49 @@
 
 __version__ = "0.1.0"
 
-# Export core components
-from mle_star.models.config import MLEStarConfig
-from mle_star.models.data_models import (
-    TaskDescription,
-    ModelCandidate,
-    SolutionState,
-    RefinementAttempt,
-    EnsembleResult,
-)
+from mle_star._lazy import lazy_exports
 
-# Export graph orchestrators
-from mle_star.graphs import (
-    InitialSolutionGraph,
-    create_initial_solution_graph,
-    InitialSolutionState,
-    RefinementLoopNode,
-    RefinementGraph,
-    create_refinement_graph,
-    RefinementState,
-    EnsembleGraph,
-    create_ensemble_graph,
-    EnsembleState,
-)
+# Exported names grouped by the submodule that defines them. The graphs and
+# orchestrator pull in every agent (and strands), so exports are only imported
+# the first time they are accessed (PEP 562).
+_SUBMODULE_EXPORTS: dict[str, tuple[str, ...]] = {
+    # Configuration
+    "models.config": (
+        "MLEStarConfig",
+    ),
+    # Data Models
+    "models.data_models": (
+        "TaskDescription",
+        "ModelCandidate",
+        "CandidateBatch",
+        "CodeBlock",
+        "SolutionState",
+        "RefinementAttempt",
+        "EnsembleResult",
+    ),
+    # Graph Orchestrators
+    "graphs": (
+        "InitialSolutionGraph",
+        "create_initial_solution_graph",
+        "InitialSolutionState",
+        "RefinementLoopNode",
+        "RefinementGraph",
+        "create_refinement_graph",
+        "RefinementState",
+        "EnsembleGraph",
+        "create_ensemble_graph",
+        "EnsembleState",
+    ),
+    # Main Orchestrator
+    "orchestrator": (
+        "MLEStarOrchestrator",
+        "OrchestratorState",
+        "create_orchestrator",
+    ),
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, globals(), _SUBMODULE_EXPORTS)
 
-# Export main orchestrator
-from mle_star.orchestrator import (
-    MLEStarOrchestrator,
-    OrchestratorState,
-    create_orchestrator,
-)
 
 __all__ = [
     # Version
@@ -41,6 +54,8 @@ __all__ = [
     # Data Models
     "TaskDescription",
     "ModelCandidate",
+    "CandidateBatch",
+    "CodeBlock",
     "SolutionState",
     "RefinementAttempt",
     "EnsembleResult",
@@ -0,0 +1,47 @@
+"""Lazy exports for package __init__ modules (PEP 562).
+
+Packages whose submodules pull in heavy dependencies (strands, the model
+clients) list their exports here instead of importing them, so each
+submodule is only imported the first time one of its names is accessed.
+"""
+
+import importlib
+from typing import Any, Callable
+
+
+def lazy_exports(
+    package: str,
+    namespace: dict[str, Any],
+    submodule_exports: dict[str, tuple[str, ...]],
+) -> tuple[Callable[[str], Any], Callable[[], list[str]]]:
+    """Build a package's module __getattr__ and __dir__.
+    
+    Args:
+        package: The package's __name__
+        namespace: The package's globals(), which cache imported names
+        submodule_exports: Exported names grouped by the submodule (relative
+            to the package) that defines them
+    
+    Returns:
+        Tuple of (__getattr__, __dir__) for the package module
+    """
+    lazy_imports = {
+        name: f"{package}.{submodule}"
+        for submodule, names in submodule_exports.items()
+        for name in names
+    }
+    
+    def __getattr__(name: str) -> Any:
+        """Import exported names on first access."""
+        module_name = lazy_imports.get(name)
+        if module_name is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module_name), name)
+        namespace[name] = value
+        return value
+    
+    def __dir__() -> list[str]:
+        """List module attributes including not-yet-imported exports."""
+        return sorted(set(namespace) | set(lazy_imports))
+    
+    return __getattr__, __dir__
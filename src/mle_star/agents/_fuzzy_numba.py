@@ -0,0 +1,68 @@
+"""Numba kernel for the coder's fuzzy block search.
+
+Importing this module requires numba and numpy; coder falls back to its
+pure-Python search when they are not installed.
+"""
+
+import numba
+import numpy as np
+
+
+@numba.njit(cache=True)
+def find_window(
+    line_ids: np.ndarray,
+    in_pattern: np.ndarray,
+    candidates: np.ndarray,
+    window_size: int,
+    pattern_size: int,
+    threshold: float,
+) -> int:
+    """Find the first candidate line whose window is similar to the pattern.
+    
+    Lines are given as dense integer ids (-1 for empty lines). A window of
+    window_size lines is slid over them while the number of distinct ids in
+    the window, and how many of those are pattern lines, is kept up to date.
+    
+    Args:
+        line_ids: Id of each stripped text line, -1 for empty lines
+        in_pattern: Whether each id is a line of the pattern
+        candidates: Whether a match may start at each text line
+        window_size: Number of lines in the pattern
+        pattern_size: Number of distinct non-empty pattern lines
+        threshold: Jaccard similarity threshold (0-1)
+    
+    Returns:
+        Index of the first matching line, or -1 if none matches
+    """
+    counts = np.zeros(in_pattern.shape[0], dtype=np.int64)
+    n = line_ids.shape[0]
+    distinct = 0
+    intersection = 0
+    
+    for i in range(-1, n - 1):
+        # Slide the window to start at line i + 1
+        if i >= 0:
+            removed = line_ids[i]
+            if removed >= 0:
+                counts[removed] -= 1
+                if counts[removed] == 0:
+                    distinct -= 1
+                    if in_pattern[removed]:
+                        intersection -= 1
+        first_added = i + window_size if i >= 0 else 0
+        for j in range(first_added, min(i + 1 + window_size, n)):
+            added = line_ids[j]
+            if added >= 0:
+                counts[added] += 1
+                if counts[added] == 1:
+                    distinct += 1
+                    if in_pattern[added]:
+                        intersection += 1
+        
+        start = i + 1
+        if candidates[start] and pattern_size > 0 and distinct > 0:
+            union = pattern_size + distinct - intersection
+            if intersection / union >= threshold:
+                return start
+    
+    return -1
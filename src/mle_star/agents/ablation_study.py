@@ -4,14 +4,33 @@ This agent generates and executes ablation study code to evaluate the
 contribution of individual ML components by modifying or disabling them.
 """
 
-from typing import Optional
-from dataclasses import dataclass
+import ast
+import asyncio
+import copy
+import hashlib
+import os
+import re
+from array import array
+from functools import lru_cache
+from typing import Any, Iterator, Optional
+from dataclasses import dataclass, field
 from strands import Agent, tool
 
 from mle_star.models.data_models import TaskDescription, SolutionState
 from mle_star.models.config import MLEStarConfig
-from mle_star.models.model_factory import create_model
-from mle_star.tools.execute_python import execute_python, ExecutionResult
+from mle_star.models.model_factory import (
+    create_model,
+    get_cached_response,
+    cache_response,
+    pooled_agent,
+    response_to_text,
+    use_response_cache,
+)
+from mle_star.tools.execute_python import (
+    execute_python_async,
+    filter_framework_logs,
+    ExecutionResult,
+)
 
 
 ABLATION_STUDY_SYSTEM_PROMPT = """You are an ML diagnostician who systematically identifies which pipeline components drive model performance.
@@ -46,7 +65,14 @@ For each identified component:
 </ablation_methodology>
 
 <output_format>
-Print results in this EXACT format (parseable):
+Emit the study as independent scripts so they can be executed in parallel:
+- One ```python block per run, whose FIRST line is `# COMPONENT: <component_name>`
+- Use `# COMPONENT: Baseline` for the unmodified full pipeline
+- Each block is a complete, self-contained script (imports, data loading, training, evaluation)
+- Each block prints its score as: Final Validation Performance: {score:.6f}
+
+If the study cannot be split into independent scripts, execute a single script with
+run_ablation_code that prints results in this EXACT format (parseable):
 ```
 Ablation Results:
 - Baseline: {score:.6f}
@@ -57,6 +83,24 @@ Most Impactful: {component_name} (impact: {delta:+.6f})
 ```
 </output_format>
 
+<batching>
+A single-script study must run every configuration in one Python process:
+- Load X, y exactly ONCE at the top of the script and compute the train/val split ONCE
+- Loop over the ablation configurations in-process; never reload data or re-import libraries inside the loop
+- Print each score as soon as it is computed with print(..., flush=True)
+run_ablation_code rejects scripts that read the dataset inside the loop.
+</batching>
+
+<caching_strategy>
+The baseline and every ablation refit the same preprocessing; avoid repeating that work:
+- Wrap data loading and preprocessor fitting in functions memoized with
+  `joblib.Memory(location=os.path.join(tempfile.gettempdir(), "mle_star_ablation_cache"), verbose=0)`
+- Pass the training data and the preprocessor configuration as arguments, so the cache is keyed by
+  (data, preprocessor_config) and returns the already-fitted transformer
+- In each ablation, reuse the cached fit for every component that is not under ablation and refit
+  only the component being ablated
+</caching_strategy>
+
 <exploration_guidance>
 If previous ablation summaries exist:
 - Explore DIFFERENT components than those already studied
@@ -72,20 +116,94 @@ If previous ablation summaries exist:
 </code_requirements>"""
 
 
-@dataclass
+# Single-pass pattern for parsing ablation output, compiled once at import time.
+# Alternatives are tried in order at each position:
+#   "Baseline: <score>"
+#   "Without <component>: <score> (impact: <delta>)"
+#   "Without <component>: <score>" (no explicit impact)
+_ABLATION_RESULT_REGEX = (
+    r"(?P<baseline>Baseline[:\s]*(?P<baseline_score>[-+]?\d*\.?\d+))"
+    r"|(?P<impact_line>Without\s+(?P<impact_component>[^:\n]+)[:\s]*[-+]?\d*\.?\d+"
+    r"\s*\(impact[:\s]*(?P<impact>[-+]?\d*\.?\d+)\))"
+    r"|(?P<score_line>Without\s+(?P<score_component>[^:\n]+)[:\s]*(?P<score>[-+]?\d*\.?\d+))"
+)
+_ABLATION_RESULT_PATTERN = re.compile(_ABLATION_RESULT_REGEX, re.IGNORECASE)
+
+# Every _ABLATION_RESULT_PATTERN match starts with one of these keywords
+# (case-insensitive), which lets a multi-literal scanner locate candidates
+_ABLATION_RESULT_KEYWORDS = (b"baseline", b"without")
+
+# Outputs above this size are pre-scanned with hyperscan when it is installed
+_HYPERSCAN_MIN_LENGTH = 64_000
+
+# Outputs above this size are scanned with RE2 when it is installed (and
+# hyperscan is not used); below it, compile and call overhead dominates
+_RE2_MIN_LENGTH = 16_000
+
+
+# Fenced code block whose first line is "# COMPONENT: <name>"
+_COMPONENT_BLOCK_PATTERN = re.compile(
+    r"```(?:python)?[ \t]*\n[ \t]*#[ \t]*COMPONENT:[ \t]*(?P<name>[^\n]+?)[ \t]*\n(?P<code>.*?)```",
+    re.DOTALL,
+)
+
+# Calls that read the dataset (besides any read_* call); a single-script
+# study should make them once, outside the ablation loop. Splitting is not
+# included, since cross-validation legitimately splits on every run
+_DATA_LOADING_CALLS = ("load_dataset",)
+
+# Calls that train a model, marking a loop as the ablation loop
+_TRAINING_CALLS = ("fit", "fit_transform", "cross_val_score", "cross_validate", "train")
+
+# Component name marking the unmodified pipeline among the ablation blocks
+BASELINE_COMPONENT = "Baseline"
+
+
+# Cache of successful ablation studies keyed by _get_ablation_cache_key
+_ablation_cache: dict[str, "AblationResult"] = {}
+
+
+@dataclass(slots=True)
 class AblationResult:
-    """Result of an ablation study."""
+    """Result of an ablation study.
+    
+    component_names and impact_array hold component_impacts as parallel
+    sequences, so impacts can be scanned without iterating the dict.
+    """
     baseline_score: float
     component_impacts: dict[str, float]  # component_name -> impact (delta from baseline)
     raw_output: str
     success: bool
     error_message: Optional[str] = None
+    component_names: tuple[str, ...] = field(init=False, repr=False, compare=False)
+    impact_array: array = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self) -> None:
+        self.component_names = tuple(self.component_impacts)
+        self.impact_array = array("d", self.component_impacts.values())
+    
+    @property
+    def most_impactful_index(self) -> Optional[int]:
+        """Index of the component with the largest absolute impact, if any."""
+        if not self.impact_array:
+            return None
+        magnitudes = [abs(impact) for impact in self.impact_array]
+        return magnitudes.index(max(magnitudes))
+    
+    @property
+    def most_impactful_component(self) -> Optional[str]:
+        """Name of the component with the largest absolute impact, if any."""
+        index = self.most_impactful_index
+        return None if index is None else self.component_names[index]
 
 
 @tool
-def run_ablation_code(code: str, timeout: int = 600) -> str:
+async def run_ablation_code(code: str, timeout: int = 600) -> str:
     """Execute ablation study Python code and return the results.
     
+    The subprocess is awaited without blocking, so the event loop stays free
+    for other agents while the study executes.
+    
     Args:
         code: Python code for ablation study to execute
         timeout: Maximum execution time in seconds (default: 600 for longer studies)
@@ -93,7 +211,36 @@ def run_ablation_code(code: str, timeout: int = 600) -> str:
     Returns:
         Execution results including ablation study output
     """
-    result: ExecutionResult = execute_python(code=code, timeout=timeout)
+    return await _run_ablation_code(code, timeout, filter_logs=True)
+
+
+@tool(name="run_ablation_code")
+async def run_ablation_code_unfiltered(code: str, timeout: int = 600) -> str:
+    """Execute ablation study Python code and return the results.
+    
+    The subprocess is awaited without blocking, so the event loop stays free
+    for other agents while the study executes.
+    
+    Args:
+        code: Python code for ablation study to execute
+        timeout: Maximum execution time in seconds (default: 600 for longer studies)
+        
+    Returns:
+        Execution results including the full ablation study output
+    """
+    return await _run_ablation_code(code, timeout, filter_logs=False)
+
+
+async def _run_ablation_code(code: str, timeout: int, filter_logs: bool) -> str:
+    """Execute ablation code and format the results for the agent."""
+    # Reject unbatched studies before paying for a run
+    if _loads_data_in_loop(code):
+        return (
+            "Code reads the dataset inside the ablation loop; "
+            "rewrite it to load the data once at the top of the script."
+        )
+    
+    result: ExecutionResult = await execute_python_async(code, timeout=timeout)
     
     output_parts = []
     
@@ -102,11 +249,13 @@ def run_ablation_code(code: str, timeout: int = 600) -> str:
     else:
         output_parts.append(f"Execution failed with return code: {result.return_code}")
     
-    if result.stdout:
-        output_parts.append(f"\nStdout:\n{result.stdout}")
+    # Score lines are kept by the filter; only framework log noise is dropped
+    stdout = filter_framework_logs(result.stdout) if filter_logs else result.stdout
+    if stdout:
+        output_parts.extend(("\nStdout:", stdout))
     
     if result.stderr:
-        output_parts.append(f"\nStderr:\n{result.stderr}")
+        output_parts.extend(("\nStderr:", result.stderr))
     
     if result.error_message:
         output_parts.append(f"\nError: {result.error_message}")
@@ -114,6 +263,61 @@ def run_ablation_code(code: str, timeout: int = 600) -> str:
     return "\n".join(output_parts)
 
 
+def _loads_data_in_loop(code: str) -> bool:
+    """Check whether ablation code reloads the dataset on every ablation run.
+    
+    Flags loops that both read the dataset (read_* or load_dataset calls)
+    and train a model, directly or through module-level functions. Loops that only load (e.g.
+    reading several files) are fine, and code that does not parse is left
+    for the execution to report.
+    
+    Args:
+        code: Python code for the ablation study
+        
+    Returns:
+        True if the dataset is read inside the training loop
+    """
+    try:
+        tree = ast.parse(code)
+    except SyntaxError:
+        return False
+    
+    functions = [
+        node for node in tree.body
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))
+    ]
+    
+    def called_names(node: ast.AST) -> set[str]:
+        names = set()
+        for child in ast.walk(node):
+            if isinstance(child, ast.Call):
+                func = child.func
+                if isinstance(func, ast.Attribute):
+                    names.add(func.attr)
+                elif isinstance(func, ast.Name):
+                    names.add(func.id)
+        return names
+    
+    def with_callers(names: set[str]) -> set[str]:
+        # Include module-level functions that make one of the calls
+        callers = {f.name for f in functions if called_names(f) & names}
+        return names | callers
+    
+    read_names = {
+        name for name in called_names(tree)
+        if name.startswith("read_") or name in _DATA_LOADING_CALLS
+    }
+    loading_names = with_callers(read_names)
+    training_names = with_callers(set(_TRAINING_CALLS))
+    
+    for loop in ast.walk(tree):
+        if isinstance(loop, (ast.For, ast.AsyncFor, ast.While)):
+            calls = called_names(loop)
+            if calls & loading_names and calls & training_names:
+                return True
+    return False
+
+
 def create_ablation_study_agent(config: MLEStarConfig) -> Agent:
     """Create an Ablation Study Agent configured with the given settings.
     
@@ -126,7 +330,9 @@ def create_ablation_study_agent(config: MLEStarConfig) -> Agent:
     return Agent(
         name="ablation_study",
         system_prompt=ABLATION_STUDY_SYSTEM_PROMPT,
-        tools=[run_ablation_code],
+        tools=[
+            run_ablation_code if config.filter_framework_logs else run_ablation_code_unfiltered
+        ],
         model=create_model(config),
         temperature=config.temperature,
         max_tokens=config.max_tokens,
@@ -148,19 +354,23 @@ def build_ablation_prompt(
     """
     previous_summaries = ""
     if solution_state.ablation_summaries:
-        previous_summaries = "\n\n## Previous Ablation Summaries\n"
-        for i, summary in enumerate(solution_state.ablation_summaries, 1):
-            previous_summaries += f"\n### Iteration {i}:\n{summary}\n"
-        previous_summaries += "\nPlease explore DIFFERENT parts of the pipeline than those already studied."
+        summary_parts = ["\n\n## Previous Ablation Summaries\n"]
+        summary_parts.extend(
+            f"\n### Iteration {i}:\n{summary}\n"
+            for i, summary in enumerate(solution_state.ablation_summaries, 1)
+        )
+        summary_parts.append("\nPlease explore DIFFERENT parts of the pipeline than those already studied.")
+        previous_summaries = "".join(summary_parts)
     
     refined_blocks_info = ""
     if solution_state.refined_blocks:
-        refined_blocks_info = "\n\n## Previously Refined Blocks\n"
-        refined_blocks_info += "The following code blocks have already been refined:\n"
-        for block in solution_state.refined_blocks:
-            # Show first 100 chars of each block for context
-            preview = block[:100].replace('\n', ' ') + "..." if len(block) > 100 else block
-            refined_blocks_info += f"- {preview}\n"
+        block_parts = [
+            "\n\n## Previously Refined Blocks\n",
+            "The following code blocks have already been refined:\n",
+        ]
+        # Previews (first 100 chars of each block) are cached on the state
+        block_parts.extend(f"- {preview}\n" for preview in solution_state.refined_block_previews)
+        refined_blocks_info = "".join(block_parts)
     
     return f"""Generate Python code to perform an ablation study on the following ML solution.
 
@@ -179,51 +389,80 @@ def build_ablation_prompt(
 ## Requirements
 1. Identify 3-5 distinct ML components in the solution
 2. For each component, create a variation that disables or simplifies it
-3. Run each variation and measure validation performance
-4. Print results in this exact format:
-   Ablation Results:
-   - Baseline: <score>
-   - Without <component_name>: <score> (impact: <delta>)
-   ...
+3. Write the full pipeline and each variation as separate, self-contained ```python blocks
+4. Start each block with `# COMPONENT: <component_name>` (`# COMPONENT: {BASELINE_COMPONENT}` for the full pipeline)
+5. Each block must print: Final Validation Performance: <score>
 
-Generate the ablation study code and execute it using run_ablation_code."""
+The blocks are executed in parallel after you respond, so do not run them yourself."""
 
 
 async def run_ablation_study(
     task: TaskDescription,
     solution_state: SolutionState,
     config: MLEStarConfig,
+    use_cache: bool = True,
 ) -> AblationResult:
     """Run an ablation study on the current solution.
     
-    This function creates an agent, generates ablation study code, executes it,
-    and returns structured results about component impacts.
+    This function checks out a pooled agent, generates ablation study code, executes it,
+    and returns structured results about component impacts. The response is
+    streamed so each component block starts executing as soon as it has been
+    generated, overlapping execution with generation of the remaining blocks.
+    Successful studies are cached by their prompt, so a change to anything
+    the prompt shows the agent (such as a new ablation summary) runs a new
+    study; as with agent responses, only at temperature 0, since a sampled
+    study should not be replayed.
     
     Args:
         task: The ML task description
         solution_state: Current solution state
         config: MLE-STAR configuration
+        use_cache: Whether to use cache
         
     Returns:
         AblationResult with component impacts
     """
-    agent = create_ablation_study_agent(config)
     prompt = build_ablation_prompt(task, solution_state)
+    cache_key = _get_ablation_cache_key(prompt)
+    use_cache = use_response_cache(config, use_cache)
+    
+    # A rejected refinement leaves the solution unchanged, so the same study
+    # can come around again; reuse it instead of re-running the agent
+    if use_cache and cache_key in _ablation_cache:
+        return copy.deepcopy(_ablation_cache[cache_key])
     
     try:
-        response = await agent.invoke_async(prompt)
-        response_text = str(response)
+        # Reuse an idle agent from earlier iterations instead of rebuilding it
+        with pooled_agent(config, create_ablation_study_agent) as agent:
+            response_text, executions = await _stream_ablation_response(
+                agent, prompt, config, use_cache=use_cache
+            )
+        agent_response = response_text
         
-        # Parse the ablation results
-        baseline_score, component_impacts = parse_ablation_results(response_text)
+        if BASELINE_COMPONENT in executions and len(executions) > 1:
+            # The agent split the study into per-component blocks
+            results = await asyncio.gather(*executions.values())
+            results_text = format_ablation_results(dict(zip(executions, results)))
+            response_text = f"{response_text}\n\n{results_text}"
+            baseline_score, component_impacts = parse_ablation_results(results_text)
+        else:
+            await _cancel_executions(executions)
+            # Parse the ablation results
+            baseline_score, component_impacts = parse_ablation_results(response_text)
         
-        return AblationResult(
+        result = AblationResult(
             baseline_score=baseline_score,
             component_impacts=component_impacts,
             raw_output=response_text,
             success=len(component_impacts) > 0,
             error_message=None if component_impacts else "Failed to parse ablation results",
         )
+        
+        if result.success and use_cache:
+            _ablation_cache[cache_key] = copy.deepcopy(result)
+            cache_response(agent, prompt, agent_response, config)
+        
+        return result
     except Exception as e:
         return AblationResult(
             baseline_score=0.0,
@@ -234,6 +473,272 @@ async def run_ablation_study(
         )
 
 
+async def _stream_ablation_response(
+    agent: Agent,
+    prompt: str,
+    config: MLEStarConfig,
+    timeout: int = 600,
+    use_cache: bool = True,
+) -> tuple[str, dict[str, "asyncio.Task[ExecutionResult]"]]:
+    """Stream the agent response, executing component blocks as they close.
+    
+    A cached response for the same prompt is replayed without calling the
+    LLM.
+    
+    Args:
+        agent: Ablation study agent
+        prompt: Prompt to send to the agent
+        config: MLE-STAR configuration the agent was built from
+        timeout: Maximum execution time in seconds for each block
+        use_cache: Whether to use the agent response cache
+        
+    Returns:
+        Tuple of (final response text, dict mapping component name to its
+        execution task)
+    """
+    semaphore = asyncio.Semaphore(os.cpu_count() or 1)
+    executions: dict[str, asyncio.Task[ExecutionResult]] = {}
+    
+    cached_text = get_cached_response(agent, prompt, config) if use_cache else None
+    if cached_text is not None:
+        for name, code in extract_component_blocks(cached_text).items():
+            executions[name] = asyncio.create_task(
+                _execute_ablation_block(code, semaphore, timeout)
+            )
+        return cached_text, executions
+    
+    streamed_text = ""
+    final_text: Optional[str] = None
+    scan_pos = 0
+    
+    try:
+        async for event in agent.stream_async(prompt):
+            if "data" in event:
+                chunk = event["data"]
+                streamed_text += chunk
+                # A block can only complete on a chunk carrying a closing fence
+                if "`" not in chunk:
+                    continue
+                # Only complete blocks match, so partial blocks are picked up later
+                for match in _COMPONENT_BLOCK_PATTERN.finditer(streamed_text, scan_pos):
+                    name = _component_name(match)
+                    if name not in executions:
+                        executions[name] = asyncio.create_task(
+                            _execute_ablation_block(match.group("code").strip(), semaphore, timeout)
+                        )
+                    scan_pos = match.end()
+            elif "result" in event:
+                final_text = response_to_text(event["result"])
+    except BaseException:
+        await _cancel_executions(executions)
+        raise
+    
+    return (final_text if final_text is not None else streamed_text), executions
+
+
+async def _execute_ablation_block(
+    code: str,
+    semaphore: asyncio.Semaphore,
+    timeout: int,
+) -> ExecutionResult:
+    """Execute one ablation block, bounded by semaphore; cancelling kills it."""
+    async with semaphore:
+        return await execute_python_async(code, timeout=timeout)
+
+
+async def _cancel_executions(executions: dict[str, "asyncio.Task[ExecutionResult]"]) -> None:
+    """Cancel block executions and wait until their scripts are killed."""
+    for execution in executions.values():
+        execution.cancel()
+    await asyncio.gather(*executions.values(), return_exceptions=True)
+
+
+def _get_ablation_cache_key(prompt: str) -> str:
+    """Generate cache key for an ablation study from its built prompt."""
+    return hashlib.blake2b(prompt.encode(), digest_size=16).hexdigest()
+
+
+def clear_ablation_cache() -> None:
+    """Clear the ablation study results cache."""
+    global _ablation_cache
+    _ablation_cache = {}
+
+
+def _component_name(match: re.Match) -> str:
+    """Get the normalized component name of a component block match."""
+    name = match.group("name").strip()
+    if name.lower() == BASELINE_COMPONENT.lower():
+        return BASELINE_COMPONENT
+    return name
+
+
+def extract_component_blocks(response: str) -> dict[str, str]:
+    """Extract per-component ablation scripts from agent response.
+    
+    Each script is a fenced code block whose first line is
+    ``# COMPONENT: <name>``.
+    
+    Args:
+        response: Agent response text
+        
+    Returns:
+        Dict mapping component name to script code, in response order
+    """
+    blocks: dict[str, str] = {}
+    for match in _COMPONENT_BLOCK_PATTERN.finditer(response):
+        blocks.setdefault(_component_name(match), match.group("code").strip())
+    return blocks
+
+
+async def run_ablation_variations(
+    blocks: dict[str, str],
+    timeout: int = 600,
+) -> str:
+    """Execute the baseline and each ablation variation concurrently.
+    
+    Variations are independent, so wall-clock time is bounded by the
+    slowest run rather than their sum. Concurrency is capped at the
+    number of CPUs.
+    
+    Args:
+        blocks: Dict mapping component name to script code; must contain
+            the baseline under BASELINE_COMPONENT
+        timeout: Maximum execution time in seconds for each script
+        
+    Returns:
+        Results in the format produced by format_ablation_results
+    """
+    semaphore = asyncio.Semaphore(os.cpu_count() or 1)
+    results = await asyncio.gather(*(
+        _execute_ablation_block(code, semaphore, timeout) for code in blocks.values()
+    ))
+    return format_ablation_results(dict(zip(blocks, results)))
+
+
+def format_ablation_results(results: dict[str, ExecutionResult]) -> str:
+    """Format per-component execution results as ablation results.
+    
+    Args:
+        results: Dict mapping component name to its execution result; must
+            contain the baseline under BASELINE_COMPONENT
+        
+    Returns:
+        Results in the "Ablation Results:" format understood by
+        parse_ablation_results (failed runs are reported as -inf, and no
+        impacts are reported if the baseline failed)
+    """
+    scores = {
+        name: result.validation_score if result.validation_score is not None else float("-inf")
+        for name, result in results.items()
+    }
+    
+    baseline_score = scores.pop(BASELINE_COMPONENT)
+    lines = ["Ablation Results:", f"- {BASELINE_COMPONENT}: {baseline_score:.6f}"]
+    if baseline_score == float("-inf"):
+        # Impacts are meaningless without a baseline
+        return "\n".join(lines)
+    
+    for name, score in scores.items():
+        impact = baseline_score - score
+        lines.append(f"- Without {name}: {score:.6f} (impact: {impact:+.6f})")
+    return "\n".join(lines)
+
+
+@lru_cache(maxsize=1)
+def _get_hyperscan_database() -> Optional[Any]:
+    """Compile the ablation keyword database, or None without hyperscan."""
+    try:
+        import hyperscan
+    except ImportError:
+        return None
+    
+    database = hyperscan.Database()
+    database.compile(
+        expressions=list(_ABLATION_RESULT_KEYWORDS),
+        ids=list(range(len(_ABLATION_RESULT_KEYWORDS))),
+        elements=len(_ABLATION_RESULT_KEYWORDS),
+        flags=[hyperscan.HS_FLAG_CASELESS] * len(_ABLATION_RESULT_KEYWORDS),
+    )
+    return database
+
+
+@lru_cache(maxsize=1)
+def _get_re2_pattern() -> Optional[Any]:
+    """Compile the ablation result pattern with RE2, or None without google-re2."""
+    try:
+        import re2
+    except ImportError:
+        return None
+    
+    # RE2 takes the case-insensitive flag inline
+    return re2.compile("(?i)" + _ABLATION_RESULT_REGEX)
+
+
+def _match_from_starts(response: str, starts: list[int]) -> Iterator[re.Match]:
+    """Yield the matches finditer would find, trying only candidate starts.
+    
+    Args:
+        response: Text being parsed
+        starts: Sorted offsets of every keyword occurrence in response
+        
+    Yields:
+        Non-overlapping _ABLATION_RESULT_PATTERN matches in order
+    """
+    last_end = 0
+    for start in starts:
+        if start < last_end:
+            continue
+        match = _ABLATION_RESULT_PATTERN.match(response, start)
+        if match:
+            yield match
+            last_end = match.end()
+
+
+def _iter_ablation_matches(response: str) -> Iterator[re.Match]:
+    """Iterate result matches, pre-scanning large outputs with hyperscan.
+    
+    Verbose ablation traces can run to thousands of lines, most of which
+    are training logs. When hyperscan is installed, it finds the keyword
+    offsets in one pass and the regex only runs at those offsets. Offsets
+    are byte offsets, so this only applies to ASCII text. Otherwise large
+    outputs are scanned with the linear-time RE2 engine when google-re2 is
+    installed, falling back to the standard re module.
+    
+    Args:
+        response: Text being parsed
+        
+    Returns:
+        Iterator over _ABLATION_RESULT_PATTERN matches
+    """
+    if len(response) > _HYPERSCAN_MIN_LENGTH and response.isascii():
+        database = _get_hyperscan_database()
+        if database is not None:
+            starts: list[int] = []
+            
+            def on_match(keyword_id: int, start: int, end: int, flags: int, context: Any) -> None:
+                starts.append(end - len(_ABLATION_RESULT_KEYWORDS[keyword_id]))
+            
+            database.scan(response.encode("ascii"), match_event_handler=on_match)
+            return _match_from_starts(response, sorted(starts))
+    
+    if len(response) > _RE2_MIN_LENGTH:
+        re2_pattern = _get_re2_pattern()
+        if re2_pattern is not None:
+            return re2_pattern.finditer(response)
+    
+    return _ABLATION_RESULT_PATTERN.finditer(response)
+
+
+def _contains_result_keyword(response: str) -> bool:
+    """Check with plain substring scans whether a result line could match."""
+    # Cover the usual capitalizations without copying the response; only
+    # unusual mixed case falls through to the case-folded check
+    if any(probe in response for probe in ("aseline", "ASELINE", "ithout", "ITHOUT")):
+        return True
+    lowered = response.lower()
+    return "baseline" in lowered or "without" in lowered
+
+
 def parse_ablation_results(response: str) -> tuple[float, dict[str, float]]:
     """Parse ablation study results from agent response.
     
@@ -243,43 +748,37 @@ def parse_ablation_results(response: str) -> tuple[float, dict[str, float]]:
     Returns:
         Tuple of (baseline_score, component_impacts dict)
     """
-    import re
+    # Error responses usually carry neither keyword, so skip the regex scan
+    if not _contains_result_keyword(response):
+        return 0.0, {}
     
-    baseline_score = 0.0
+    baseline_score: Optional[float] = None
     component_impacts: dict[str, float] = {}
+    # "Without <component>: <score>" lines are only used when no line carries
+    # an explicit impact, and need the baseline which may appear later
+    component_scores: list[tuple[str, float]] = []
     
-    # Look for baseline score
-    baseline_pattern = r"Baseline[:\s]*([-+]?\d*\.?\d+)"
-    baseline_match = re.search(baseline_pattern, response, re.IGNORECASE)
-    if baseline_match:
+    for match in _iter_ablation_matches(response):
+        kind = match.lastgroup
         try:
-            baseline_score = float(baseline_match.group(1))
-        except ValueError:
-            pass
-    
-    # Look for component impacts
-    # Pattern: "Without <component>: <score> (impact: <delta>)"
-    impact_pattern = r"Without\s+([^:]+)[:\s]*([-+]?\d*\.?\d+)\s*\(impact[:\s]*([-+]?\d*\.?\d+)\)"
-    for match in re.finditer(impact_pattern, response, re.IGNORECASE):
-        component_name = match.group(1).strip()
-        try:
-            impact = float(match.group(3))
-            component_impacts[component_name] = impact
+            if kind == "baseline":
+                if baseline_score is None:
+                    baseline_score = float(match.group("baseline_score"))
+            elif kind == "impact_line":
+                component_name = match.group("impact_component").strip()
+                component_impacts[component_name] = float(match.group("impact"))
+            elif not component_impacts:
+                component_name = match.group("score_component").strip()
+                component_scores.append((component_name, float(match.group("score"))))
         except ValueError:
             continue
     
-    # Alternative pattern without explicit impact
-    # Pattern: "Without <component>: <score>"
+    if baseline_score is None:
+        baseline_score = 0.0
+    
+    # Calculate impacts as difference from baseline
     if not component_impacts:
-        alt_pattern = r"Without\s+([^:]+)[:\s]*([-+]?\d*\.?\d+)"
-        for match in re.finditer(alt_pattern, response, re.IGNORECASE):
-            component_name = match.group(1).strip()
-            try:
-                score = float(match.group(2))
-                # Calculate impact as difference from baseline
-                impact = baseline_score - score
-                component_impacts[component_name] = impact
-            except ValueError:
-                continue
+        for component_name, score in component_scores:
+            component_impacts[component_name] = baseline_score - score
     
     return baseline_score, component_impacts
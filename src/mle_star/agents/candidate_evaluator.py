@@ -4,13 +4,25 @@ This agent generates and executes Python code to evaluate each model candidate
 on the given task, extracting validation scores from execution output.
 """
 
-from typing import Optional
+import ast
+import asyncio
+import copy
+import hashlib
+import logging
+import os
+import re
+import textwrap
+from contextlib import aclosing
+from typing import Any, Optional
 from strands import Agent, tool
 
-from mle_star.models.data_models import TaskDescription, ModelCandidate
+from mle_star.models.data_models import TaskDescription, ModelCandidate, CandidateBatch
 from mle_star.models.config import MLEStarConfig
-from mle_star.models.model_factory import create_model
-from mle_star.tools.execute_python import execute_python, ExecutionResult
+from mle_star.models.model_factory import create_model, pooled_agent, response_to_text
+from mle_star.tools.execute_python import execute_python_async, ExecutionResult
+
+
+logger = logging.getLogger(__name__)
 
 
 CANDIDATE_EVAL_SYSTEM_PROMPT = """You are a rigorous ML engineer specializing in fair model evaluation and benchmarking.
@@ -56,11 +68,50 @@ Before generating code, consider:
 - What's the appropriate cross-validation strategy?
 </thinking>"""
 
+# Parallelism section appended to the system prompts of agents whose scripts
+# run concurrently (see build_performance_guidelines)
+PERFORMANCE_GUIDELINES = """
+
+<performance>
+- Each script gets {threads} CPU threads; other scripts run at the same time
+- Pass n_jobs={threads} to sklearn estimators and utilities supporting n_jobs (RandomForest,
+  ExtraTrees, KNeighbors, cross_val_score, GridSearchCV, permutation_importance, ...)
+- Wrap predict-heavy blocks in `with joblib.parallel_backend("threading", n_jobs={threads}):`
+- For LightGBM/XGBoost set num_threads/n_jobs to {threads}
+</performance>"""
+
+
+# Fenced code blocks in agent responses
+_CODE_BLOCK_PATTERN = re.compile(r'```(?:python)?\s*\n(.*?)```', re.DOTALL)
+
+# Score printed by the evaluation code ("Final Validation Performance: 0.85")
+# or reported by the run_python_code tool ("Parsed Validation Score: 0.85")
+_VALIDATION_SCORE_PATTERN = re.compile(
+    r"(?:(?:Final\s+)?Validation\s+(?:Performance|Score)|Parsed\s+Validation\s+Score)"
+    r"[:\s]*([-+]?\d*\.?\d+(?:[eE][-+]?\d+)?)",
+    re.IGNORECASE,
+)
+
+# Characters at the end of a response probed for the score before the
+# whole response is searched
+_SCORE_TAIL_CHARS = 2048
+
+# Metrics where a lower score is better (errors and losses)
+_LOWER_IS_BETTER_PATTERN = re.compile(
+    r"\b(?:r?mse|rmsle|mae|mape|error|loss|log_?loss)\b", re.IGNORECASE
+)
+
+# Cache of scored evaluations keyed by _get_evaluation_cache_key
+_evaluation_cache: dict[str, ModelCandidate] = {}
+
 
 @tool
-def run_python_code(code: str, timeout: int = 300) -> str:
+async def run_python_code(code: str, timeout: int = 300) -> str:
     """Execute Python code and return the results.
     
+    The code runs without blocking the event loop, and is killed if the
+    evaluation is cancelled.
+    
     Args:
         code: Python code to execute
         timeout: Maximum execution time in seconds (default: 300)
@@ -68,7 +119,7 @@ def run_python_code(code: str, timeout: int = 300) -> str:
     Returns:
         Execution results including stdout, stderr, and validation score if found
     """
-    result: ExecutionResult = execute_python(code=code, timeout=timeout)
+    result: ExecutionResult = await execute_python_async(code=code, timeout=timeout)
     
     output_parts = []
     
@@ -78,10 +129,10 @@ def run_python_code(code: str, timeout: int = 300) -> str:
         output_parts.append(f"Execution failed with return code: {result.return_code}")
     
     if result.stdout:
-        output_parts.append(f"\nStdout:\n{result.stdout}")
+        output_parts.extend(("\nStdout:", result.stdout))
     
     if result.stderr:
-        output_parts.append(f"\nStderr:\n{result.stderr}")
+        output_parts.extend(("\nStderr:", result.stderr))
     
     if result.validation_score is not None:
         output_parts.append(f"\nParsed Validation Score: {result.validation_score}")
@@ -92,6 +143,23 @@ def run_python_code(code: str, timeout: int = 300) -> str:
     return "\n".join(output_parts)
 
 
+def build_performance_guidelines(config: MLEStarConfig) -> str:
+    """Build the parallelism section of the system prompt of script-writing agents.
+    
+    Up to config.max_concurrent_evals scripts run at once, so each is given
+    an equal share of the cores rather than all of them, which would
+    oversubscribe the machine.
+    
+    Args:
+        config: MLE-STAR configuration with max_concurrent_evals
+        
+    Returns:
+        The <performance> section, to append to a system prompt
+    """
+    threads = max(1, (os.cpu_count() or 1) // max(1, config.max_concurrent_evals))
+    return PERFORMANCE_GUIDELINES.format(threads=threads)
+
+
 def create_candidate_evaluator_agent(config: MLEStarConfig) -> Agent:
     """Create a Candidate Evaluation Agent configured with the given settings.
     
@@ -103,7 +171,7 @@ def create_candidate_evaluator_agent(config: MLEStarConfig) -> Agent:
     """
     return Agent(
         name="candidate_evaluator",
-        system_prompt=CANDIDATE_EVAL_SYSTEM_PROMPT,
+        system_prompt=CANDIDATE_EVAL_SYSTEM_PROMPT + build_performance_guidelines(config),
         tools=[run_python_code],
         model=create_model(config),
         temperature=config.temperature,
@@ -157,73 +225,267 @@ async def evaluate_candidate(
     task: TaskDescription,
     candidate: ModelCandidate,
     config: MLEStarConfig,
+    use_cache: bool = True,
 ) -> ModelCandidate:
     """Evaluate a single model candidate on the given task.
     
-    This function creates an agent, generates evaluation code, executes it,
-    and updates the candidate with the validation score.
+    This function checks out a pooled agent, generates evaluation code,
+    executes it, and updates the candidate with the validation score.
+    Scored evaluations are cached by task and candidate.
     
     Args:
         task: The ML task description
         candidate: The model candidate to evaluate
         config: MLE-STAR configuration
+        use_cache: Whether to use cache
         
     Returns:
         Updated ModelCandidate with validation_score and generated_code set
     """
-    agent = create_candidate_evaluator_agent(config)
+    cache_key = _get_evaluation_cache_key(task, candidate)
+    
+    # An identical candidate skips the LLM call and the evaluation run
+    if use_cache and cache_key in _evaluation_cache:
+        return copy.deepcopy(_evaluation_cache[cache_key])
+    
+    # Candidates that cannot produce working code fail fast without an
+    # LLM round trip and evaluation run
+    rejection = _check_candidate_input(candidate)
+    if rejection is not None:
+        logger.warning("Skipping evaluation of candidate %r: %s", candidate.name, rejection)
+        return _unscored_candidate(candidate)
+    
     prompt = build_evaluation_prompt(task, candidate)
     
-    # Invoke the agent to generate and run evaluation code
-    response = await agent.invoke_async(prompt)
-    response_text = str(response)
+    # Invoke the agent to generate and run evaluation code, reusing an idle
+    # agent from earlier candidates instead of rebuilding it
+    with pooled_agent(config, create_candidate_evaluator_agent) as agent:
+        response_text, validation_score = await _stream_evaluation_response(agent, prompt)
     
-    # Extract the generated code and score from the response
+    # Extract the generated code from the response
     generated_code = _extract_generated_code(response_text)
-    validation_score = _extract_score_from_response(response_text)
     
-    # Return updated candidate
-    return ModelCandidate(
+    evaluated = ModelCandidate(
         name=candidate.name,
         description=candidate.description,
         example_code=candidate.example_code,
         validation_score=validation_score,
         generated_code=generated_code,
     )
+    
+    if validation_score is not None and use_cache:
+        _evaluation_cache[cache_key] = copy.deepcopy(evaluated)
+    
+    # Return updated candidate
+    return evaluated
+
+
+def _check_candidate_input(candidate: ModelCandidate) -> Optional[str]:
+    """Check that a candidate has usable input for evaluation.
+    
+    Args:
+        candidate: The model candidate to check
+        
+    Returns:
+        Reason the candidate cannot be evaluated, or None if it can
+    """
+    if not candidate.example_code:
+        if not candidate.description.strip():
+            return "no example code or description"
+        return None
+    
+    try:
+        # Snippets are often cut from an indented context
+        ast.parse(textwrap.dedent(candidate.example_code))
+    except SyntaxError as e:
+        return f"example code has a syntax error at line {e.lineno}: {e.msg}"
+    return None
+
+
+def _get_evaluation_cache_key(task: TaskDescription, candidate: ModelCandidate) -> str:
+    """Generate cache key for a candidate evaluation."""
+    key_text = "|".join([
+        task.description,
+        task.task_type,
+        task.data_modality,
+        task.evaluation_metric,
+        task.dataset_path,
+        candidate.name,
+        candidate.description,
+        candidate.example_code or "",
+    ])
+    return hashlib.blake2b(key_text.encode(), digest_size=16).hexdigest()
+
+
+def clear_evaluation_cache() -> None:
+    """Clear the candidate evaluation cache."""
+    global _evaluation_cache
+    _evaluation_cache = {}
+
+
+async def _stream_evaluation_response(
+    agent: Agent,
+    prompt: str,
+) -> tuple[str, Optional[float]]:
+    """Stream the agent response and find the score of the code it ran.
+    
+    The score is taken from the output of the latest run_python_code call
+    that reported one, or from the final message if no run did. Text the
+    model streams is never parsed for it, as the generated code itself
+    prints score labels (such as the -1.0 fallback) before it has run.
+    
+    Args:
+        agent: Candidate evaluation agent
+        prompt: Prompt to send to the agent
+        
+    Returns:
+        Tuple of (response text, validation score or None)
+    """
+    streamed_text = ""
+    final_text: Optional[str] = None
+    tool_score: Optional[float] = None
+    
+    async with aclosing(agent.stream_async(prompt)) as events:
+        async for event in events:
+            if "result" in event:
+                final_text = response_to_text(event["result"])
+            if "data" in event:
+                streamed_text += event["data"]
+            if "message" in event:
+                score = _tool_output_score(event["message"])
+                if score is not None:
+                    tool_score = score
+    
+    response_text = final_text if final_text is not None else streamed_text
+    if tool_score is not None:
+        return response_text, tool_score
+    if final_text is None:
+        return response_text, None
+    return response_text, extract_validation_score(final_text)
+
+
+def _tool_output_score(message: Any) -> Optional[float]:
+    """Get the last score reported in the tool results of a message.
+    
+    Args:
+        message: Conversation message streamed by the agent
+        
+    Returns:
+        The last score found in its tool results, or None
+    """
+    if not isinstance(message, dict):
+        return None
+    
+    score = None
+    for block in message.get("content") or []:
+        tool_result = block.get("toolResult") if isinstance(block, dict) else None
+        if not tool_result:
+            continue
+        for item in tool_result.get("content") or []:
+            text = item.get("text") if isinstance(item, dict) else None
+            for match in _VALIDATION_SCORE_PATTERN.finditer(text or ""):
+                score = float(match.group(1))
+    return score
 
 
 async def evaluate_all_candidates(
     task: TaskDescription,
     candidates: list[ModelCandidate],
     config: MLEStarConfig,
+    use_cache: bool = True,
+    early_stop_score: Optional[float] = None,
+    patience: int = 0,
 ) -> list[ModelCandidate]:
     """Evaluate all model candidates on the given task.
     
+    Candidates are independent, so they are evaluated concurrently, at most
+    config.max_concurrent_evals at a time to stay within LLM rate limits and
+    local CPU for the evaluation subprocesses. Identical candidates are
+    evaluated only once.
+    
+    When early_stop_score is given, the remaining evaluations are cancelled,
+    killing the code they are running, once a candidate reaches it (scores
+    at or above it, or at or below it for error and loss metrics) and
+    patience further evaluations have completed. Cancelled candidates are
+    returned without a score.
+    
     Args:
         task: The ML task description
         candidates: List of model candidates to evaluate
         config: MLE-STAR configuration
+        use_cache: Whether to use cache
+        early_stop_score: Optional score that ends the search once reached
+        patience: Number of evaluations to still wait for after the
+            threshold is reached, in case one beats it
         
     Returns:
-        List of evaluated ModelCandidate objects with scores
+        List of evaluated ModelCandidate objects with scores, in input order
     """
-    evaluated = []
-    
-    for candidate in candidates:
-        try:
-            evaluated_candidate = await evaluate_candidate(task, candidate, config)
-            evaluated.append(evaluated_candidate)
-        except Exception as e:
-            # If evaluation fails, keep the candidate but with no score
-            evaluated.append(ModelCandidate(
-                name=candidate.name,
-                description=candidate.description,
-                example_code=candidate.example_code,
-                validation_score=None,
-                generated_code=None,
-            ))
-    
-    return evaluated
+    semaphore = asyncio.Semaphore(max(1, config.max_concurrent_evals))
+    lower_is_better = bool(_LOWER_IS_BETTER_PATTERN.search(task.evaluation_metric))
+    
+    async def evaluate_one(key: str, candidate: ModelCandidate) -> tuple[str, ModelCandidate]:
+        async with semaphore:
+            try:
+                return key, await evaluate_candidate(task, candidate, config, use_cache=use_cache)
+            except Exception:
+                # If evaluation fails, keep the candidate but with no score
+                return key, _unscored_candidate(candidate)
+    
+    keys = [_get_evaluation_cache_key(task, c) for c in candidates]
+    unique: dict[str, ModelCandidate] = {}
+    for key, candidate in zip(keys, candidates):
+        unique.setdefault(key, candidate)
+    
+    tasks = [asyncio.create_task(evaluate_one(key, c)) for key, c in unique.items()]
+    evaluated: dict[str, ModelCandidate] = {}
+    remaining_after_threshold: Optional[int] = None
+    try:
+        for next_result in asyncio.as_completed(tasks):
+            key, result = await next_result
+            evaluated[key] = result
+            
+            if remaining_after_threshold is not None:
+                remaining_after_threshold -= 1
+            elif (
+                early_stop_score is not None
+                and result.validation_score is not None
+                and (
+                    result.validation_score <= early_stop_score
+                    if lower_is_better
+                    else result.validation_score >= early_stop_score
+                )
+            ):
+                remaining_after_threshold = patience
+            
+            if remaining_after_threshold is not None and remaining_after_threshold <= 0:
+                break
+    finally:
+        for pending in tasks:
+            pending.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    
+    # Duplicates get their own copy of the shared evaluation
+    seen: set[str] = set()
+    ordered = []
+    for key, candidate in zip(keys, candidates):
+        if key not in evaluated:
+            ordered.append(_unscored_candidate(candidate))
+        else:
+            ordered.append(evaluated[key] if key not in seen else copy.deepcopy(evaluated[key]))
+        seen.add(key)
+    return ordered
+
+
+def _unscored_candidate(candidate: ModelCandidate) -> ModelCandidate:
+    """Copy a candidate without evaluation results."""
+    return ModelCandidate(
+        name=candidate.name,
+        description=candidate.description,
+        example_code=candidate.example_code,
+        validation_score=None,
+        generated_code=None,
+    )
 
 
 def _extract_generated_code(response: str) -> Optional[str]:
@@ -235,49 +497,40 @@ def _extract_generated_code(response: str) -> Optional[str]:
     Returns:
         Extracted code or None
     """
-    import re
-    
-    # Look for code blocks
-    code_pattern = r'```(?:python)?\s*\n(.*?)```'
-    matches = re.findall(code_pattern, response, re.DOTALL)
+    # Track only the span of the longest code block rather than
+    # materializing every block as a string
+    best_start, best_end = 0, -1
+    for match in _CODE_BLOCK_PATTERN.finditer(response):
+        if match.end(1) - match.start(1) > best_end - best_start:
+            best_start, best_end = match.span(1)
     
-    if matches:
-        # Return the longest code block
-        return max(matches, key=len).strip()
+    if best_end >= 0:
+        return response[best_start:best_end].strip()
     
     return None
 
 
-def _extract_score_from_response(response: str) -> Optional[float]:
+def extract_validation_score(response: str) -> Optional[float]:
     """Extract validation score from agent response.
     
+    The last score reported is used, as it comes from the final run of the
+    code. It is normally at the end of the response, so only the last
+    _SCORE_TAIL_CHARS characters are searched unless no score is found there.
+    
     Args:
         response: Agent response text
         
     Returns:
         Extracted score or None
     """
-    import re
-    
-    # Look for the standard format
-    pattern = r"(?:Final\s+)?Validation\s+(?:Performance|Score)[:\s]*([-+]?\d*\.?\d+(?:[eE][-+]?\d+)?)"
-    match = re.search(pattern, response, re.IGNORECASE)
+    tail_start = max(0, len(response) - _SCORE_TAIL_CHARS)
     
-    if match:
-        try:
-            return float(match.group(1))
-        except ValueError:
-            pass
-    
-    # Look for "Parsed Validation Score" from tool output
-    pattern2 = r"Parsed\s+Validation\s+Score[:\s]*([-+]?\d*\.?\d+(?:[eE][-+]?\d+)?)"
-    match2 = re.search(pattern2, response, re.IGNORECASE)
-    
-    if match2:
-        try:
-            return float(match2.group(1))
-        except ValueError:
+    for start in (tail_start, 0) if tail_start > 0 else (0,):
+        match = None
+        for match in _VALIDATION_SCORE_PATTERN.finditer(response, start):
             pass
+        if match:
+            return float(match.group(1))
     
     return None
 
@@ -297,14 +550,4 @@ def sort_candidates_by_score(
     Returns:
         Sorted list of candidates
     """
-    # Separate candidates with and without scores
-    with_scores = [c for c in candidates if c.validation_score is not None]
-    without_scores = [c for c in candidates if c.validation_score is None]
-    
-    # Sort those with scores
-    with_scores.sort(
-        key=lambda c: c.validation_score,  # type: ignore
-        reverse=descending,
-    )
-    
-    return with_scores + without_scores
+    return CandidateBatch.from_list(candidates).ranked(descending=descending)
@@ -4,12 +4,30 @@ This agent takes a code block and a refinement plan, then implements
 the plan to produce a refined version of the code block.
 """
 
-from typing import Optional
+import ast
+import asyncio
+import importlib
+import inspect
+import re
+import textwrap
+from collections import Counter
+from contextlib import aclosing
+from functools import lru_cache
+from typing import Any, Iterator, Optional, Union
 from dataclasses import dataclass
 from strands import Agent
+from strands.types.exceptions import ModelThrottledException
 
 from mle_star.models.config import MLEStarConfig
-from mle_star.models.model_factory import create_model
+from mle_star.models.data_models import CodeBlock
+from mle_star.models.model_factory import (
+    create_model,
+    cached_invoke,
+    cache_response,
+    get_cached_response,
+    pooled_agent,
+    response_to_text,
+)
 
 
 CODER_SYSTEM_PROMPT = """You are a precise ML engineer who implements refinement plans with surgical accuracy.
@@ -84,7 +102,54 @@ Before implementing, verify:
 </thinking>"""
 
 
-@dataclass
+# Attempts per refinement for transient model errors, and the delay before
+# the first retry in seconds (doubled on each further retry)
+REFINE_MAX_ATTEMPTS = 3
+REFINE_RETRY_BACKOFF = 1.0
+
+# Errors worth retrying: throttling and network timeouts or disconnects
+_RETRIABLE_ERRORS = (ModelThrottledException, asyncio.TimeoutError, TimeoutError, ConnectionError)
+
+# Fence info strings of the blocks treated as code
+_CODE_FENCE_LANGUAGES = frozenset({"", "python"})
+
+
+# Solutions with at least this many lines are searched with the Numba kernel
+# when it is installed; below it, building the arrays costs more than it saves
+_NUMBA_MIN_LINES = 2_000
+
+# Case-insensitive "logging", without lowercasing the whole block
+_LOGGING_PATTERN = re.compile('logging', re.IGNORECASE)
+
+# Numbered steps of a refinement plan
+_PLAN_STEP_PATTERN = re.compile(r'^\s*\d+[.)]\s+(.+)$', re.MULTILINE)
+
+# Whole plan steps swapping one class for another, as applied by the
+# templated fast path
+_SWAP_STEP_PATTERNS = (
+    re.compile(
+        r'(?:replace|swap)\s+`?(?P<old>\w+)(?:\(\))?`?\s+(?:with|by|for)\s+`?(?P<new>\w+)(?:\(\))?`?',
+        re.IGNORECASE,
+    ),
+    re.compile(
+        r'(?:use|switch to)\s+`?(?P<new>\w+)(?:\(\))?`?\s+instead\s+of\s+`?(?P<old>\w+)(?:\(\))?`?',
+        re.IGNORECASE,
+    ),
+)
+
+# Whole plan steps setting a keyword argument, as applied by the templated
+# fast path
+_SET_PARAM_STEP_PATTERN = re.compile(
+    r'(?:set|change)\s+`?(?P<name>\w+)`?\s+(?:to|=)\s+`?(?P<value>["\'][^"\']*["\']|-?[\w.]*\w)`?',
+    re.IGNORECASE,
+)
+
+# Packages whose classes the templated fast path may swap; the module the
+# replaced class is imported from is imported to check the replacement
+_SWAPPABLE_PACKAGES = frozenset({"sklearn", "lightgbm", "xgboost", "catboost"})
+
+
+@dataclass(slots=True)
 class RefinedCodeBlock:
     """Result of code refinement."""
     original_code: str
@@ -156,27 +221,56 @@ async def refine_code_block(
     refinement_plan: str,
     config: MLEStarConfig,
     context: Optional[str] = None,
+    use_cache: bool = True,
 ) -> RefinedCodeBlock:
     """Refine a code block according to a plan.
     
-    This function creates an agent to implement the refinement plan
-    and produce an improved version of the code block.
+    This function checks out a pooled agent to implement the refinement
+    plan and produce an improved version of the code block. The response
+    is streamed and stopped once the refined block is complete. A block
+    and plan seen before reuse the earlier response without an LLM call.
+    Throttling and network errors are retried with exponential backoff on
+    the same agent and prompt, up to REFINE_MAX_ATTEMPTS attempts.
+    
+    With config.fast_path_mode set to "templated", plans made only of
+    class swaps and keyword argument changes are applied directly,
+    without the LLM.
     
     Args:
         code_block: The original code block to refine
         refinement_plan: The plan describing how to refine the code
         config: MLE-STAR configuration
         context: Optional additional context
+        use_cache: Whether to use the agent response cache
         
     Returns:
         RefinedCodeBlock with the refined code
     """
-    agent = create_coder_agent(config)
+    if config.fast_path_mode == "templated":
+        templated_code = _apply_plan_templates(code_block, refinement_plan)
+        if templated_code is not None:
+            return RefinedCodeBlock(
+                original_code=code_block,
+                refined_code=templated_code,
+                changes_made=identify_changes(code_block, templated_code),
+                success=True,
+            )
+    
     prompt = build_coder_prompt(code_block, refinement_plan, context)
     
     try:
-        response = await agent.invoke_async(prompt)
-        response_text = str(response)
+        # Reuse an idle agent from earlier refinements instead of rebuilding it
+        with pooled_agent(config, create_coder_agent) as agent:
+            for attempt in range(REFINE_MAX_ATTEMPTS):
+                try:
+                    response_text = await _stream_refined_code(agent, prompt, config, use_cache=use_cache)
+                    break
+                except _RETRIABLE_ERRORS:
+                    if attempt == REFINE_MAX_ATTEMPTS - 1:
+                        raise
+                    # Drop the failed exchange before trying again
+                    agent.messages = []
+                    await asyncio.sleep(REFINE_RETRY_BACKOFF * 2 ** attempt)
         
         # Extract the refined code
         refined_code = extract_code_from_response(response_text)
@@ -209,6 +303,283 @@ async def refine_code_block(
         )
 
 
+def _apply_plan_templates(code_block: str, refinement_plan: str) -> Optional[str]:
+    """Apply a refinement plan made only of templated edits, without the LLM.
+    
+    Every step (the numbered lines, or the whole plan if it has none) must
+    be exactly one of these edits, with nothing else in the step: a swap of
+    a class for another from the same module that accepts every argument
+    the code passes it ("Replace StandardScaler with RobustScaler"), or a
+    literal value for a keyword argument the code passes to a call ("Set
+    n_estimators to 500"). Edits are made on the parsed code, so only the
+    class's names and the calls' keyword values change, never strings,
+    comments or other assignments.
+    
+    Args:
+        code_block: The original code block
+        refinement_plan: The refinement plan
+        
+    Returns:
+        The refined code, or None if any step needs the coder agent
+    """
+    steps = _PLAN_STEP_PATTERN.findall(refinement_plan) or [refinement_plan]
+    code = code_block
+    
+    for step in steps:
+        tree = _parse_code_block(code)
+        if tree is None:
+            return None
+        
+        # Any text besides the edit may ask for more than the template does
+        step = step.strip().rstrip(".").rstrip()
+        swap = next(
+            (match for pattern in _SWAP_STEP_PATTERNS if (match := pattern.fullmatch(step))),
+            None,
+        )
+        if swap is not None:
+            if not _is_valid_swap(tree, swap["old"], swap["new"]):
+                return None
+            edits = [
+                (node, swap["new"]) for node in ast.walk(tree)
+                if (isinstance(node, ast.Name) and node.id == swap["old"])
+                or (isinstance(node, ast.alias) and node.name == swap["old"] and node.asname is None)
+            ]
+        elif (setting := _SET_PARAM_STEP_PATTERN.fullmatch(step)) is not None:
+            try:
+                ast.literal_eval(setting["value"])
+            except (SyntaxError, ValueError):
+                # A bare word would be read as a variable name
+                return None
+            edits = [
+                (keyword.value, setting["value"]) for node in ast.walk(tree)
+                if isinstance(node, ast.Call)
+                for keyword in node.keywords if keyword.arg == setting["name"]
+            ]
+        else:
+            return None
+        
+        if not edits:
+            return None
+        code = _replace_node_sources(code, edits)
+    
+    return code if _parse_code_block(code) is not None else None
+
+
+def _parse_code_block(code: str) -> Optional[ast.Module]:
+    """Parse a code block, which may be indented, or return None if invalid."""
+    try:
+        return ast.parse(textwrap.dedent(code))
+    except SyntaxError:
+        return None
+
+
+def _replace_node_sources(code: str, edits: list[tuple[ast.AST, str]]) -> str:
+    """Replace the source text of nodes parsed from code.
+    
+    Args:
+        code: The code block, as passed to _parse_code_block
+        edits: Pairs of (node of its parse, replacement source text)
+        
+    Returns:
+        The code with each node's text replaced
+    """
+    lines = code.splitlines(keepends=True)
+    dedented_lines = textwrap.dedent(code).splitlines(keepends=True)
+    line_starts = [0]
+    for line in lines:
+        line_starts.append(line_starts[-1] + len(line))
+    
+    def offset(lineno: int, col_offset: int) -> int:
+        # AST columns are UTF-8 byte offsets into the dedented line
+        dedented = dedented_lines[lineno - 1]
+        indent = len(lines[lineno - 1]) - len(dedented)
+        column = len(dedented.encode()[:col_offset].decode(errors="ignore"))
+        return line_starts[lineno - 1] + indent + column
+    
+    spans = sorted(
+        (
+            offset(node.lineno, node.col_offset),
+            offset(node.end_lineno, node.end_col_offset),
+            text,
+        )
+        for node, text in edits
+    )
+    for start, end, text in reversed(spans):
+        code = code[:start] + text + code[end:]
+    return code
+
+
+def _is_valid_swap(tree: ast.Module, old: str, new: str) -> bool:
+    """Check a templated class swap leaves the code valid.
+    
+    The old class must be imported in the code from a module of
+    _SWAPPABLE_PACKAGES that also defines the new one, and every call of the
+    old class must pass only keyword arguments the new one accepts.
+    
+    Args:
+        tree: Parsed code the swap is applied to
+        old: Name of the class being replaced
+        new: Name of the replacement class
+        
+    Returns:
+        True if the swap can be applied without the coder agent
+    """
+    module_name = next(
+        (
+            node.module for node in ast.walk(tree)
+            if isinstance(node, ast.ImportFrom) and node.module and node.level == 0
+            and any(alias.name == old and alias.asname is None for alias in node.names)
+        ),
+        None,
+    )
+    if module_name is None or module_name.split(".")[0] not in _SWAPPABLE_PACKAGES:
+        return False
+    
+    module = _import_swap_module(module_name)
+    replacement = getattr(module, new, None) if module is not None else None
+    if not inspect.isclass(replacement):
+        return False
+    
+    try:
+        parameters = inspect.signature(replacement).parameters
+    except (TypeError, ValueError):
+        return False
+    
+    accepts_any_keyword = any(p.kind is p.VAR_KEYWORD for p in parameters.values())
+    for node in ast.walk(tree):
+        if not (isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == old):
+            continue
+        if node.args or any(
+            keyword.arg is None or (keyword.arg not in parameters and not accepts_any_keyword)
+            for keyword in node.keywords
+        ):
+            return False
+    
+    return True
+
+
+@lru_cache(maxsize=32)
+def _import_swap_module(module_name: str) -> Optional[Any]:
+    """Import a module classes are swapped within, or None if it fails."""
+    try:
+        return importlib.import_module(module_name)
+    except Exception:
+        return None
+
+
+async def _stream_refined_code(
+    agent: Agent,
+    prompt: str,
+    config: MLEStarConfig,
+    use_cache: bool = True,
+) -> str:
+    """Stream the coder response, stopping once the first code block closes.
+    
+    The coder answers with a single code block, so any prose after it is
+    not needed. Agents without streaming support are invoked normally.
+    
+    Args:
+        agent: Coder agent
+        prompt: Prompt to send to the agent
+        config: MLE-STAR configuration the agent was built from
+        use_cache: Whether to use the agent response cache
+        
+    Returns:
+        Response text, up to the end of the first complete code block
+    """
+    if not hasattr(agent, "stream_async"):
+        return await cached_invoke(agent, prompt, config, use_cache=use_cache)
+    
+    if use_cache:
+        cached = get_cached_response(agent, prompt, config)
+        if cached is not None:
+            return cached
+    
+    streamed_text = ""
+    final_text: Optional[str] = None
+    
+    async with aclosing(agent.stream_async(prompt)) as events:
+        async for event in events:
+            if "result" in event:
+                final_text = response_to_text(event["result"])
+            if "data" not in event:
+                continue
+            
+            chunk = event["data"]
+            streamed_text += chunk
+            # A block can only close on a chunk carrying a fence
+            if "`" in chunk and next(iter_code_fences(streamed_text), None) is not None:
+                break
+    
+    response_text = final_text if final_text is not None else streamed_text
+    if use_cache:
+        cache_response(agent, prompt, response_text, config)
+    return response_text
+
+
+async def refine_code_blocks_batch(
+    blocks: list[tuple[str, str, Optional[str]]],
+    config: MLEStarConfig,
+    max_concurrency: Optional[int] = None,
+    use_cache: bool = True,
+) -> list[RefinedCodeBlock]:
+    """Refine several independent code blocks concurrently.
+    
+    Each refinement checks out its own pooled agent, so at most
+    max_concurrency agents (and LLM requests) are in flight at once.
+    
+    Args:
+        blocks: List of (code_block, refinement_plan, context) tuples
+        config: MLE-STAR configuration
+        max_concurrency: Maximum concurrent refinements (default:
+            config.max_concurrent_evals)
+        use_cache: Whether to use the agent response cache
+        
+    Returns:
+        List of RefinedCodeBlock results, in input order
+    """
+    limit = max_concurrency if max_concurrency is not None else config.max_concurrent_evals
+    semaphore = asyncio.Semaphore(max(1, limit))
+    
+    async def refine_one(block: tuple[str, str, Optional[str]]) -> RefinedCodeBlock:
+        code_block, refinement_plan, context = block
+        async with semaphore:
+            return await refine_code_block(
+                code_block, refinement_plan, config, context, use_cache=use_cache
+            )
+    
+    return list(await asyncio.gather(*(refine_one(block) for block in blocks)))
+
+
+def iter_code_fences(text: str) -> Iterator[str]:
+    """Iterate over the bodies of fenced code blocks in text.
+    
+    Fences are paired with str.find rather than a DOTALL regex, so large
+    responses are scanned once without backtracking. Blocks tagged with a
+    language other than python are skipped; unclosed blocks are ignored.
+    
+    Args:
+        text: Text containing ``` fenced blocks
+        
+    Yields:
+        The text between each opening fence line and its closing fence
+    """
+    position = 0
+    while True:
+        opening = text.find('```', position)
+        if opening < 0:
+            return
+        body_start = text.find('\n', opening + 3) + 1
+        if body_start == 0:
+            return
+        closing = text.find('```', body_start)
+        if closing < 0:
+            return
+        if text[opening + 3:body_start].strip() in _CODE_FENCE_LANGUAGES:
+            yield text[body_start:closing]
+        position = closing + 3
+
+
 def extract_code_from_response(response: str) -> str:
     """Extract Python code from agent response.
     
@@ -218,11 +589,8 @@ def extract_code_from_response(response: str) -> str:
     Returns:
         Extracted code or empty string
     """
-    import re
-    
     # Look for code blocks
-    code_pattern = r'```(?:python)?\s*\n(.*?)```'
-    matches = re.findall(code_pattern, response, re.DOTALL)
+    matches = list(iter_code_fences(response))
     
     if matches:
         # Return the longest code block (likely the main implementation)
@@ -248,7 +616,10 @@ def extract_code_from_response(response: str) -> str:
     return ""
 
 
-def identify_changes(original: str, refined: str) -> list[str]:
+def identify_changes(
+    original: Union[CodeBlock, str],
+    refined: Union[CodeBlock, str],
+) -> list[str]:
     """Identify the changes made between original and refined code.
     
     Args:
@@ -260,33 +631,38 @@ def identify_changes(original: str, refined: str) -> list[str]:
     """
     changes = []
     
-    # Simple line-based diff
-    original_lines = set(original.strip().split('\n'))
-    refined_lines = set(refined.strip().split('\n'))
+    original_lines = CodeBlock.of(original).trimmed_lines
+    refined_lines = CodeBlock.of(refined).trimmed_lines
     
-    added = refined_lines - original_lines
-    removed = original_lines - refined_lines
+    # Line-based diff over line multisets
+    original_counts = Counter(original_lines)
+    refined_counts = Counter(refined_lines)
+    added = sum((refined_counts - original_counts).values())
+    removed = sum((original_counts - refined_counts).values())
     
     if added:
-        changes.append(f"Added {len(added)} new lines")
+        changes.append(f"Added {added} new lines")
     if removed:
-        changes.append(f"Removed {len(removed)} lines")
+        changes.append(f"Removed {removed} lines")
+    
+    original_markers = _count_change_markers(original_lines)
+    refined_markers = _count_change_markers(refined_lines)
     
     # Check for specific patterns
-    if 'import' in refined and 'import' not in original:
+    if refined_markers["import"] and not original_markers["import"]:
         changes.append("Added new imports")
     
-    if refined.count('def ') > original.count('def '):
+    if refined_markers["def"] > original_markers["def"]:
         changes.append("Added new functions")
     
-    if refined.count('class ') > original.count('class '):
+    if refined_markers["class"] > original_markers["class"]:
         changes.append("Added new classes")
     
     # Check for common improvements
-    if 'try:' in refined and 'try:' not in original:
+    if refined_markers["try"] and not original_markers["try"]:
         changes.append("Added error handling")
     
-    if 'logging' in refined.lower() and 'logging' not in original.lower():
+    if refined_markers["logging"] and not original_markers["logging"]:
         changes.append("Added logging")
     
     if not changes:
@@ -295,6 +671,18 @@ def identify_changes(original: str, refined: str) -> list[str]:
     return changes
 
 
+def _count_change_markers(lines: tuple[str, ...]) -> Counter[str]:
+    """Count the code markers identify_changes reports on, in one pass."""
+    markers: Counter[str] = Counter()
+    for line in lines:
+        markers["import"] += 'import' in line
+        markers["def"] += line.count('def ')
+        markers["class"] += line.count('class ')
+        markers["try"] += 'try:' in line
+        markers["logging"] += _LOGGING_PATTERN.search(line) is not None
+    return markers
+
+
 def substitute_code_block(
     full_solution: str,
     original_block: str,
@@ -310,49 +698,41 @@ def substitute_code_block(
     Returns:
         Updated solution with the refined block
     """
-    # Try exact replacement first
-    if original_block in full_solution:
-        return full_solution.replace(original_block, refined_block, 1)
+    # Try exact replacement first, locating the block with a single scan
+    if len(original_block) <= len(full_solution):
+        index = full_solution.find(original_block)
+        if index != -1:
+            return full_solution[:index] + refined_block + full_solution[index + len(original_block):]
     
-    # Try normalized replacement (handle whitespace differences)
-    original_normalized = _normalize_whitespace(original_block)
-    
-    # Find the block in the solution
-    lines = full_solution.split('\n')
-    solution_text = '\n'.join(lines)
-    
-    # Try to find a fuzzy match
-    start_idx = _find_fuzzy_match(solution_text, original_block)
+    # Try to find a fuzzy match (handles whitespace differences)
+    start_idx = _find_fuzzy_match(full_solution, original_block)
     
     if start_idx >= 0:
         # Find the end of the original block
         end_idx = start_idx + len(original_block)
         
         # Adjust for whitespace
-        while end_idx < len(solution_text) and solution_text[end_idx] in ' \t\n':
+        while end_idx < len(full_solution) and full_solution[end_idx] in ' \t\n':
             end_idx += 1
         
-        return solution_text[:start_idx] + refined_block + solution_text[end_idx:]
+        return full_solution[:start_idx] + refined_block + full_solution[end_idx:]
     
     # If no match found, append the refined block (fallback)
     return full_solution + "\n\n# Refined block (could not locate original):\n" + refined_block
 
 
-def _normalize_whitespace(code: str) -> str:
-    """Normalize whitespace in code for comparison."""
-    lines = code.split('\n')
-    normalized = []
-    for line in lines:
-        # Preserve indentation structure but normalize spaces
-        stripped = line.rstrip()
-        if stripped:
-            normalized.append(stripped)
-    return '\n'.join(normalized)
-
-
-def _find_fuzzy_match(text: str, pattern: str, threshold: float = 0.7) -> int:
+def _find_fuzzy_match(
+    text: Union[CodeBlock, str],
+    pattern: Union[CodeBlock, str],
+    threshold: float = 0.7,
+) -> int:
     """Find a fuzzy match for a pattern in text.
     
+    A window of as many text lines as the pattern has is slid over the
+    text, and the Jaccard similarity of the window's and the pattern's
+    stripped, non-empty lines is kept up to date as lines enter and leave
+    the window.
+    
     Args:
         text: Text to search in
         pattern: Pattern to find
@@ -361,8 +741,10 @@ def _find_fuzzy_match(text: str, pattern: str, threshold: float = 0.7) -> int:
     Returns:
         Start index of match, or -1 if not found
     """
-    pattern_lines = pattern.strip().split('\n')
-    text_lines = text.split('\n')
+    pattern_block = CodeBlock.of(pattern)
+    text_block = CodeBlock.of(text)
+    pattern_lines = pattern_block.trimmed_lines
+    text_lines = text_block.lines
     
     if not pattern_lines:
         return -1
@@ -370,29 +752,99 @@ def _find_fuzzy_match(text: str, pattern: str, threshold: float = 0.7) -> int:
     # Look for the first line of the pattern
     first_line = pattern_lines[0].strip()
     
-    for i, line in enumerate(text_lines):
-        if first_line in line or line.strip() == first_line:
-            # Found potential start, check if rest matches
-            match_score = _calculate_block_similarity(
-                '\n'.join(text_lines[i:i+len(pattern_lines)]),
-                pattern
+    pattern_set = {line for line in pattern_block.stripped if line}
+    stripped = text_block.stripped
+    window_size = len(pattern_lines)
+    
+    if len(text_lines) >= _NUMBA_MIN_LINES:
+        find_window = _get_numba_find_window()
+        if find_window is not None:
+            return _find_fuzzy_match_numba(
+                find_window, text_lines, stripped, pattern_set, first_line, window_size, threshold
             )
-            if match_score >= threshold:
-                # Calculate character position
-                return sum(len(l) + 1 for l in text_lines[:i])
+    
+    # Distinct non-empty lines in the window, and how many are in the pattern
+    window_counts: Counter[str] = Counter()
+    intersection = 0
+    
+    def add(line: str) -> None:
+        nonlocal intersection
+        if line:
+            window_counts[line] += 1
+            if window_counts[line] == 1 and line in pattern_set:
+                intersection += 1
+    
+    def remove(line: str) -> None:
+        nonlocal intersection
+        if line:
+            window_counts[line] -= 1
+            if window_counts[line] == 0:
+                del window_counts[line]
+                if line in pattern_set:
+                    intersection -= 1
+    
+    for line in stripped[:window_size]:
+        add(line)
+    
+    position = 0
+    for i, line in enumerate(text_lines):
+        if i > 0:
+            remove(stripped[i - 1])
+            if i + window_size - 1 < len(stripped):
+                add(stripped[i + window_size - 1])
+        
+        if first_line in line or stripped[i] == first_line:
+            # Found potential start, check if the window matches
+            union = len(pattern_set) + len(window_counts) - intersection
+            if pattern_set and window_counts and intersection / union >= threshold:
+                return position
+        
+        position += len(line) + 1
     
     return -1
 
 
-def _calculate_block_similarity(block1: str, block2: str) -> float:
-    """Calculate similarity between two code blocks."""
-    lines1 = set(line.strip() for line in block1.split('\n') if line.strip())
-    lines2 = set(line.strip() for line in block2.split('\n') if line.strip())
-    
-    if not lines1 or not lines2:
-        return 0.0
-    
-    intersection = len(lines1 & lines2)
-    union = len(lines1 | lines2)
+@lru_cache(maxsize=1)
+def _get_numba_find_window() -> Optional[Any]:
+    """Import the Numba fuzzy match kernel, or None without Numba."""
+    try:
+        from mle_star.agents._fuzzy_numba import find_window
+    except ImportError:
+        return None
+    return find_window
+
+
+def _find_fuzzy_match_numba(
+    find_window: Any,
+    text_lines: tuple[str, ...],
+    stripped: tuple[str, ...],
+    pattern_set: set[str],
+    first_line: str,
+    window_size: int,
+    threshold: float,
+) -> int:
+    """Run the _find_fuzzy_match window search with the Numba kernel."""
+    import numpy as np
+    
+    # Dense ids for distinct non-empty lines, so the kernel can count them
+    # in a flat array
+    line_ids: dict[str, int] = {}
+    ids = np.fromiter(
+        (line_ids.setdefault(line, len(line_ids)) if line else -1 for line in stripped),
+        dtype=np.int64,
+        count=len(stripped),
+    )
+    in_pattern = np.fromiter(
+        (line in pattern_set for line in line_ids), dtype=np.bool_, count=len(line_ids)
+    )
+    candidates = np.fromiter(
+        (first_line in line or stripped_line == first_line
+         for line, stripped_line in zip(text_lines, stripped)),
+        dtype=np.bool_,
+        count=len(text_lines),
+    )
     
-    return intersection / union if union > 0 else 0.0
+    index = find_window(ids, in_pattern, candidates, window_size, len(pattern_set), threshold)
+    if index < 0:
+        return -1
+    return sum(len(line) + 1 for line in text_lines[:index])
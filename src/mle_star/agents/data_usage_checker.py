@@ -4,13 +4,21 @@ This agent analyzes solutions to ensure all provided data files are utilized
 and revises solutions to incorporate missing files.
 """
 
+import asyncio
+import csv
+import hashlib
+import re
+from collections import OrderedDict
+from contextlib import nullcontext
 from dataclasses import dataclass
-from typing import Optional
+from pathlib import Path, PurePath
+from typing import Optional, Union
 from strands import Agent
 
+from mle_star.agents.coder import iter_code_fences
 from mle_star.models.config import MLEStarConfig
-from mle_star.models.model_factory import create_model
-from mle_star.models.data_models import TaskDescription
+from mle_star.models.model_factory import create_model, cached_invoke, pooled_agent
+from mle_star.models.data_models import CodeBlock, TaskDescription
 
 
 DATA_USAGE_CHECKER_SYSTEM_PROMPT = """You are a data science expert ensuring comprehensive utilization of all provided data sources.
@@ -106,6 +114,45 @@ REVISED_CODE:
 </warnings>"""
 
 
+# Data file references in task descriptions, as one alternation so the
+# text is scanned once; each match fills exactly one group
+_TASK_FILE_PATTERN = re.compile(
+    r'["\']([^"\']+\.(?:csv|parquet|json|xlsx?|tsv|feather|pkl|pickle))["\']'
+    r'|\b(train\.csv|test\.csv|sample_submission\.csv)\b'
+    r'|\b(train_data|test_data|validation_data)\.csv\b',
+    re.IGNORECASE,
+)
+
+# File loading calls in solution code, in one alternation as above
+_USED_FILE_PATTERN = re.compile(
+    r'(?:pd\.read_(?:csv|parquet|json|excel|feather|pickle)|np\.load(?:txt)?|load_data)'
+    r'\(["\']([^"\']+)["\']'
+    r'|open\(["\']([^"\']+\.(?:csv|json|txt|parquet))["\']',
+    re.IGNORECASE,
+)
+
+# Single-line DataFrame load, capturing indentation, variable and path
+_READ_CSV_ASSIGNMENT_PATTERN = re.compile(
+    r'^([ \t]*)(\w+)\s*=\s*pd\.read_csv\(\s*["\']([^"\']+)["\'][^\n]*\)[ \t]*$',
+    re.MULTILINE,
+)
+
+# Identifier-like join key hints in task descriptions (id, user_id, StoreId)
+_JOIN_KEY_PATTERN = re.compile(r'\b(id|ID|[A-Za-z]\w*_(?:id|ID)|[a-z]\w*Id)\b')
+
+# Primary files the solution must use in a task-specific way
+_PRIMARY_FILE_PATTERN = re.compile(r'train|test|submission', re.IGNORECASE)
+
+# Largest auxiliary file read to check its join key is unique
+MAX_LOOKUP_FILE_BYTES = 50 * 1024 * 1024
+
+# Files used by scanned code, keyed by a blake2b digest of the code
+_used_files_cache: "OrderedDict[str, tuple[str, ...]]" = OrderedDict()
+
+# Maximum number of scans kept in _used_files_cache
+USED_FILES_CACHE_SIZE = 256
+
+
 @dataclass
 class DataUsageCheckResult:
     """Result of data usage checking.
@@ -154,89 +201,67 @@ def extract_data_files_from_task(task: TaskDescription) -> list[str]:
     Returns:
         List of data file paths/names mentioned in the task
     """
-    import re
-    
-    files = []
     text = task.description
+    # Case-folded path -> first spelling seen, deduplicating in order
+    unique_files: dict[str, str] = {}
     
-    # Common data file patterns
-    patterns = [
-        r'["\']([^"\']+\.csv)["\']',
-        r'["\']([^"\']+\.parquet)["\']',
-        r'["\']([^"\']+\.json)["\']',
-        r'["\']([^"\']+\.xlsx?)["\']',
-        r'["\']([^"\']+\.tsv)["\']',
-        r'["\']([^"\']+\.feather)["\']',
-        r'["\']([^"\']+\.pkl)["\']',
-        r'["\']([^"\']+\.pickle)["\']',
-        r'\b(train\.csv|test\.csv|sample_submission\.csv)\b',
-        r'\b(train_data|test_data|validation_data)\.csv\b',
-    ]
-    
-    for pattern in patterns:
-        matches = re.findall(pattern, text, re.IGNORECASE)
-        files.extend(matches)
+    for match in _TASK_FILE_PATTERN.finditer(text):
+        f = next(group for group in match.groups() if group)
+        unique_files.setdefault(f.lower(), f)
     
     # Also check dataset_path
     if task.dataset_path:
         if ',' in task.dataset_path:
-            files.extend([f.strip() for f in task.dataset_path.split(',')])
+            dataset_files = [f.strip() for f in task.dataset_path.split(',')]
         else:
-            files.append(task.dataset_path)
-    
-    # Remove duplicates while preserving order
-    seen = set()
-    unique_files = []
-    for f in files:
-        if f.lower() not in seen:
-            seen.add(f.lower())
-            unique_files.append(f)
+            dataset_files = [task.dataset_path]
+        for f in dataset_files:
+            unique_files.setdefault(f.lower(), f)
     
-    return unique_files
+    return list(unique_files.values())
 
 
-def extract_used_files_from_code(code: str) -> list[str]:
+def extract_used_files_from_code(
+    code: Union[CodeBlock, str],
+    use_cache: bool = True,
+) -> list[str]:
     """Extract data files that are actually used in the code.
     
+    Code scanned before, e.g. the same solution checked again in a later
+    iteration, reuses the earlier scan.
+    
     Args:
-        code: The solution code
+        code: The solution code, or a CodeBlock shared with other analyzers
+        use_cache: Whether to use the scan cache
         
     Returns:
         List of data file paths/names used in the code
     """
-    import re
-    
-    files = []
-    
-    # Patterns for file loading
-    patterns = [
-        r'pd\.read_csv\(["\']([^"\']+)["\']',
-        r'pd\.read_parquet\(["\']([^"\']+)["\']',
-        r'pd\.read_json\(["\']([^"\']+)["\']',
-        r'pd\.read_excel\(["\']([^"\']+)["\']',
-        r'pd\.read_feather\(["\']([^"\']+)["\']',
-        r'pd\.read_pickle\(["\']([^"\']+)["\']',
-        r'open\(["\']([^"\']+\.(?:csv|json|txt|parquet))["\']',
-        r'np\.load\(["\']([^"\']+)["\']',
-        r'np\.loadtxt\(["\']([^"\']+)["\']',
-        r'load_data\(["\']([^"\']+)["\']',
-    ]
-    
-    for pattern in patterns:
-        matches = re.findall(pattern, code, re.IGNORECASE)
-        files.extend(matches)
-    
-    # Remove duplicates while preserving order
-    seen = set()
-    unique_files = []
-    for f in files:
-        # Extract just the filename for comparison
-        filename = f.split('/')[-1].split('\\')[-1]
-        if filename.lower() not in seen:
-            seen.add(filename.lower())
-            unique_files.append(f)
-    
-    return unique_files
+    block = CodeBlock.of(code)
+    cache_key = hashlib.blake2b(block.raw.encode(), digest_size=16).hexdigest()
+    if use_cache and cache_key in _used_files_cache:
+        _used_files_cache.move_to_end(cache_key)
+        return list(_used_files_cache[cache_key])
+    
+    # Case-folded file name -> first path seen, deduplicating in order
+    unique_files: dict[str, str] = {}
+    
+    for match in block.matches(_USED_FILE_PATTERN):
+        f = next(group for group in match.groups() if group)
+        # Compare by just the filename
+        unique_files.setdefault(f.split('/')[-1].split('\\')[-1].lower(), f)
+    
+    if use_cache:
+        _used_files_cache[cache_key] = tuple(unique_files.values())
+        if len(_used_files_cache) > USED_FILES_CACHE_SIZE:
+            _used_files_cache.popitem(last=False)
+    return list(unique_files.values())
+
+
+def clear_used_files_cache() -> None:
+    """Clear the cache of data files found in scanned code."""
+    global _used_files_cache
+    _used_files_cache = OrderedDict()
 
 
 def find_missing_files(provided: list[str], used: list[str]) -> list[str]:
@@ -263,6 +288,156 @@ def find_missing_files(provided: list[str], used: list[str]) -> list[str]:
     return missing
 
 
+def _guess_join_key(task_description: str) -> Optional[str]:
+    """Guess the column auxiliary files are joined on from the task text.
+    
+    Args:
+        task_description: The task description
+        
+    Returns:
+        The most often mentioned id-like column name, or None if there is none
+    """
+    counts: dict[str, int] = {}
+    for match in _JOIN_KEY_PATTERN.finditer(task_description):
+        counts[match.group(1)] = counts.get(match.group(1), 0) + 1
+    if not counts:
+        return None
+    return max(counts, key=counts.__getitem__)
+
+
+def _mechanical_data_incorporation(
+    code: str,
+    missing: list[str],
+    task_description: str,
+) -> Optional[str]:
+    """Merge missing auxiliary CSV files into the code without the LLM.
+    
+    Only done when the merge is certain to be right: every CSV the code
+    loads is read by a single-line ``pd.read_csv`` assignment from one
+    absolute directory, each missing file is in that directory, and a key
+    column is in the headers of every file and unique in the auxiliary file,
+    so the left join cannot duplicate rows. Each missing file is then loaded
+    after the first assignment and joined into every loaded frame (except
+    submission templates).
+    
+    Args:
+        code: The solution code
+        missing: Files provided but not used by the code
+        task_description: The task description, searched for the join key
+        
+    Returns:
+        The revised code, or None if the files need the agent to integrate
+        them
+    """
+    if any(
+        not f.lower().endswith('.csv') or _PRIMARY_FILE_PATTERN.search(PurePath(f).name)
+        for f in missing
+    ):
+        return None
+    
+    all_loads = list(_READ_CSV_ASSIGNMENT_PATTERN.finditer(code))
+    # Loads from computed paths (f-strings, os.path.join) cannot be followed
+    if not all_loads or len(all_loads) != code.count("read_csv("):
+        return None
+    
+    directories = {PurePath(load.group(3)).parent for load in all_loads}
+    if len(directories) != 1:
+        return None
+    directory = Path(directories.pop())
+    if not directory.is_absolute():
+        return None
+    
+    loads = [load for load in all_loads if 'submission' not in load.group(3).lower()]
+    load_headers = [_read_csv_header(Path(load.group(3))) for load in loads]
+    if not loads or None in load_headers:
+        return None
+    
+    frames = []
+    for f in missing:
+        path = directory / PurePath(f).name
+        header = _read_csv_header(path)
+        if header is None:
+            return None
+        key = _find_join_key(task_description, [header, *load_headers])
+        if key is None or not _has_unique_values(path, header.index(key)):
+            return None
+        frames.append(("df_" + re.sub(r'\W', '_', path.stem).lower(), str(path), key))
+    
+    parts = []
+    position = 0
+    for i, load in enumerate(loads):
+        indent, variable = load.group(1), load.group(2)
+        parts.append(code[position:load.end()])
+        position = load.end()
+        if i == 0:
+            parts.extend(f'\n{indent}{name} = pd.read_csv({path!r})' for name, path, _ in frames)
+        parts.extend(
+            f'\n{indent}{variable} = {variable}.merge({name}, on="{key}", how="left")'
+            for name, _, key in frames
+        )
+    parts.append(code[position:])
+    
+    return "".join(parts)
+
+
+def _find_join_key(task_description: str, headers: list[list[str]]) -> Optional[str]:
+    """Find the column to join on, present in every header.
+    
+    Args:
+        task_description: The task description, searched for the key
+        headers: Column names of every file taking part in the join
+        
+    Returns:
+        The key mentioned most in the task if all files have it, otherwise
+        the only id-like column they share, or None
+    """
+    shared = set(headers[0]).intersection(*headers[1:])
+    
+    key = _guess_join_key(task_description)
+    if key in shared:
+        return key
+    
+    id_columns = [column for column in shared if _JOIN_KEY_PATTERN.fullmatch(column)]
+    return id_columns[0] if len(id_columns) == 1 else None
+
+
+def _read_csv_header(path: Path) -> Optional[list[str]]:
+    """Read the column names of a CSV file, or None if it cannot be read."""
+    try:
+        with open(path, newline="", encoding="utf-8") as f:
+            return next(csv.reader(f))
+    except (OSError, UnicodeDecodeError, StopIteration, csv.Error):
+        return None
+
+
+def _has_unique_values(path: Path, column: int) -> bool:
+    """Check a CSV column has no repeated values, reading small files only.
+    
+    Args:
+        path: Path to the CSV file
+        column: Index of the column to check
+        
+    Returns:
+        True if the column's values are unique; False if they repeat, or
+        the file is too large or cannot be read
+    """
+    try:
+        if path.stat().st_size > MAX_LOOKUP_FILE_BYTES:
+            return False
+        seen = set()
+        with open(path, newline="", encoding="utf-8") as f:
+            rows = csv.reader(f)
+            next(rows)
+            for row in rows:
+                value = row[column] if column < len(row) else ""
+                if value in seen:
+                    return False
+                seen.add(value)
+    except (OSError, UnicodeDecodeError, StopIteration, csv.Error):
+        return False
+    return True
+
+
 def build_data_usage_check_prompt(
     code: str,
     task: TaskDescription,
@@ -330,11 +505,8 @@ def parse_data_usage_response(
     Returns:
         DataUsageCheckResult with parsed information
     """
-    import re
-    
     # Extract revised code
-    code_pattern = r'```(?:python)?\s*\n(.*?)```'
-    code_matches = re.findall(code_pattern, response, re.DOTALL)
+    code_matches = list(iter_code_fences(response))
     
     if code_matches:
         revised_code = code_matches[-1].strip()
@@ -360,21 +532,24 @@ async def check_data_usage(
     task: TaskDescription,
     config: MLEStarConfig,
     agent: Optional[Agent] = None,
+    use_cache: bool = True,
 ) -> DataUsageCheckResult:
     """Check if all data files are used and revise if needed.
     
+    A revision for the same code and task reuses the earlier response
+    without an LLM call, and auxiliary CSV files whose join is certain from
+    their headers are merged in mechanically without asking the agent.
+    
     Args:
         code: The solution code to analyze
         task: The task description with data file information
         config: MLE-STAR configuration
-        agent: Optional pre-created agent
+        agent: Optional pre-created agent; a pooled agent is used otherwise
+        use_cache: Whether to use the agent response cache
         
     Returns:
         DataUsageCheckResult with analysis and revised code
     """
-    if agent is None:
-        agent = create_data_usage_checker_agent(config)
-    
     # Extract files
     provided_files = extract_data_files_from_task(task)
     used_files = extract_used_files_from_code(code)
@@ -391,12 +566,34 @@ async def check_data_usage(
             original_code=code,
         )
     
+    # Easy cases need no reasoning, so skip the LLM round-trip; the data
+    # files are read to check that, off the event loop
+    revised_code = await asyncio.to_thread(
+        _mechanical_data_incorporation, code, missing_files, task.description
+    )
+    if revised_code is not None:
+        new_used_files = extract_used_files_from_code(revised_code)
+        new_missing = find_missing_files(provided_files, new_used_files)
+        return DataUsageCheckResult(
+            all_files_used=not new_missing,
+            provided_files=provided_files,
+            used_files=new_used_files,
+            missing_files=new_missing,
+            revised_code=revised_code,
+            original_code=code,
+        )
+    
     # Build prompt and get revised code
     prompt = build_data_usage_check_prompt(code, task, provided_files, missing_files)
-    response = await agent.invoke_async(prompt)
+    agent_context = (
+        nullcontext(agent) if agent is not None
+        else pooled_agent(config, create_data_usage_checker_agent)
+    )
+    with agent_context as checker:
+        response_text = await cached_invoke(checker, prompt, config, use_cache=use_cache)
     
     return parse_data_usage_response(
-        str(response),
+        response_text,
         code,
         provided_files,
         used_files,
@@ -421,5 +618,4 @@ def check_data_usage_sync(
     Returns:
         DataUsageCheckResult with analysis and revised code
     """
-    import asyncio
     return asyncio.run(check_data_usage(code, task, config, agent))
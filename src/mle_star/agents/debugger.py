@@ -4,12 +4,29 @@ This agent analyzes error tracebacks from code execution and attempts to fix
 the code, with configurable retry logic.
 """
 
+import asyncio
+import glob
+import hashlib
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from contextlib import closing
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Optional
 from strands import Agent
 
 from mle_star.models.config import MLEStarConfig
-from mle_star.models.model_factory import create_model
+from mle_star.models.model_factory import (
+    create_model,
+    cached_invoke,
+    pooled_agent,
+    use_response_cache,
+)
 from mle_star.tools.execute_python import execute_python, ExecutionResult
 
 
@@ -99,6 +116,59 @@ When debugging, ask:
 - What's the simplest fix that addresses the root cause?
 </thinking>"""
 
+# Persistent debug cache hash state after the system prompt, copied per key
+# instead of rehashing the prompt every time
+_DEBUG_CACHE_KEY_PREFIX = hashlib.blake2b(f"{DEBUGGER_SYSTEM_PROMPT}|".encode(), digest_size=16)
+
+
+# Fenced (optionally python-tagged) code block
+_CODE_BLOCK_PATTERN = re.compile(r'```(?:python)?\s*\n(.*?)```', re.DOTALL)
+
+# Comment marker at the start of a line ("#", "//", "/*", "*")
+_COMMENT_START = r'[^\S\n]*(?:#|//|/\*|\*)'
+
+# Explanation line in a response without code blocks: any non-comment line
+# mentioning one of the phrases
+_EXPLANATION_LINE_PATTERN = re.compile(
+    rf'^(?!{_COMMENT_START}).*(?:here is|the fix|corrected|solution:).*\n?',
+    re.IGNORECASE | re.MULTILINE,
+)
+
+# Comment lines before the first line of code
+_LEADING_COMMENTS_PATTERN = re.compile(rf'\A(?:{_COMMENT_START}.*\n?)*')
+
+# Temporary script paths execute_python runs code from, which differ on
+# every run
+_TEMP_SCRIPT_PATTERN = re.compile(re.escape(tempfile.gettempdir()) + r'[\\/]tmp\w+\.py')
+
+# Object addresses in reprs ("<Booster object at 0x7f3a...>")
+_OBJECT_ADDRESS_PATTERN = re.compile(r' at 0x[0-9a-fA-F]+')
+
+# Import of a package that is not installed
+_MISSING_MODULE_PATTERN = re.compile(r"ModuleNotFoundError: No module named '([^']+)'")
+
+# Path of a file that does not exist (the last quoted string on the line)
+_MISSING_FILE_PATTERN = re.compile(r"FileNotFoundError: .*'([^']+)'")
+
+# Most recent failed attempts shown in a retry prompt
+DEBUG_HISTORY_SIZE = 3
+
+# Seconds a fix stays in the persistent debug cache
+DEBUG_CACHE_TTL = 7 * 24 * 3600
+
+# Packages the debugger may install when config.auto_install_packages is
+# set, by import name; anything else goes to the debugger agent
+AUTO_INSTALL_PACKAGES = {
+    "catboost": "catboost",
+    "cv2": "opencv-python",
+    "lightgbm": "lightgbm",
+    "PIL": "Pillow",
+    "skimage": "scikit-image",
+    "sklearn": "scikit-learn",
+    "xgboost": "xgboost",
+    "yaml": "PyYAML",
+}
+
 
 @dataclass
 class DebugResult:
@@ -152,34 +222,73 @@ def build_debug_prompt(
     Returns:
         Formatted prompt string for the debugger agent
     """
-    prompt_parts = [
-        "The following Python code failed to execute:\n",
-        "```python",
-        original_code,
-        "```\n",
-        "Error traceback:",
-        "```",
-        error_traceback,
-        "```\n",
+    attempt_blocks = [
+        _format_debug_attempt(i, code, error)
+        for i, (code, error) in enumerate(previous_attempts or [], 1)
     ]
-    
-    if previous_attempts:
-        prompt_parts.append("Previous debugging attempts that also failed:\n")
-        for i, (code, error) in enumerate(previous_attempts, 1):
-            prompt_parts.extend([
-                f"Attempt {i}:",
-                "```python",
-                code[:500] + "..." if len(code) > 500 else code,
-                "```",
-                f"Error: {error[:300]}...\n" if len(error) > 300 else f"Error: {error}\n",
-            ])
-    
-    prompt_parts.append(
+    return _assemble_debug_prompt(original_code, error_traceback, attempt_blocks)
+
+
+def _assemble_debug_prompt(
+    original_code: str,
+    error_traceback: str,
+    attempt_blocks: list[str],
+) -> str:
+    """Build the debugger prompt from already formatted attempt blocks."""
+    # Fixed instructions first and the per-retry history last, so retries
+    # share the longest possible prefix for provider prompt caching
+    prompt = (
         "Please analyze the error and provide the complete corrected code. "
-        "Return only the corrected Python code without any explanation."
+        "Return only the corrected Python code without any explanation.\n\n"
+        f"The following Python code failed to execute:\n\n```python\n{original_code}\n```\n\n"
+        f"Error traceback:\n```\n{normalize_traceback(error_traceback)}\n```\n"
     )
+    if not attempt_blocks:
+        return prompt
     
-    return "\n".join(prompt_parts)
+    return "\n".join([prompt, "Previous debugging attempts that also failed:\n", *attempt_blocks])
+
+
+def _format_debug_attempt(number: int, code: str, error: str) -> str:
+    """Format one failed attempt for the debugger prompt's history."""
+    return "\n".join([
+        f"Attempt {number}:",
+        "```python",
+        code[:500] + "..." if len(code) > 500 else code,
+        "```",
+        f"Error: {error[:300]}...\n" if len(error) > 300 else f"Error: {error}\n",
+    ])
+
+
+def _record_debug_attempt(
+    attempt_history: OrderedDict[str, str],
+    number: int,
+    code: str,
+    error: str,
+) -> None:
+    """Record a failed attempt as the latest for its error, keeping DEBUG_HISTORY_SIZE."""
+    error_key = normalize_traceback(error)
+    attempt_history.pop(error_key, None)
+    attempt_history[error_key] = _format_debug_attempt(number, code, error)
+    if len(attempt_history) > DEBUG_HISTORY_SIZE:
+        attempt_history.popitem(last=False)
+
+
+def normalize_traceback(error_traceback: str) -> str:
+    """Remove run-specific details from a traceback.
+    
+    The temporary script path and object addresses change on every run
+    even when the error is the same; replacing them keeps prompts for the
+    same error identical. Line numbers are kept, as they locate the error.
+    
+    Args:
+        error_traceback: Traceback or error message from execution
+        
+    Returns:
+        The traceback with stable placeholders
+    """
+    error_traceback = _TEMP_SCRIPT_PATTERN.sub("solution.py", error_traceback)
+    return _OBJECT_ADDRESS_PATTERN.sub(" at 0xADDR", error_traceback)
 
 
 def extract_code_from_debug_response(response: str) -> str:
@@ -191,34 +300,90 @@ def extract_code_from_debug_response(response: str) -> str:
     Returns:
         Extracted Python code
     """
-    import re
-    
     # Try to extract code from markdown code blocks
-    code_pattern = r'```(?:python)?\s*\n(.*?)```'
-    matches = re.findall(code_pattern, response, re.DOTALL)
+    matches = _CODE_BLOCK_PATTERN.findall(response)
     
     if matches:
         # Return the longest code block
         return max(matches, key=len).strip()
     
-    # If no code blocks, assume the entire response is code
-    # Remove any leading/trailing explanation
-    lines = response.strip().split('\n')
-    code_lines = []
-    in_code = False
+    # If no code blocks, assume the entire response is code: drop
+    # explanation lines, then comments before the first line of code
+    code = _EXPLANATION_LINE_PATTERN.sub('', response.strip())
+    return _LEADING_COMMENTS_PATTERN.sub('', code, count=1).strip()
+
+
+def _get_data_dir(dataset_path: str) -> Optional[str]:
+    """Directory holding a task's dataset, or None if it is unknown.
+    
+    Args:
+        dataset_path: The task's dataset path (a file, a directory, or a
+            comma-separated list of them)
+        
+    Returns:
+        The directory of the first dataset entry, or None if it does not exist
+    """
+    path = dataset_path.split(",")[0].strip()
+    if not path:
+        return None
+    data_dir = path if os.path.isdir(path) else os.path.dirname(os.path.abspath(path))
+    return data_dir if os.path.isdir(data_dir) else None
+
+
+def _try_trivial_fix(
+    code: str,
+    error_traceback: str,
+    config: MLEStarConfig,
+    data_dir: Optional[str] = None,
+) -> Optional[str]:
+    """Fix errors that need no LLM: missing packages and misplaced files.
+    
+    A ModuleNotFoundError for a package in AUTO_INSTALL_PACKAGES is fixed by
+    installing it before the script runs, only with
+    config.auto_install_packages set; a FileNotFoundError by replacing the
+    path literal with the one file of the same name under data_dir. Searches
+    the filesystem, so call it off the event loop.
+    
+    Args:
+        code: The code that failed
+        error_traceback: The error traceback from execution
+        config: MLE-STAR configuration with auto_install_packages
+        data_dir: The task's dataset directory, or None to skip file fixes
+        
+    Returns:
+        The fixed code, or None if the error needs the debugger agent
+    """
+    match = _MISSING_MODULE_PATTERN.search(error_traceback)
+    if match:
+        package = AUTO_INSTALL_PACKAGES.get(match.group(1).split(".")[0])
+        if not config.auto_install_packages or package is None:
+            return None
+        install = (
+            "import subprocess, sys; "
+            f"subprocess.check_call([sys.executable, '-m', 'pip', 'install', '{package}'])\n"
+        )
+        # An earlier install did not help, and __future__ imports must stay first
+        if install in code or "from __future__" in code:
+            return None
+        return install + code
     
-    for line in lines:
-        # Skip obvious explanation lines
-        if line.strip().startswith(('#', '//', '/*', '*')):
-            if in_code:
-                code_lines.append(line)
-            continue
-        if any(keyword in line.lower() for keyword in ['here is', 'the fix', 'corrected', 'solution:']):
-            continue
-        code_lines.append(line)
-        in_code = True
+    match = _MISSING_FILE_PATTERN.search(error_traceback)
+    if match:
+        missing = match.group(1)
+        basename = os.path.basename(missing)
+        if not basename or data_dir is None:
+            return None
+        pattern = os.path.join(glob.escape(data_dir), "**", glob.escape(basename))
+        found = glob.glob(pattern, recursive=True)
+        if len(found) != 1:
+            # Nothing to point at, or no telling which file was meant
+            return None
+        for quote in ('"', "'"):
+            literal = f"{quote}{missing}{quote}"
+            if literal in code:
+                return code.replace(literal, repr(os.path.abspath(found[0])))
     
-    return '\n'.join(code_lines).strip()
+    return None
 
 
 async def debug_code(
@@ -226,24 +391,34 @@ async def debug_code(
     error_traceback: str,
     config: MLEStarConfig,
     agent: Optional[Agent] = None,
+    use_cache: bool = True,
 ) -> tuple[str, bool]:
     """Attempt to debug code using the debugger agent.
     
+    At temperature 0 the agent's answer is deterministic, so the same code
+    and error reuse an earlier response without an LLM call; sampled
+    answers are never cached, so a failed fix is not replayed.
+    
     Args:
         code: The code that failed
         error_traceback: The error traceback
         config: MLE-STAR configuration
-        agent: Optional pre-created agent (creates new one if not provided)
+        agent: Optional pre-created agent (reuses a pooled one if not provided)
+        use_cache: Whether to use the agent response cache at temperature 0
         
     Returns:
         Tuple of (corrected_code, success)
     """
     if agent is None:
-        agent = create_debugger_agent(config)
+        # Reuse an idle debugger agent instead of rebuilding it
+        with pooled_agent(config, create_debugger_agent) as agent:
+            return await debug_code(code, error_traceback, config, agent, use_cache)
     
     prompt = build_debug_prompt(code, error_traceback)
-    response = await agent.invoke_async(prompt)
-    corrected_code = extract_code_from_debug_response(str(response))
+    corrected_code = _load_persisted_fix(config, prompt, use_cache)
+    if corrected_code is None:
+        response_text = await cached_invoke(agent, prompt, config, use_cache=use_cache)
+        corrected_code = extract_code_from_debug_response(response_text)
     
     return corrected_code, bool(corrected_code and corrected_code != code)
 
@@ -253,29 +428,48 @@ async def debug_with_retries(
     config: MLEStarConfig,
     last_working_code: Optional[str] = None,
     timeout: int = 300,
+    use_cache: bool = True,
+    dataset_path: str = "",
 ) -> DebugResult:
     """Debug code with retry logic up to max_debug_retries.
     
     This function executes the code, and if it fails, attempts to debug it
     up to max_debug_retries times. If all attempts fail, returns the last
-    working version.
+    working version. As in debug_code, responses are cached only at
+    temperature 0; each retry's prompt includes earlier attempts (the latest
+    per distinct error, at most DEBUG_HISTORY_SIZE), so retries never hit
+    each other's entries.
+    
+    Allowlisted missing packages (with config.auto_install_packages) and
+    files misplaced within the dataset directory are fixed without the
+    agent (see _try_trivial_fix). With config.debug_cache_dir set, fixes that run
+    are also persisted at temperature 0 and reused by later processes.
+    
+    With config.parallel_debug and a temperature above 0, the attempts are
+    instead sampled concurrently from the original error (see
+    _debug_in_parallel).
     
     Args:
         code: The code to execute and potentially debug
         config: MLE-STAR configuration with max_debug_retries
         last_working_code: Optional fallback code if all debugging fails
         timeout: Execution timeout in seconds
+        use_cache: Whether to use the agent response cache at temperature 0
+        dataset_path: The task's dataset path, searched for misplaced files
         
     Returns:
         DebugResult with the outcome of debugging attempts
     """
-    agent = create_debugger_agent(config)
     current_code = code
     error_history: list[str] = []
-    previous_attempts: list[tuple[str, str]] = []
+    # Latest failed attempt per distinct error, formatted once as it happens
+    # and bounded to DEBUG_HISTORY_SIZE so retry prompts stay small
+    attempt_history: OrderedDict[str, str] = OrderedDict()
+    attempts_recorded = 0
     
-    # First execution attempt
-    result = execute_python(current_code, timeout=timeout)
+    # First execution attempt, in a worker thread so other runs on the
+    # event loop keep going while the code executes
+    result = await asyncio.to_thread(execute_python, current_code, timeout=timeout)
     
     if result.success:
         return DebugResult(
@@ -288,38 +482,70 @@ async def debug_with_retries(
     
     # Code failed, start debugging
     error_history.append(result.error_message or result.stderr)
+    # Error of every version run so far; the agent proposing one again is cycling
+    tried_code = {code: error_history[-1]}
     
-    for attempt in range(config.max_debug_retries):
-        error_traceback = result.error_message or result.stderr
-        
-        # Build prompt with history of previous attempts
-        prompt = build_debug_prompt(current_code, error_traceback, previous_attempts)
-        
-        # Get corrected code from agent
-        response = await agent.invoke_async(prompt)
-        corrected_code = extract_code_from_debug_response(str(response))
-        
-        if not corrected_code or corrected_code == current_code:
-            # Agent couldn't produce different code
-            continue
-        
-        # Track this attempt
-        previous_attempts.append((current_code, error_traceback))
-        current_code = corrected_code
-        
-        # Try executing the corrected code
-        result = execute_python(current_code, timeout=timeout)
-        
-        if result.success:
-            return DebugResult(
-                success=True,
-                corrected_code=current_code,
-                execution_result=result,
-                attempts_made=attempt + 1,
-                error_history=error_history,
+    if config.parallel_debug and config.temperature > 0 and config.max_debug_retries > 1:
+        return await _debug_in_parallel(
+            code, result, config, last_working_code, timeout, error_history
+        )
+    
+    data_dir = _get_data_dir(dataset_path)
+    
+    # One agent, reused from earlier sessions, for every retry of this one
+    with pooled_agent(config, create_debugger_agent) as agent:
+        for attempt in range(config.max_debug_retries):
+            error_traceback = result.error_message or result.stderr
+            
+            prompt = None
+            corrected_code = await asyncio.to_thread(
+                _try_trivial_fix, current_code, error_traceback, config, data_dir
             )
-        
-        error_history.append(result.error_message or result.stderr)
+            if corrected_code is None:
+                # Build prompt with history of previous attempts
+                prompt = _assemble_debug_prompt(
+                    current_code, error_traceback, list(attempt_history.values())
+                )
+                corrected_code = _load_persisted_fix(config, prompt, use_cache)
+            
+            if corrected_code is None:
+                # Get corrected code from agent
+                response_text = await cached_invoke(agent, prompt, config, use_cache=use_cache)
+                corrected_code = extract_code_from_debug_response(response_text)
+            
+            if not corrected_code:
+                continue
+            
+            if corrected_code in tried_code:
+                # Show the repeated fix as the latest failure, so the next
+                # prompt differs instead of asking the same question again
+                attempts_recorded += 1
+                _record_debug_attempt(
+                    attempt_history, attempts_recorded, corrected_code, tried_code[corrected_code]
+                )
+                continue
+            
+            # Track this attempt
+            attempts_recorded += 1
+            _record_debug_attempt(attempt_history, attempts_recorded, current_code, error_traceback)
+            current_code = corrected_code
+            
+            # Try executing the corrected code
+            result = await asyncio.to_thread(execute_python, current_code, timeout=timeout)
+            
+            if result.success:
+                if prompt is not None:
+                    _persist_fix(config, prompt, current_code, use_cache)
+                return DebugResult(
+                    success=True,
+                    corrected_code=current_code,
+                    execution_result=result,
+                    attempts_made=attempt + 1,
+                    error_history=error_history,
+                )
+            
+            error_history.append(result.error_message or result.stderr)
+            tried_code[current_code] = error_history[-1]
     
     # All attempts failed, return last working version or last attempted code
     final_code = last_working_code if last_working_code else current_code
@@ -333,6 +559,148 @@ async def debug_with_retries(
     )
 
 
+async def _debug_in_parallel(
+    code: str,
+    result: ExecutionResult,
+    config: MLEStarConfig,
+    last_working_code: Optional[str],
+    timeout: int,
+    error_history: list[str],
+) -> DebugResult:
+    """Sample max_debug_retries fixes concurrently and keep the first that runs.
+    
+    Each attempt checks out its own pooled agent and runs its fix in a
+    worker thread, so LLM calls and executions overlap. Once a fix runs
+    successfully the attempts still waiting on the LLM are cancelled;
+    executions already running finish in their threads.
+    
+    Args:
+        code: The code that failed
+        result: Execution result of the failed code
+        config: MLE-STAR configuration
+        last_working_code: Optional fallback code if all attempts fail
+        timeout: Execution timeout in seconds
+        error_history: Errors so far, extended with each failed attempt
+        
+    Returns:
+        DebugResult with the first successful attempt, or the last failure
+    """
+    prompt = build_debug_prompt(code, result.error_message or result.stderr)
+    
+    async def attempt() -> tuple[str, Optional[ExecutionResult]]:
+        with pooled_agent(config, create_debugger_agent) as agent:
+            # Sampled answers are not cached (see debug_code)
+            response_text = await cached_invoke(agent, prompt, config, use_cache=False)
+        corrected_code = extract_code_from_debug_response(response_text)
+        if not corrected_code or corrected_code == code:
+            return corrected_code, None
+        return corrected_code, await asyncio.to_thread(execute_python, corrected_code, timeout=timeout)
+    
+    tasks = [asyncio.create_task(attempt()) for _ in range(config.max_debug_retries)]
+    final_code = code
+    try:
+        for attempts_made, next_attempt in enumerate(asyncio.as_completed(tasks), 1):
+            corrected_code, attempt_result = await next_attempt
+            if attempt_result is None:
+                continue
+            
+            final_code, result = corrected_code, attempt_result
+            if attempt_result.success:
+                return DebugResult(
+                    success=True,
+                    corrected_code=corrected_code,
+                    execution_result=attempt_result,
+                    attempts_made=attempts_made,
+                    error_history=error_history,
+                )
+            error_history.append(attempt_result.error_message or attempt_result.stderr)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    
+    return DebugResult(
+        success=False,
+        corrected_code=last_working_code if last_working_code else final_code,
+        execution_result=result,
+        attempts_made=config.max_debug_retries,
+        error_history=error_history,
+    )
+
+
+def _debug_cache_path(config: MLEStarConfig, use_cache: bool) -> Optional[str]:
+    """Get the persistent debug cache file, or None if it is not used."""
+    if not (config.debug_cache_dir and use_response_cache(config, use_cache)):
+        return None
+    return os.path.join(os.path.expanduser(config.debug_cache_dir), "debugger.sqlite3")
+
+
+def _connect_debug_cache(path: str) -> sqlite3.Connection:
+    """Open the persistent debug cache, creating it if needed."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    connection = sqlite3.connect(path)
+    connection.execute(
+        "CREATE TABLE IF NOT EXISTS fixes "
+        "(key TEXT PRIMARY KEY, code TEXT NOT NULL, created REAL NOT NULL)"
+    )
+    return connection
+
+
+def _debug_cache_key(prompt: str) -> str:
+    """Generate the persistent cache key for a debug prompt."""
+    key_hash = _DEBUG_CACHE_KEY_PREFIX.copy()
+    key_hash.update(prompt.encode())
+    return key_hash.hexdigest()
+
+
+def _load_persisted_fix(config: MLEStarConfig, prompt: str, use_cache: bool) -> Optional[str]:
+    """Load a fix that previously ran for this prompt from the disk cache.
+    
+    Args:
+        config: MLE-STAR configuration with debug_cache_dir
+        prompt: Debug prompt the fix answered
+        use_cache: Whether caching is enabled for this call
+        
+    Returns:
+        The fixed code, or None if there is no unexpired entry
+    """
+    path = _debug_cache_path(config, use_cache)
+    if path is None:
+        return None
+    try:
+        with closing(_connect_debug_cache(path)) as connection:
+            row = connection.execute(
+                "SELECT code FROM fixes WHERE key = ? AND created >= ?",
+                (_debug_cache_key(prompt), time.time() - DEBUG_CACHE_TTL),
+            ).fetchone()
+    except (sqlite3.Error, OSError):
+        # The cache only saves LLM calls; debugging works without it
+        return None
+    return row[0] if row else None
+
+
+def _persist_fix(config: MLEStarConfig, prompt: str, code: str, use_cache: bool) -> None:
+    """Save a fix that ran successfully to the disk cache.
+    
+    Args:
+        config: MLE-STAR configuration with debug_cache_dir
+        prompt: Debug prompt the fix answered
+        code: The fixed code
+        use_cache: Whether caching is enabled for this call
+    """
+    path = _debug_cache_path(config, use_cache)
+    if path is None:
+        return
+    try:
+        with closing(_connect_debug_cache(path)) as connection, connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO fixes VALUES (?, ?, ?)",
+                (_debug_cache_key(prompt), code, time.time()),
+            )
+    except (sqlite3.Error, OSError):
+        pass
+
+
 def debug_with_retries_sync(
     code: str,
     config: MLEStarConfig,
@@ -341,6 +709,10 @@ def debug_with_retries_sync(
 ) -> DebugResult:
     """Synchronous version of debug_with_retries.
     
+    Calls run on one long-lived background event loop rather than a new
+    loop each, so agents and their HTTP connections stay usable across
+    calls. Must not be called from a coroutine.
+    
     Args:
         code: The code to execute and potentially debug
         config: MLE-STAR configuration with max_debug_retries
@@ -350,5 +722,16 @@ def debug_with_retries_sync(
     Returns:
         DebugResult with the outcome of debugging attempts
     """
-    import asyncio
-    return asyncio.run(debug_with_retries(code, config, last_working_code, timeout))
+    future = asyncio.run_coroutine_threadsafe(
+        debug_with_retries(code, config, last_working_code, timeout),
+        _get_background_loop(),
+    )
+    return future.result()
+
+
+@lru_cache(maxsize=1)
+def _get_background_loop() -> asyncio.AbstractEventLoop:
+    """Start the event loop debug_with_retries_sync runs on, once."""
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, name="mle-star-debugger", daemon=True).start()
+    return loop
@@ -5,13 +5,17 @@ them into a more powerful ensemble. It uses previous ensemble attempts
 as feedback to propose improved strategies.
 """
 
-from typing import Optional
+import hashlib
+import operator
+import re
+from functools import lru_cache
+from typing import Optional, Sequence
 from dataclasses import dataclass
 from strands import Agent
 
 from mle_star.models.data_models import EnsembleResult
 from mle_star.models.config import MLEStarConfig
-from mle_star.models.model_factory import create_model
+from mle_star.models.model_factory import create_model, pooled_agent
 
 
 ENSEMBLE_PLANNER_SYSTEM_PROMPT = """You are an ensemble methods expert who designs optimal strategies for combining multiple ML models.
@@ -100,7 +104,27 @@ If previous ensemble attempts exist:
 </differentiation>"""
 
 
-@dataclass
+# Sections of the plan format, by normalized header
+_SECTION_NAMES = frozenset({
+    "strategy name",
+    "description",
+    "implementation steps",
+    "steps",
+    "weight assignment",
+    "expected benefit",
+})
+
+# Header opening one strategy of a batched response ("## Strategy [2]")
+_BATCH_STRATEGY_HEADER_PATTERN = re.compile(r'^#+\s*Strategy\s+\[?\d+\]?.*$', re.IGNORECASE | re.MULTILINE)
+
+# Numbered step line ("1. Train all base models")
+_NUMBERED_STEP_PATTERN = re.compile(r'^\s*\d+\.\s*(.+)$')
+
+# Numbered list item anywhere in the response
+_NUMBERED_ITEM_PATTERN = re.compile(r'\d+\.\s+([^\n]+)')
+
+
+@dataclass(slots=True)
 class EnsemblePlan:
     """A proposed ensemble strategy plan."""
     strategy_name: str
@@ -136,6 +160,7 @@ def build_ensemble_planner_prompt(
     task_type: str,
     evaluation_metric: str,
     previous_attempts: list[EnsembleResult],
+    rejected_strategies: Sequence[str] = (),
 ) -> str:
     """Build the prompt for proposing an ensemble strategy.
     
@@ -144,31 +169,30 @@ def build_ensemble_planner_prompt(
         task_type: Type of ML task (classification, regression, etc.)
         evaluation_metric: Metric used for evaluation
         previous_attempts: List of previous ensemble attempts with results
+        rejected_strategies: Proposed strategies rejected as repeats of
+            previous attempts, which must not be proposed again
         
     Returns:
         Formatted prompt string
     """
-    # Format solutions info
-    solutions_info = "\n## Available Solutions\n"
-    for i, (code, score) in enumerate(solutions, 1):
-        # Truncate code for prompt
-        code_preview = code[:500] + "..." if len(code) > 500 else code
-        solutions_info += f"""
-### Solution {i} (Score: {score:.4f})
-```python
-{code_preview}
-```
-"""
+    solutions_info = _format_solutions_info(solutions)
     
     # Format previous attempts
     attempts_info = ""
     if previous_attempts:
-        attempts_info = "\n## Previous Ensemble Attempts\n"
+        attempts_parts = ["\n## Previous Ensemble Attempts\n"]
         for i, attempt in enumerate(previous_attempts, 1):
-            attempts_info += f"""
+            attempts_parts.append(f"""
 ### Attempt {i}: {attempt.strategy} (Score: {attempt.validation_score:.4f})
-"""
-        attempts_info += "\nPropose a DIFFERENT strategy than these previous attempts.\n"
+""")
+        attempts_parts.append("\nPropose a DIFFERENT strategy than these previous attempts.\n")
+        attempts_info = "".join(attempts_parts)
+    
+    if rejected_strategies:
+        attempts_info += (
+            f"\nDo not propose {', '.join(rejected_strategies)} again: they repeat "
+            "previous attempts. Choose a substantially different approach.\n"
+        )
     
     return f"""Propose an ensemble strategy to combine the following ML solutions.
 
@@ -186,16 +210,69 @@ def build_ensemble_planner_prompt(
 Generate your ensemble strategy proposal now."""
 
 
+def build_batch_ensemble_planner_prompt(
+    solutions: list[tuple[str, float]],
+    task_type: str,
+    evaluation_metric: str,
+    num_strategies: int,
+) -> str:
+    """Build the prompt for proposing several ensemble strategies at once.
+    
+    Args:
+        solutions: List of (solution_code, validation_score) tuples
+        task_type: Type of ML task (classification, regression, etc.)
+        evaluation_metric: Metric used for evaluation
+        num_strategies: Number of different strategies to propose
+        
+    Returns:
+        Formatted prompt string
+    """
+    solutions_info = _format_solutions_info(solutions)
+    
+    return f"""Propose {num_strategies} different ensemble strategies to combine the following ML solutions.
+
+## Task Information
+- Task Type: {task_type}
+- Evaluation Metric: {evaluation_metric}
+- Number of Solutions: {len(solutions)}
+{solutions_info}
+## Requirements
+1. Propose {num_strategies} strategies appropriate for the task type, each from a DIFFERENT strategy category or technique
+2. Consider the validation scores when assigning weights
+3. Provide specific implementation steps
+4. Explain the expected benefit
+5. Start each strategy with a "## Strategy [i]" header (i = 1 to {num_strategies}) followed by its Strategy Name, Description, Implementation Steps, Weight Assignment and Expected Benefit sections
+
+Generate your {num_strategies} ensemble strategy proposals now."""
+
+
+def _format_solutions_info(solutions: list[tuple[str, float]]) -> str:
+    """Format the solutions to ensemble for a planner prompt."""
+    solutions_parts = ["\n## Available Solutions\n"]
+    for i, (code, score) in enumerate(solutions, 1):
+        # Truncate code for prompt
+        code_preview = code[:500] + "..." if len(code) > 500 else code
+        solutions_parts.append(f"""
+### Solution {i} (Score: {score:.4f})
+```python
+{code_preview}
+```
+""")
+    return "".join(solutions_parts)
+
+
 async def propose_ensemble_strategy(
     solutions: list[tuple[str, float]],
     task_type: str,
     evaluation_metric: str,
     previous_attempts: list[EnsembleResult],
     config: MLEStarConfig,
+    agent: Optional[Agent] = None,
+    rejected_strategies: Sequence[str] = (),
 ) -> EnsemblePlan:
     """Propose an ensemble strategy to combine multiple solutions.
     
-    This function creates an agent to analyze the available solutions
+    This function uses an agent to analyze the available solutions
     and propose a strategy for combining them.
     
     Args:
@@ -204,13 +281,23 @@ async def propose_ensemble_strategy(
         evaluation_metric: Metric used for evaluation
         previous_attempts: List of previous ensemble attempts
         config: MLE-STAR configuration
+        agent: Optional pre-created agent (reuses a pooled one if not provided)
+        rejected_strategies: Proposed strategies rejected as repeats, named
+            in the prompt so the planner avoids them
         
     Returns:
         EnsemblePlan with the proposed strategy
     """
-    agent = create_ensemble_planner_agent(config)
+    if agent is None:
+        # Reuse an idle planner agent across iterations instead of rebuilding it
+        with pooled_agent(config, create_ensemble_planner_agent) as agent:
+            return await propose_ensemble_strategy(
+                solutions, task_type, evaluation_metric, previous_attempts, config, agent,
+                rejected_strategies,
+            )
+    
     prompt = build_ensemble_planner_prompt(
-        solutions, task_type, evaluation_metric, previous_attempts
+        solutions, task_type, evaluation_metric, previous_attempts, rejected_strategies
     )
     
     try:
@@ -232,6 +319,73 @@ async def propose_ensemble_strategy(
         )
 
 
+async def propose_ensemble_strategies(
+    solutions: list[tuple[str, float]],
+    task_type: str,
+    evaluation_metric: str,
+    num_strategies: int,
+    config: MLEStarConfig,
+    agent: Optional[Agent] = None,
+) -> list[EnsemblePlan]:
+    """Propose several different ensemble strategies with one planner call.
+    
+    The solutions are sent once for all strategies instead of once per
+    strategy, so their tokens are paid for a single time.
+    
+    Args:
+        solutions: List of (solution_code, validation_score) tuples
+        task_type: Type of ML task
+        evaluation_metric: Metric used for evaluation
+        num_strategies: Number of strategies to propose
+        config: MLE-STAR configuration
+        agent: Optional pre-created agent (reuses a pooled one if not provided)
+        
+    Returns:
+        The proposed plans, in order; a single failed plan if the call failed
+    """
+    if agent is None:
+        with pooled_agent(config, create_ensemble_planner_agent) as agent:
+            return await propose_ensemble_strategies(
+                solutions, task_type, evaluation_metric, num_strategies, config, agent
+            )
+    
+    prompt = build_batch_ensemble_planner_prompt(
+        solutions, task_type, evaluation_metric, num_strategies
+    )
+    
+    try:
+        response = await agent.invoke_async(prompt)
+        return parse_ensemble_plans_batch(str(response))
+    except Exception as e:
+        return [EnsemblePlan(
+            strategy_name="",
+            description="",
+            implementation_steps=[],
+            weight_assignment=None,
+            expected_benefit="",
+            success=False,
+            error_message=str(e),
+        )]
+
+
+def parse_ensemble_plans_batch(response: str) -> list[EnsemblePlan]:
+    """Parse the ensemble plans of a batched planner response.
+    
+    Args:
+        response: Agent response with one "## Strategy [i]" section per plan
+        
+    Returns:
+        EnsemblePlan for each section, or for the whole response if it has
+        no strategy headers
+    """
+    starts = [match.start() for match in _BATCH_STRATEGY_HEADER_PATTERN.finditer(response)]
+    if not starts:
+        return [parse_ensemble_plan(response)]
+    
+    ends = starts[1:] + [len(response)]
+    return [parse_ensemble_plan(response[start:end]) for start, end in zip(starts, ends)]
+
+
 def parse_ensemble_plan(response: str) -> EnsemblePlan:
     """Parse an ensemble plan from agent response.
     
@@ -241,56 +395,29 @@ def parse_ensemble_plan(response: str) -> EnsemblePlan:
     Returns:
         EnsemblePlan with parsed information
     """
-    import re
-    
-    strategy_name = ""
-    description = ""
-    implementation_steps: list[str] = []
-    weight_assignment: Optional[str] = None
-    expected_benefit = ""
-    
-    # Extract strategy name
-    name_pattern = r"Strategy\s+Name[:\s]+([^\n]+)"
-    name_match = re.search(name_pattern, response, re.IGNORECASE)
-    if name_match:
-        strategy_name = name_match.group(1).strip()
+    sections = _split_sections(response)
     
-    # Extract description
-    desc_pattern = r"Description[:\s]*\n([^\n#]+(?:\n[^\n#]+)*)"
-    desc_match = re.search(desc_pattern, response, re.IGNORECASE)
-    if desc_match:
-        description = desc_match.group(1).strip()
+    strategy_name = _section_paragraph(sections.get("strategy name", [])).split("\n")[0]
+    description = _section_paragraph(sections.get("description", []))
+    weight_assignment = _section_paragraph(sections.get("weight assignment", [])) or None
+    expected_benefit = _section_paragraph(sections.get("expected benefit", []))
     
     # Extract implementation steps
-    steps_pattern = r"(?:Implementation\s+)?Steps[:\s]*\n((?:\d+\.\s*[^\n]+\n?)+)"
-    steps_match = re.search(steps_pattern, response, re.IGNORECASE)
-    if steps_match:
-        steps_text = steps_match.group(1)
-        for line in steps_text.split('\n'):
-            step = re.sub(r'^\d+\.\s*', '', line.strip())
-            if step and len(step) > 5:
+    implementation_steps: list[str] = []
+    for line in sections.get("implementation steps", sections.get("steps", [])):
+        step_match = _NUMBERED_STEP_PATTERN.match(line)
+        if step_match:
+            step = step_match.group(1).strip()
+            if len(step) > 5:
                 implementation_steps.append(step)
     
     # Alternative: look for numbered list anywhere
     if not implementation_steps:
-        numbered_pattern = r'\d+\.\s+([^\n]+)'
-        for match in re.finditer(numbered_pattern, response):
+        for match in _NUMBERED_ITEM_PATTERN.finditer(response):
             step = match.group(1).strip()
             if step and len(step) > 5:
                 implementation_steps.append(step)
     
-    # Extract weight assignment
-    weight_pattern = r"Weight\s+Assignment[:\s]*\n([^\n#]+(?:\n[^\n#]+)*)"
-    weight_match = re.search(weight_pattern, response, re.IGNORECASE)
-    if weight_match:
-        weight_assignment = weight_match.group(1).strip()
-    
-    # Extract expected benefit
-    benefit_pattern = r"Expected\s+Benefit[:\s]*\n([^\n#]+(?:\n[^\n#]+)*)"
-    benefit_match = re.search(benefit_pattern, response, re.IGNORECASE)
-    if benefit_match:
-        expected_benefit = benefit_match.group(1).strip()
-    
     # If no structured output, use the response as description
     if not strategy_name and not implementation_steps:
         strategy_name = "Custom Ensemble"
@@ -308,6 +435,51 @@ def parse_ensemble_plan(response: str) -> EnsemblePlan:
     )
 
 
+def _split_sections(response: str) -> dict[str, list[str]]:
+    """Split a plan response into its sections in one pass over the lines.
+    
+    A header is a markdown heading ("### Description") or a line naming
+    one of _SECTION_NAMES ("Strategy Name: Weighted Average"); text after
+    its colon becomes the first line of the section. Later sections with
+    the same name are ignored.
+    
+    Args:
+        response: Agent response text
+        
+    Returns:
+        Lines of each section, keyed by lowercased header name
+    """
+    sections: dict[str, list[str]] = {}
+    current: Optional[list[str]] = None
+    
+    for line in response.split("\n"):
+        text = line.strip()
+        is_heading = text.startswith("#")
+        name, colon, value = text.lstrip("#").partition(":")
+        name = " ".join(name.strip(" *").lower().split())
+        
+        if is_heading or (name in _SECTION_NAMES and (colon or not value)):
+            current = [] if name in sections else sections.setdefault(name, [])
+            value = value.strip(" *")
+            if value:
+                current.append(value)
+        elif current is not None:
+            current.append(line)
+    
+    return sections
+
+
+def _section_paragraph(lines: list[str]) -> str:
+    """Get the first paragraph of a section's lines."""
+    paragraph: list[str] = []
+    for line in lines:
+        if line.strip():
+            paragraph.append(line)
+        elif paragraph:
+            break
+    return "\n".join(paragraph).strip()
+
+
 def format_ensemble_plan_as_text(plan: EnsemblePlan) -> str:
     """Format an ensemble plan as text for use in prompts.
     
@@ -350,6 +522,11 @@ def is_strategy_similar_to_previous(
 ) -> bool:
     """Check if a new strategy is too similar to previous attempts.
     
+    Similarity is the Jaccard similarity of the strategies' character
+    4-grams, estimated from their MinHash signatures, so near-duplicates
+    differing in casing or plurals are caught and each comparison costs
+    the same however long the strategies are.
+    
     Args:
         new_plan: The new plan to check
         previous_attempts: List of previous attempts
@@ -361,21 +538,60 @@ def is_strategy_similar_to_previous(
     if not previous_attempts:
         return False
     
-    new_plan_text = format_ensemble_plan_as_text(new_plan).lower()
-    new_words = set(new_plan_text.split())
+    new_signature = _strategy_signature(format_ensemble_plan_as_text(new_plan))
+    if new_signature is None:
+        return False
+    
+    # Matching signature positions needed to reach the threshold
+    required_matches = similarity_threshold * _MINHASH_SIZE
     
     for attempt in previous_attempts:
-        attempt_words = set(attempt.strategy.lower().split())
-        
-        if not new_words or not attempt_words:
+        # Attempts recorded without their plan only have the strategy name
+        attempt_signature = _strategy_signature(attempt.plan_text or attempt.strategy)
+        if attempt_signature is None:
             continue
         
-        # Calculate Jaccard similarity
-        intersection = len(new_words & attempt_words)
-        union = len(new_words | attempt_words)
-        similarity = intersection / union if union > 0 else 0
-        
-        if similarity >= similarity_threshold:
+        if sum(map(operator.eq, new_signature, attempt_signature)) >= required_matches:
             return True
     
     return False
+
+
+# Number of hash functions in a strategy's MinHash signature
+_MINHASH_SIZE = 64
+
+# Length of the character n-grams strategies are compared by
+_SHINGLE_SIZE = 4
+
+# Fixed per-position seeds; XOR with a seed permutes the 64-bit hash space,
+# giving one hash function per signature position
+_MINHASH_SEEDS = tuple(
+    int.from_bytes(hashlib.blake2b(i.to_bytes(2, "little"), digest_size=8).digest(), "little")
+    for i in range(_MINHASH_SIZE)
+)
+
+
+@lru_cache(maxsize=256)
+def _strategy_signature(text: str) -> Optional[tuple[int, ...]]:
+    """Get the MinHash signature of a strategy, computed once per text.
+    
+    Args:
+        text: Strategy text
+        
+    Returns:
+        Minimum hash of the text's character 4-grams under each seed, or
+        None if the text has no words
+    """
+    normalized = " ".join(text.lower().split())
+    if not normalized:
+        return None
+    
+    shingles = {
+        normalized[i:i + _SHINGLE_SIZE]
+        for i in range(max(1, len(normalized) - _SHINGLE_SIZE + 1))
+    }
+    hashes = [
+        int.from_bytes(hashlib.blake2b(shingle.encode(), digest_size=8).digest(), "little")
+        for shingle in shingles
+    ]
+    return tuple(min(h ^ seed for h in hashes) for seed in _MINHASH_SEEDS)
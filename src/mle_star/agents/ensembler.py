@@ -4,15 +4,19 @@ This agent takes an ensemble strategy plan and implements it by
 combining multiple solutions into a single merged solution.
 """
 
+import asyncio
+import re
+from contextlib import aclosing
 from typing import Optional
 from dataclasses import dataclass
 from strands import Agent, tool
 
 from mle_star.models.data_models import TaskDescription, EnsembleResult
 from mle_star.models.config import MLEStarConfig
-from mle_star.models.model_factory import create_model
-from mle_star.tools.execute_python import execute_python, ExecutionResult
-from mle_star.agents.ensemble_planner import EnsemblePlan
+from mle_star.models.model_factory import create_model, pooled_agent, response_to_text
+from mle_star.tools.execute_python import execute_python_async, ExecutionResult
+from mle_star.agents.candidate_evaluator import extract_validation_score
+from mle_star.agents.ensemble_planner import EnsemblePlan, format_ensemble_plan_as_text
 
 
 ENSEMBLER_SYSTEM_PROMPT = """You are an ensemble implementation specialist who creates robust, high-performing model combinations.
@@ -93,10 +97,17 @@ Before finalizing, verify:
 </output_requirements>"""
 
 
+# Fenced (optionally python-tagged) code block
+_CODE_BLOCK_PATTERN = re.compile(r'```(?:python)?\s*\n(.*?)```', re.DOTALL)
+
+
 @tool
-def run_python_code(code: str, timeout: int = 300) -> str:
+async def run_python_code(code: str, timeout: int = 300) -> str:
     """Execute Python code and return the results.
     
+    The code runs without blocking the event loop, so ensembles implemented
+    concurrently execute their code at the same time.
+    
     Args:
         code: Python code to execute
         timeout: Maximum execution time in seconds (default: 300)
@@ -104,7 +115,7 @@ def run_python_code(code: str, timeout: int = 300) -> str:
     Returns:
         Execution results including stdout, stderr, and validation score if found
     """
-    result: ExecutionResult = execute_python(code=code, timeout=timeout)
+    result: ExecutionResult = await execute_python_async(code=code, timeout=timeout)
     
     output_parts = []
     
@@ -114,10 +125,10 @@ def run_python_code(code: str, timeout: int = 300) -> str:
         output_parts.append(f"Execution failed with return code: {result.return_code}")
     
     if result.stdout:
-        output_parts.append(f"\nStdout:\n{result.stdout}")
+        output_parts.extend(("\nStdout:", result.stdout))
     
     if result.stderr:
-        output_parts.append(f"\nStderr:\n{result.stderr}")
+        output_parts.extend(("\nStderr:", result.stderr))
     
     if result.validation_score is not None:
         output_parts.append(f"\nParsed Validation Score: {result.validation_score}")
@@ -128,7 +139,7 @@ def run_python_code(code: str, timeout: int = 300) -> str:
     return "\n".join(output_parts)
 
 
-@dataclass
+@dataclass(slots=True)
 class EnsembleImplementationResult:
     """Result of implementing an ensemble strategy."""
     merged_code: str
@@ -161,6 +172,7 @@ def build_ensembler_prompt(
     task: TaskDescription,
     solutions: list[tuple[str, float]],
     ensemble_plan: EnsemblePlan,
+    max_solution_chars: int = 0,
 ) -> str:
     """Build the prompt for implementing an ensemble strategy.
     
@@ -168,22 +180,24 @@ def build_ensembler_prompt(
         task: The ML task description
         solutions: List of (solution_code, validation_score) tuples
         ensemble_plan: The ensemble strategy plan to implement
+        max_solution_chars: Longest solution code to embed, 0 for no limit
         
     Returns:
         Formatted prompt string
     """
     # Format solutions
-    solutions_info = "\n## Solutions to Combine\n"
+    solutions_parts = ["\n## Solutions to Combine\n"]
     for i, (code, score) in enumerate(solutions, 1):
-        solutions_info += f"""
+        solutions_parts.append(f"""
 ### Solution {i} (Score: {score:.4f})
 ```python
-{code}
+{_truncate_code(code, max_solution_chars)}
 ```
-"""
+""")
+    solutions_info = "".join(solutions_parts)
     
     # Format ensemble plan
-    plan_info = f"""
+    plan_parts = [f"""
 ## Ensemble Strategy to Implement
 
 ### Strategy: {ensemble_plan.strategy_name}
@@ -192,12 +206,14 @@ def build_ensembler_prompt(
 {ensemble_plan.description}
 
 ### Implementation Steps
-"""
-    for i, step in enumerate(ensemble_plan.implementation_steps, 1):
-        plan_info += f"{i}. {step}\n"
+"""]
+    plan_parts.extend(
+        f"{i}. {step}\n" for i, step in enumerate(ensemble_plan.implementation_steps, 1)
+    )
     
     if ensemble_plan.weight_assignment:
-        plan_info += f"\n### Weight Assignment\n{ensemble_plan.weight_assignment}\n"
+        plan_parts.append(f"\n### Weight Assignment\n{ensemble_plan.weight_assignment}\n")
+    plan_info = "".join(plan_parts)
     
     return f"""Implement the following ensemble strategy to combine the provided ML solutions.
 
@@ -217,11 +233,31 @@ def build_ensembler_prompt(
 Generate the ensemble implementation code and execute it using run_python_code."""
 
 
+def _truncate_code(code: str, max_chars: int) -> str:
+    """Shorten code to its head and tail.
+    
+    The head holds the imports and data loading, the tail the training and
+    evaluation lines, so both are kept and the middle is dropped.
+    
+    Args:
+        code: Solution code
+        max_chars: Longest code to keep as is, 0 for no limit
+        
+    Returns:
+        The code, or its first and last max_chars // 2 characters
+    """
+    if not max_chars or len(code) <= max_chars:
+        return code
+    half = max_chars // 2
+    return code[:half] + "\n# ... [truncated] ...\n" + code[-half:]
+
+
 async def implement_ensemble(
     task: TaskDescription,
     solutions: list[tuple[str, float]],
     ensemble_plan: EnsemblePlan,
     config: MLEStarConfig,
+    agent: Optional[Agent] = None,
 ) -> EnsembleImplementationResult:
     """Implement an ensemble strategy to combine multiple solutions.
     
@@ -230,19 +266,22 @@ async def implement_ensemble(
         solutions: List of (solution_code, validation_score) tuples
         ensemble_plan: The ensemble strategy plan to implement
         config: MLE-STAR configuration
+        agent: Optional pre-created agent (reuses a pooled one if not provided)
         
     Returns:
         EnsembleImplementationResult with merged code and validation score
     """
-    agent = create_ensembler_agent(config)
-    prompt = build_ensembler_prompt(task, solutions, ensemble_plan)
+    if agent is None:
+        # Reuse an idle ensembler agent; concurrent implementations each
+        # check out their own
+        with pooled_agent(config, create_ensembler_agent) as agent:
+            return await implement_ensemble(task, solutions, ensemble_plan, config, agent)
+    
+    prompt = build_ensembler_prompt(task, solutions, ensemble_plan, config.max_solution_chars)
     
     try:
-        response = await agent.invoke_async(prompt)
-        response_text = str(response)
-        
+        response_text, validation_score = await _stream_ensembler_response(agent, prompt)
         merged_code = _extract_generated_code(response_text)
-        validation_score = _extract_score_from_response(response_text)
         
         return EnsembleImplementationResult(
             merged_code=merged_code or "",
@@ -261,6 +300,43 @@ async def implement_ensemble(
         )
 
 
+async def _stream_ensembler_response(
+    agent: Agent,
+    prompt: str,
+) -> tuple[str, Optional[float]]:
+    """Stream the ensembler response, then parse the score from its final text.
+    
+    The streamed text spans every turn, including ones before a rerun, so
+    the score is only read from the final message once the stream ends (the
+    last score reported there wins, see extract_validation_score). The
+    streamed text is used only if the stream carries no final result.
+    Agents without streaming support are invoked normally.
+    
+    Args:
+        agent: Ensembler agent
+        prompt: Prompt to send to the agent
+        
+    Returns:
+        Tuple of (response text, validation score or None)
+    """
+    if not hasattr(agent, "stream_async"):
+        response_text = response_to_text(await agent.invoke_async(prompt))
+        return response_text, extract_validation_score(response_text)
+    
+    streamed_text = ""
+    final_text: Optional[str] = None
+    
+    async with aclosing(agent.stream_async(prompt)) as events:
+        async for event in events:
+            if "result" in event:
+                final_text = response_to_text(event["result"])
+            elif "data" in event:
+                streamed_text += event["data"]
+    
+    response_text = final_text if final_text is not None else streamed_text
+    return response_text, extract_validation_score(response_text)
+
+
 async def run_ensemble_iteration(
     task: TaskDescription,
     solutions: list[tuple[str, float]],
@@ -270,7 +346,10 @@ async def run_ensemble_iteration(
     """Run a single ensemble iteration: plan and implement.
     
     This function combines the ensemble planner and ensembler agents
-    to propose and implement an ensemble strategy.
+    to propose and implement an ensemble strategy. A strategy similar to a
+    previous attempt is not implemented; the planner is asked again, up to
+    max_planner_retries times, and the iteration is skipped if it keeps
+    repeating itself.
     
     Args:
         task: The ML task description
@@ -281,26 +360,70 @@ async def run_ensemble_iteration(
     Returns:
         EnsembleResult with the ensemble outcome
     """
-    from mle_star.agents.ensemble_planner import propose_ensemble_strategy
-    
-    # Step 1: Propose an ensemble strategy
-    plan = await propose_ensemble_strategy(
-        solutions=solutions,
-        task_type=task.task_type,
-        evaluation_metric=task.evaluation_metric,
-        previous_attempts=previous_attempts,
-        config=config,
+    from mle_star.agents.ensemble_planner import (
+        is_strategy_similar_to_previous,
+        propose_ensemble_strategy,
     )
     
+    iteration = len(previous_attempts) + 1
+    rejected_strategies: list[str] = []
+    
+    # Step 1: Propose an ensemble strategy that has not been tried yet
+    while True:
+        plan = await propose_ensemble_strategy(
+            solutions=solutions,
+            task_type=task.task_type,
+            evaluation_metric=task.evaluation_metric,
+            previous_attempts=previous_attempts,
+            config=config,
+            rejected_strategies=rejected_strategies,
+        )
+        if not plan.success or not is_strategy_similar_to_previous(
+            plan, previous_attempts, config.similarity_threshold
+        ):
+            break
+        
+        rejected_strategies.append(plan.strategy_name)
+        if len(rejected_strategies) > config.max_planner_retries:
+            # Running a repeated strategy would only retrain the same ensemble
+            return EnsembleResult(
+                strategy=f"Skipped repeated strategy: {plan.strategy_name}",
+                merged_code="",
+                validation_score=float("-inf"),
+                iteration=iteration,
+            )
+    
+    # Step 2: Implement the ensemble strategy
+    return await _implement_plan(task, solutions, plan, iteration, config)
+
+
+async def _implement_plan(
+    task: TaskDescription,
+    solutions: list[tuple[str, float]],
+    plan: EnsemblePlan,
+    iteration: int,
+    config: MLEStarConfig,
+) -> EnsembleResult:
+    """Implement a proposed plan and record it as an ensemble attempt.
+    
+    Args:
+        task: The ML task description
+        solutions: List of (solution_code, validation_score) tuples
+        plan: The proposed ensemble plan
+        iteration: Iteration number of the attempt
+        config: MLE-STAR configuration
+        
+    Returns:
+        EnsembleResult with the ensemble outcome
+    """
     if not plan.success:
         return EnsembleResult(
             strategy=f"Failed to propose strategy: {plan.error_message}",
             merged_code="",
             validation_score=float("-inf"),
-            iteration=len(previous_attempts) + 1,
+            iteration=iteration,
         )
     
-    # Step 2: Implement the ensemble strategy
     result = await implement_ensemble(
         task=task,
         solutions=solutions,
@@ -312,7 +435,8 @@ async def run_ensemble_iteration(
         strategy=plan.strategy_name,
         merged_code=result.merged_code,
         validation_score=result.validation_score if result.validation_score is not None else float("-inf"),
-        iteration=len(previous_attempts) + 1,
+        iteration=iteration,
+        plan_text=format_ensemble_plan_as_text(plan),
     )
 
 
@@ -325,9 +449,12 @@ async def explore_ensemble_strategies(
     """Explore multiple ensemble strategies and select the best one.
     
     This function implements the ensemble exploration loop:
-    1. Propose an ensemble strategy
-    2. Implement and evaluate it
-    3. Use results as feedback for next iteration
+    1. Propose all strategies with a single planner call, dropping any
+       similar to one earlier in the batch
+    2. Implement and evaluate them concurrently, at most
+       config.max_concurrent_evals at a time, as they are independent
+    3. If the planner returned too few usable strategies, propose the rest
+       one at a time with the earlier results as feedback
     4. Select the best-performing ensemble
     
     Args:
@@ -340,6 +467,7 @@ async def explore_ensemble_strategies(
         EnsembleResult with the best ensemble outcome
     """
     iterations = num_iterations or config.ensemble_iterations
+    solutions = dedupe_solutions(solutions)
     
     if not solutions:
         return EnsembleResult(
@@ -359,20 +487,58 @@ async def explore_ensemble_strategies(
             iteration=1,
         )
     
-    attempts: list[EnsembleResult] = []
-    best_result: Optional[EnsembleResult] = None
+    from mle_star.agents.ensemble_planner import (
+        is_strategy_similar_to_previous,
+        propose_ensemble_strategies,
+    )
+    
+    proposed = await propose_ensemble_strategies(
+        solutions=solutions,
+        task_type=task.task_type,
+        evaluation_metric=task.evaluation_metric,
+        num_strategies=iterations,
+        config=config,
+    )
+    
+    # A near-duplicate in the batch would only train the same ensemble
+    # again; its slot is re-planned one by one below instead
+    plans: list[EnsemblePlan] = []
+    accepted: list[EnsembleResult] = []
+    for plan in proposed:
+        if not plan.success or len(plans) == iterations or is_strategy_similar_to_previous(
+            plan, accepted, config.similarity_threshold
+        ):
+            continue
+        plans.append(plan)
+        accepted.append(EnsembleResult(
+            strategy=plan.strategy_name,
+            merged_code="",
+            validation_score=float("-inf"),
+            iteration=len(plans),
+            plan_text=format_ensemble_plan_as_text(plan),
+        ))
+    
+    semaphore = asyncio.Semaphore(max(1, config.max_concurrent_evals))
     
-    for i in range(iterations):
-        result = await run_ensemble_iteration(
+    async def implement_one(iteration: int, plan: EnsemblePlan) -> EnsembleResult:
+        async with semaphore:
+            return await _implement_plan(task, solutions, plan, iteration, config)
+    
+    attempts: list[EnsembleResult] = list(await asyncio.gather(
+        *(implement_one(i, plan) for i, plan in enumerate(plans, 1))
+    ))
+    
+    # Missing strategies depend on earlier results, so they run one by one
+    while len(attempts) < iterations:
+        attempts.append(await run_ensemble_iteration(
             task=task,
             solutions=solutions,
             previous_attempts=attempts,
             config=config,
-        )
-        
-        attempts.append(result)
-        
-        # Track best result
+        ))
+    
+    best_result: Optional[EnsembleResult] = None
+    for result in attempts:
         if best_result is None or result.validation_score > best_result.validation_score:
             best_result = result
     
@@ -385,6 +551,25 @@ async def explore_ensemble_strategies(
     )
 
 
+def dedupe_solutions(solutions: list[tuple[str, float]]) -> list[tuple[str, float]]:
+    """Drop solutions whose code repeats an earlier one.
+    
+    Identical code adds nothing to an ensemble but is paid for in every
+    prompt that embeds it.
+    
+    Args:
+        solutions: List of (solution_code, validation_score) tuples
+        
+    Returns:
+        One entry per distinct code, with its highest score, in first-seen order
+    """
+    best: dict[str, tuple[str, float]] = {}
+    for code, score in solutions:
+        if code not in best or score > best[code][1]:
+            best[code] = (code, score)
+    return list(best.values())
+
+
 def select_best_ensemble(attempts: list[EnsembleResult]) -> EnsembleResult:
     """Select the best ensemble result from a list of attempts.
     
@@ -416,44 +601,15 @@ def _extract_generated_code(response: str) -> Optional[str]:
     Returns:
         Extracted code or None
     """
-    import re
-    
-    code_pattern = r'```(?:python)?\s*\n(.*?)```'
-    matches = re.findall(code_pattern, response, re.DOTALL)
+    # Track the longest block's span; only that block is copied out
+    best_span: Optional[tuple[int, int]] = None
+    for match in _CODE_BLOCK_PATTERN.finditer(response):
+        start, end = match.span(1)
+        if best_span is None or end - start > best_span[1] - best_span[0]:
+            best_span = (start, end)
     
-    if matches:
-        return max(matches, key=len).strip()
+    if best_span is not None:
+        return response[best_span[0]:best_span[1]].strip()
     
     return None
 
-
-def _extract_score_from_response(response: str) -> Optional[float]:
-    """Extract validation score from agent response.
-    
-    Args:
-        response: Agent response text
-        
-    Returns:
-        Extracted score or None
-    """
-    import re
-    
-    pattern = r"(?:Final\s+)?Validation\s+(?:Performance|Score)[:\s]*([-+]?\d*\.?\d+(?:[eE][-+]?\d+)?)"
-    match = re.search(pattern, response, re.IGNORECASE)
-    
-    if match:
-        try:
-            return float(match.group(1))
-        except ValueError:
-            pass
-    
-    pattern2 = r"Parsed\s+Validation\s+Score[:\s]*([-+]?\d*\.?\d+(?:[eE][-+]?\d+)?)"
-    match2 = re.search(pattern2, response, re.IGNORECASE)
-    
-    if match2:
-        try:
-            return float(match2.group(1))
-        except ValueError:
-            pass
-    
-    return None
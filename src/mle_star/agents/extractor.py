@@ -83,7 +83,7 @@ For the extracted block, create a detailed plan:
 </output_format>"""
 
 
-@dataclass
+@dataclass(slots=True)
 class ExtractedBlock:
     """Result of code block extraction."""
     component_name: str
@@ -297,7 +297,7 @@ def contains_leakage_patterns(code: str) -> list[str]:
         patterns.append("Possible LabelEncoder fit on non-training data")
     
     # Pattern 5: Target encoding without cross-validation
-    if re.search(r'groupby.*mean.*(?:map|transform)', code) and 'fold' not in code.lower():
+    if re.search(r'groupby.*mean.*(?:map|transform)', code) and not re.search('fold', code, re.IGNORECASE):
         patterns.append("Possible target encoding without cross-validation")
     
     return patterns
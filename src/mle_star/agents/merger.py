@@ -5,13 +5,15 @@ creating ensembles. It processes candidates in descending score order
 and stops when performance degrades.
 """
 
+import re
 from typing import Optional
 from dataclasses import dataclass
 from strands import Agent, tool
 
-from mle_star.models.data_models import TaskDescription, ModelCandidate
+from mle_star.models.data_models import TaskDescription, ModelCandidate, CandidateBatch
 from mle_star.models.config import MLEStarConfig
 from mle_star.models.model_factory import create_model
+from mle_star.agents.candidate_evaluator import build_performance_guidelines, extract_validation_score
 from mle_star.tools.execute_python import execute_python, ExecutionResult
 
 
@@ -64,6 +66,10 @@ Before merging, consider:
 </thinking>"""
 
 
+# Fenced code blocks in agent responses
+_CODE_BLOCK_PATTERN = re.compile(r'```(?:python)?\s*\n(.*?)```', re.DOTALL)
+
+
 @tool
 def run_python_code(code: str, timeout: int = 300) -> str:
     """Execute Python code and return the results.
@@ -85,10 +91,10 @@ def run_python_code(code: str, timeout: int = 300) -> str:
         output_parts.append(f"Execution failed with return code: {result.return_code}")
     
     if result.stdout:
-        output_parts.append(f"\nStdout:\n{result.stdout}")
+        output_parts.extend(("\nStdout:", result.stdout))
     
     if result.stderr:
-        output_parts.append(f"\nStderr:\n{result.stderr}")
+        output_parts.extend(("\nStderr:", result.stderr))
     
     if result.validation_score is not None:
         output_parts.append(f"\nParsed Validation Score: {result.validation_score}")
@@ -99,7 +105,7 @@ def run_python_code(code: str, timeout: int = 300) -> str:
     return "\n".join(output_parts)
 
 
-@dataclass
+@dataclass(slots=True)
 class MergeResult:
     """Result of a merge operation."""
     merged_code: str
@@ -120,7 +126,7 @@ def create_merger_agent(config: MLEStarConfig) -> Agent:
     """
     return Agent(
         name="merger",
-        system_prompt=MERGER_SYSTEM_PROMPT,
+        system_prompt=MERGER_SYSTEM_PROMPT + build_performance_guidelines(config),
         tools=[run_python_code],
         model=create_model(config),
         temperature=config.temperature,
@@ -207,7 +213,7 @@ async def merge_two_solutions(
         response_text = str(response)
         
         merged_code = _extract_generated_code(response_text)
-        validation_score = _extract_score_from_response(response_text)
+        validation_score = extract_validation_score(response_text)
         
         return MergeResult(
             merged_code=merged_code or "",
@@ -248,7 +254,8 @@ async def merge_candidates_sequentially(
         MergeResult with the final merged solution
     """
     # Filter candidates with valid scores and sort descending
-    valid_candidates = [c for c in candidates if c.validation_score is not None]
+    batch = CandidateBatch.from_list(candidates)
+    valid_candidates = batch.top_k(len(batch.candidates))
     
     if not valid_candidates:
         return MergeResult(
@@ -259,8 +266,6 @@ async def merge_candidates_sequentially(
             error_message="No candidates with valid scores to merge",
         )
     
-    valid_candidates.sort(key=lambda c: c.validation_score, reverse=True)  # type: ignore
-    
     if len(valid_candidates) == 1:
         # Only one candidate, return it as-is
         best = valid_candidates[0]
@@ -327,44 +332,15 @@ def _extract_generated_code(response: str) -> Optional[str]:
     Returns:
         Extracted code or None
     """
-    import re
+    # Track only the span of the longest code block rather than
+    # materializing every block as a string
+    best_start, best_end = 0, -1
+    for match in _CODE_BLOCK_PATTERN.finditer(response):
+        if match.end(1) - match.start(1) > best_end - best_start:
+            best_start, best_end = match.span(1)
     
-    code_pattern = r'```(?:python)?\s*\n(.*?)```'
-    matches = re.findall(code_pattern, response, re.DOTALL)
-    
-    if matches:
-        return max(matches, key=len).strip()
+    if best_end >= 0:
+        return response[best_start:best_end].strip()
     
     return None
 
-
-def _extract_score_from_response(response: str) -> Optional[float]:
-    """Extract validation score from agent response.
-    
-    Args:
-        response: Agent response text
-        
-    Returns:
-        Extracted score or None
-    """
-    import re
-    
-    pattern = r"(?:Final\s+)?Validation\s+(?:Performance|Score)[:\s]*([-+]?\d*\.?\d+(?:[eE][-+]?\d+)?)"
-    match = re.search(pattern, response, re.IGNORECASE)
-    
-    if match:
-        try:
-            return float(match.group(1))
-        except ValueError:
-            pass
-    
-    pattern2 = r"Parsed\s+Validation\s+Score[:\s]*([-+]?\d*\.?\d+(?:[eE][-+]?\d+)?)"
-    match2 = re.search(pattern2, response, re.IGNORECASE)
-    
-    if match2:
-        try:
-            return float(match2.group(1))
-        except ValueError:
-            pass
-    
-    return None
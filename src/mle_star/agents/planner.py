@@ -79,7 +79,7 @@ Before proposing, reason through:
 </thinking>"""
 
 
-@dataclass
+@dataclass(slots=True)
 class RefinementPlan:
     """A proposed refinement plan."""
     strategy_name: str
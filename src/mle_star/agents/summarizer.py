@@ -70,7 +70,7 @@ When analyzing results, consider:
 </thinking>"""
 
 
-@dataclass
+@dataclass(slots=True)
 class AblationSummary:
     """Structured summary of ablation study results."""
     baseline_score: float
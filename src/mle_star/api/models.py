@@ -31,12 +31,20 @@ class MLEStarConfigRequest(BaseModel):
     outer_loop_iterations: int = Field(default=4, ge=1, le=10)
     ensemble_iterations: int = Field(default=5, ge=1, le=10)
     max_debug_retries: int = Field(default=3, ge=1, le=10)
+    max_concurrent_evals: int = Field(default=4, ge=1, le=16)
     model_id: str = Field(default="qwen3-next-72b")
     model_provider: str = Field(default="lemonade")
     ollama_base_url: str = Field(default="http://localhost:11434")
     lemonade_base_url: str = Field(default="http://localhost:8080")
     temperature: float = Field(default=0.7, ge=0.0, le=2.0)
     max_tokens: int = Field(default=4096, ge=256, le=32768)
+    prompt_caching: bool = Field(default=False)
+    filter_framework_logs: bool = Field(default=True)
+    fast_path_mode: str = Field(default="off")
+    parallel_debug: bool = Field(default=False)
+    max_solution_chars: int = Field(default=8000, ge=0)
+    similarity_threshold: float = Field(default=0.6, ge=0.0, le=1.0)
+    max_planner_retries: int = Field(default=2, ge=0, le=10)
 
 
 class TaskDescriptionRequest(BaseModel):
@@ -94,10 +94,13 @@ app = create_app()
 async def broadcast_to_run(run_id: str, message: WebSocketMessage) -> None:
     """Broadcast a message to all WebSocket connections for a run."""
     if run_id in websocket_connections:
+        # Serialize once with pydantic's native encoder rather than
+        # re-encoding the message through json.dumps for every client
+        payload = message.model_dump_json()
         disconnected = []
         for ws in websocket_connections[run_id]:
             try:
-                await ws.send_json(message.model_dump(mode="json"))
+                await ws.send_text(payload)
             except Exception:
                 disconnected.append(ws)
         
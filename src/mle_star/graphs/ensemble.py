@@ -17,10 +17,12 @@ import asyncio
 from mle_star.models.config import MLEStarConfig
 from mle_star.models.data_models import TaskDescription, EnsembleResult
 from mle_star.agents.ensemble_planner import (
+    format_ensemble_plan_as_text,
     propose_ensemble_strategy,
     EnsemblePlan,
 )
 from mle_star.agents.ensembler import (
+    dedupe_solutions,
     implement_ensemble,
     select_best_ensemble,
     EnsembleImplementationResult,
@@ -186,6 +188,7 @@ class EnsembleGraph:
                 merged_code=result.merged_code,
                 validation_score=result.validation_score if result.validation_score is not None else float("-inf"),
                 iteration=state.iteration + 1,
+                plan_text=format_ensemble_plan_as_text(state.current_plan),
             )
             state.attempts.append(ensemble_result)
             
@@ -239,6 +242,8 @@ class EnsembleGraph:
         Returns:
             Final state after graph execution
         """
+        solutions = dedupe_solutions(solutions)
+        
         # Handle edge cases
         if not solutions:
             state = EnsembleState(
@@ -31,7 +31,7 @@ from mle_star.agents.planner import (
     format_plan_as_text,
     RefinementPlan,
 )
-from mle_star.agents.debugger import debug_with_retries_sync
+from mle_star.agents.debugger import debug_with_retries
 from mle_star.tools.execute_python import execute_python
 from mle_star.tools.refinement_utils import select_best_attempt, InnerLoopResult
 
@@ -136,7 +136,9 @@ class RefinementLoopNode:
                 )
                 
                 # Execute and evaluate the candidate solution
-                score = await self._evaluate_solution(candidate_solution)
+                score = await self._evaluate_solution(
+                    candidate_solution, state.task.dataset_path
+                )
                 
                 # Record the attempt
                 attempt = RefinementAttempt(
@@ -182,31 +184,35 @@ class RefinementLoopNode:
         
         return state
     
-    async def _evaluate_solution(self, code: str) -> float:
+    async def _evaluate_solution(self, code: str, dataset_path: str = "") -> float:
         """Execute and evaluate a solution.
         
+        Execution runs in a worker thread and debugging is awaited, so the
+        event loop stays free and parallel refinement runs interleave their
+        stages (one run's coder overlaps another run's ablation study).
+        
         Args:
             code: Python code to execute
+            dataset_path: The task's dataset path, passed to the debugger
             
         Returns:
             Validation score from execution
         """
-        result = execute_python(code=code, timeout=300)
+        result = await asyncio.to_thread(execute_python, code=code, timeout=300)
         
         if result.validation_score is not None:
             return result.validation_score
         
         # If execution failed, try debugging
         if not result.success and result.stderr:
-            debug_result = debug_with_retries_sync(
+            debug_result = await debug_with_retries(
                 code=code,
-                error=result.stderr,
                 config=self.config,
+                dataset_path=dataset_path,
             )
-            if debug_result.success and debug_result.corrected_code:
-                retry_result = execute_python(code=debug_result.corrected_code, timeout=300)
-                if retry_result.validation_score is not None:
-                    return retry_result.validation_score
+            retry_result = debug_result.execution_result
+            if debug_result.success and retry_result and retry_result.validation_score is not None:
+                return retry_result.validation_score
         
         # Return negative infinity if we couldn't get a score
         return float("-inf")
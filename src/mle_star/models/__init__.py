@@ -4,6 +4,8 @@ from mle_star.models.config import MLEStarConfig
 from mle_star.models.data_models import (
     TaskDescription,
     ModelCandidate,
+    CandidateBatch,
+    CodeBlock,
     SolutionState,
     RefinementAttempt,
     EnsembleResult,
@@ -13,6 +15,8 @@ __all__ = [
     "MLEStarConfig",
     "TaskDescription",
     "ModelCandidate",
+    "CandidateBatch",
+    "CodeBlock",
     "SolutionState",
     "RefinementAttempt",
     "EnsembleResult",
@@ -1,7 +1,7 @@
 """Configuration dataclass for MLE-STAR agent."""
 
 from dataclasses import dataclass, field, asdict
-from typing import Any, Literal
+from typing import Any, Literal, Optional
 
 
 @dataclass
@@ -14,12 +14,37 @@ class MLEStarConfig:
         outer_loop_iterations: Number of outer loop iterations for targeting different blocks (default: 4)
         ensemble_iterations: Number of ensemble strategy exploration rounds (default: 5)
         max_debug_retries: Maximum number of debugging attempts before giving up (default: 3)
+        max_concurrent_evals: Maximum number of model candidates evaluated concurrently (default: 4)
         model_id: The LLM model identifier to use for agents
         model_provider: The model provider (ollama, bedrock, openai, lemonade)
         ollama_base_url: Base URL for Ollama API (default: http://localhost:11434)
         lemonade_base_url: Base URL for Lemonade/llama.cpp server (default: http://localhost:8080)
         temperature: Temperature parameter for LLM generation
         max_tokens: Maximum tokens for LLM responses
+        prompt_caching: Mark agent system prompts as cacheable on providers that
+            support explicit prompt caching (Bedrock) (default: False)
+        filter_framework_logs: Strip LightGBM/XGBoost info logs from execution
+            output returned to agents (default: True)
+        fast_path_mode: "templated" applies refinement plans made only of
+            class swaps and keyword argument changes without the LLM
+            (default: "off")
+        parallel_debug: Sample all debugging attempts concurrently and keep the
+            first that runs, when temperature is above 0 (default: False)
+        debug_cache_dir: Directory of a persistent cache of debugger fixes
+            that ran successfully, used at temperature 0 (default: None,
+            disabled)
+        auto_install_packages: Let the debugger pip install a missing
+            package when it is in debugger.AUTO_INSTALL_PACKAGES (default:
+            False)
+        max_solution_chars: Longest solution code embedded in ensembler
+            prompts; longer code keeps its head and tail, 0 disables
+            (default: 8000)
+        similarity_threshold: Jaccard similarity above which a proposed
+            ensemble strategy counts as a repeat of an earlier attempt
+            (default: 0.6)
+        max_planner_retries: Times the ensemble planner is asked again when
+            it repeats an earlier strategy, before the iteration is skipped
+            (default: 2)
     """
     
     # Core iteration parameters
@@ -28,6 +53,7 @@ class MLEStarConfig:
     outer_loop_iterations: int = 4
     ensemble_iterations: int = 5
     max_debug_retries: int = 3
+    max_concurrent_evals: int = 4
     
     # LLM parameters
     model_id: str = "qwen3-next-72b"
@@ -36,6 +62,21 @@ class MLEStarConfig:
     lemonade_base_url: str = "http://localhost:8080"
     temperature: float = 0.7
     max_tokens: int = 4096
+    prompt_caching: bool = False
+    
+    # Execution output parameters
+    filter_framework_logs: bool = True
+    
+    # Refinement parameters
+    fast_path_mode: Literal["off", "templated"] = "off"
+    parallel_debug: bool = False
+    debug_cache_dir: Optional[str] = None
+    auto_install_packages: bool = False
+    
+    # Ensemble parameters
+    max_solution_chars: int = 8000
+    similarity_threshold: float = 0.6
+    max_planner_retries: int = 2
     
     def to_dict(self) -> dict[str, Any]:
         """Serialize configuration to dictionary.
@@ -61,10 +102,20 @@ class MLEStarConfig:
             outer_loop_iterations=data.get("outer_loop_iterations", 4),
             ensemble_iterations=data.get("ensemble_iterations", 5),
             max_debug_retries=data.get("max_debug_retries", 3),
+            max_concurrent_evals=data.get("max_concurrent_evals", 4),
             model_id=data.get("model_id", "qwen3-next-72b"),
             model_provider=data.get("model_provider", "lemonade"),
             ollama_base_url=data.get("ollama_base_url", "http://localhost:11434"),
             lemonade_base_url=data.get("lemonade_base_url", "http://localhost:8080"),
             temperature=data.get("temperature", 0.7),
             max_tokens=data.get("max_tokens", 4096),
+            prompt_caching=data.get("prompt_caching", False),
+            filter_framework_logs=data.get("filter_framework_logs", True),
+            fast_path_mode=data.get("fast_path_mode", "off"),
+            parallel_debug=data.get("parallel_debug", False),
+            debug_cache_dir=data.get("debug_cache_dir"),
+            auto_install_packages=data.get("auto_install_packages", False),
+            max_solution_chars=data.get("max_solution_chars", 8000),
+            similarity_threshold=data.get("similarity_threshold", 0.6),
+            max_planner_retries=data.get("max_planner_retries", 2),
         )
@@ -1,8 +1,13 @@
 """Data models for MLE-STAR agent."""
 
+from array import array
 from dataclasses import dataclass, field
-from typing import Optional
+from functools import cached_property, lru_cache
+from typing import Optional, Union
+import heapq
+import math
 import re
+import statistics
 
 
 @dataclass
@@ -38,20 +43,14 @@ class TaskDescription:
         Returns:
             TaskDescription instance with extracted fields
         """
-        # Extract task type
-        task_type = cls._extract_task_type(text)
-        
-        # Extract data modality
-        data_modality = cls._extract_data_modality(text)
-        
-        # Extract evaluation metric
-        evaluation_metric = cls._extract_evaluation_metric(text)
-        
-        # Extract dataset path
-        dataset_path = cls._extract_dataset_path(text)
-        
-        # Extract submission format if present
-        submission_format = cls._extract_submission_format(text)
+        # Extraction is memoized; surrounding whitespace never affects the result
+        (
+            task_type,
+            data_modality,
+            evaluation_metric,
+            dataset_path,
+            submission_format,
+        ) = _parse_task_fields(text.strip())
         
         return cls(
             description=text,
@@ -173,6 +172,27 @@ class TaskDescription:
         return None
 
 
+@lru_cache(maxsize=128)
+def _parse_task_fields(
+    text: str,
+) -> tuple[str, str, str, str, Optional[str]]:
+    """Extract the structured fields of a task description.
+    
+    Args:
+        text: Free-form text describing the ML task
+        
+    Returns:
+        Tuple of (task_type, data_modality, evaluation_metric, dataset_path,
+        submission_format)
+    """
+    return (
+        TaskDescription._extract_task_type(text),
+        TaskDescription._extract_data_modality(text),
+        TaskDescription._extract_evaluation_metric(text),
+        TaskDescription._extract_dataset_path(text),
+        TaskDescription._extract_submission_format(text),
+    )
+
 
 @dataclass
 class ModelCandidate:
@@ -193,6 +213,147 @@ class ModelCandidate:
     generated_code: Optional[str] = None
 
 
+@dataclass(slots=True)
+class CandidateBatch:
+    """Struct-of-arrays view of a list of model candidates.
+    
+    Validation scores are held in one contiguous float array, with NaN for
+    unevaluated candidates, so ranking and score statistics don't touch the
+    candidates' name, description and code strings.
+    
+    Attributes:
+        candidates: The candidates, in their original order
+        scores: Validation scores parallel to candidates
+    """
+    
+    candidates: list[ModelCandidate]
+    scores: array
+    
+    @classmethod
+    def from_list(cls, candidates: list[ModelCandidate]) -> "CandidateBatch":
+        """Build a batch from a list of candidates.
+        
+        Args:
+            candidates: Candidates to index
+            
+        Returns:
+            CandidateBatch over the candidates
+        """
+        scores = array("d", (
+            math.nan if c.validation_score is None else c.validation_score
+            for c in candidates
+        ))
+        return cls(candidates=list(candidates), scores=scores)
+    
+    def scored_indices(self) -> list[int]:
+        """Get the indices of candidates that have a score."""
+        return [i for i, score in enumerate(self.scores) if not math.isnan(score)]
+    
+    def ranked(self, descending: bool = True) -> list[ModelCandidate]:
+        """Get the candidates ordered by score.
+        
+        Candidates without scores are placed at the end, in their original
+        order; ties keep their original order as well.
+        
+        Args:
+            descending: If True, highest score first
+            
+        Returns:
+            Candidates sorted by score
+        """
+        scored = self.scored_indices()
+        scored_set = set(scored)
+        scored.sort(key=self.scores.__getitem__, reverse=descending)
+        unscored = [i for i in range(len(self.candidates)) if i not in scored_set]
+        return [self.candidates[i] for i in scored + unscored]
+    
+    def top_k(self, k: int, descending: bool = True) -> list[ModelCandidate]:
+        """Get the k best scored candidates.
+        
+        Args:
+            k: Number of candidates to return
+            descending: If True, higher scores are better
+            
+        Returns:
+            Up to k scored candidates, best first
+        """
+        select = heapq.nlargest if descending else heapq.nsmallest
+        indices = select(k, self.scored_indices(), key=self.scores.__getitem__)
+        return [self.candidates[i] for i in indices]
+    
+    def mean_score(self) -> Optional[float]:
+        """Get the mean score of scored candidates, or None if there are none."""
+        scores = [score for score in self.scores if not math.isnan(score)]
+        return statistics.fmean(scores) if scores else None
+    
+    def std_score(self) -> Optional[float]:
+        """Get the population standard deviation of scored candidates."""
+        scores = [score for score in self.scores if not math.isnan(score)]
+        return statistics.pstdev(scores) if scores else None
+
+
+@dataclass(frozen=True)
+class CodeBlock:
+    """A block of code with its line splits and regex scans memoized.
+    
+    Analyzers that run over the same block accept a CodeBlock in place of
+    the string, so the code is split and scanned once rather than once per
+    analyzer.
+    
+    Attributes:
+        raw: The code text
+        lines: The code split on newlines
+        stripped: Each line with surrounding whitespace removed
+    """
+    
+    raw: str
+    lines: tuple[str, ...] = field(init=False, repr=False, compare=False)
+    stripped: tuple[str, ...] = field(init=False, repr=False, compare=False)
+    _matches: dict[re.Pattern, tuple[re.Match, ...]] = field(
+        init=False, repr=False, compare=False
+    )
+    
+    def __post_init__(self) -> None:
+        lines = tuple(self.raw.split('\n'))
+        object.__setattr__(self, "lines", lines)
+        object.__setattr__(self, "stripped", tuple(line.strip() for line in lines))
+        object.__setattr__(self, "_matches", {})
+    
+    @classmethod
+    def of(cls, code: Union["CodeBlock", str]) -> "CodeBlock":
+        """Wrap code in a CodeBlock unless it already is one.
+        
+        Args:
+            code: Code text or an existing CodeBlock
+            
+        Returns:
+            CodeBlock for the code
+        """
+        return code if isinstance(code, cls) else cls(code)
+    
+    @cached_property
+    def trimmed_lines(self) -> tuple[str, ...]:
+        """Lines of the code with leading and trailing whitespace removed."""
+        return tuple(self.raw.strip().split('\n'))
+    
+    def matches(self, pattern: re.Pattern) -> tuple[re.Match, ...]:
+        """Get all matches of a compiled pattern in the code.
+        
+        Args:
+            pattern: Compiled regular expression
+            
+        Returns:
+            The matches, in order; repeated calls reuse the first scan
+        """
+        found = self._matches.get(pattern)
+        if found is None:
+            found = self._matches[pattern] = tuple(pattern.finditer(self.raw))
+        return found
+    
+    def __len__(self) -> int:
+        return len(self.raw)
+
+
 @dataclass
 class SolutionState:
     """Tracks the current state of solution development.
@@ -212,6 +373,43 @@ class SolutionState:
     refined_blocks: list[str] = field(default_factory=list)
     outer_iteration: int = 0
     inner_iteration: int = 0
+    # Previews of refined_blocks, extended as blocks are added
+    _refined_block_previews: list[str] = field(
+        default_factory=list, init=False, repr=False, compare=False
+    )
+    _previewed_blocks: Optional[list[str]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    
+    @property
+    def refined_block_previews(self) -> list[str]:
+        """Single-line previews of refined_blocks for prompts.
+        
+        Each block is previewed once; later calls only preview blocks added
+        since. Replacing refined_blocks with a new list rebuilds the previews.
+        
+        Returns:
+            One preview per refined block, in the same order
+        """
+        previews = self._refined_block_previews
+        if self._previewed_blocks is not self.refined_blocks or len(previews) > len(self.refined_blocks):
+            previews.clear()
+            self._previewed_blocks = self.refined_blocks
+        previews.extend(
+            _preview_block(block) for block in self.refined_blocks[len(previews):]
+        )
+        return previews
+
+
+# Characters of a refined block shown in its preview
+REFINED_BLOCK_PREVIEW_LENGTH = 100
+
+
+def _preview_block(block: str) -> str:
+    """Shorten a code block to a single-line preview if it is long."""
+    if len(block) > REFINED_BLOCK_PREVIEW_LENGTH:
+        return block[:REFINED_BLOCK_PREVIEW_LENGTH].replace('\n', ' ') + "..."
+    return block
 
 
 @dataclass
@@ -242,9 +440,12 @@ class EnsembleResult:
         merged_code: The merged solution code
         validation_score: Validation score achieved by the ensemble
         iteration: The iteration number of this ensemble attempt
+        plan_text: Full text of the implemented plan, which new proposals are
+            compared against to reject repeats (empty if unknown)
     """
     
     strategy: str
     merged_code: str
     validation_score: float
     iteration: int
+    plan_text: str = ""
@@ -1,10 +1,27 @@
 """Model factory for creating LLM instances based on configuration."""
 
-from typing import Any
+import hashlib
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional
 from mle_star.models.config import MLEStarConfig
 
 
-def create_model(config: MLEStarConfig) -> Any:
+# Agent responses keyed by hash of model, temperature, system prompt and
+# prompt, least recently used first
+_response_cache: "OrderedDict[str, str]" = OrderedDict()
+
+# Maximum number of agent responses kept in _response_cache
+RESPONSE_CACHE_SIZE = 512
+
+# Model instances keyed by the config fields that identify the endpoint
+_model_cache: dict[tuple[str, str, str, str, bool], Any] = {}
+
+# Idle agents keyed by agent factory and the config fields it consumes
+_agent_pool: dict[tuple, list[Any]] = {}
+
+
+def create_model(config: MLEStarConfig, use_cache: bool = True) -> Any:
     """Create an LLM model instance based on configuration.
     
     Supports:
@@ -13,12 +30,45 @@ def create_model(config: MLEStarConfig) -> Any:
     - AWS Bedrock (Claude, etc.)
     - OpenAI
     
+    Every agent creates its model through here, so the instance is shared
+    across agents with the same provider, model and endpoint. Only the first
+    agent pays for client setup (e.g. the Bedrock session and connection).
+    
     Args:
         config: MLE-STAR configuration with model settings
+        use_cache: Whether to reuse a previously created model instance
         
     Returns:
         Model instance compatible with Strands Agent
     """
+    if not use_cache:
+        return _build_model(config)
+    
+    cache_key = _get_model_cache_key(config)
+    if cache_key not in _model_cache:
+        _model_cache[cache_key] = _build_model(config)
+    return _model_cache[cache_key]
+
+
+def _get_model_cache_key(config: MLEStarConfig) -> tuple[str, str, str, str, bool]:
+    """Generate cache key for a model instance."""
+    return (
+        config.model_provider,
+        config.model_id,
+        config.ollama_base_url,
+        config.lemonade_base_url,
+        config.prompt_caching,
+    )
+
+
+def clear_model_cache() -> None:
+    """Clear the shared model instance cache."""
+    global _model_cache
+    _model_cache = {}
+
+
+def _build_model(config: MLEStarConfig) -> Any:
+    """Build a new LLM model instance for the configured provider."""
     if config.model_provider == "lemonade":
         # Lemonade uses llama.cpp server with OpenAI-compatible API
         try:
@@ -62,6 +112,10 @@ def create_model(config: MLEStarConfig) -> Any:
     elif config.model_provider == "bedrock":
         try:
             from strands.models.bedrock import BedrockModel
+            if config.prompt_caching:
+                # Every agent of a kind sends the same constant system prompt,
+                # so a cache point after it lets Bedrock reuse the prefix
+                return BedrockModel(model_id=config.model_id, cache_prompt="default")
             return BedrockModel(model_id=config.model_id)
         except ImportError:
             return config.model_id
@@ -94,3 +148,190 @@ def get_model_display_name(config: MLEStarConfig) -> str:
     }
     provider = provider_names.get(config.model_provider, config.model_provider)
     return f"{config.model_id} ({provider})"
+
+
+def use_response_cache(config: MLEStarConfig, use_cache: bool = True) -> bool:
+    """Check whether agent responses may be cached and reused.
+    
+    Only answers at temperature 0 are deterministic; a sampled answer
+    replayed for the same prompt would take away the diversity sampling is
+    meant to give (e.g. across parallel refinement runs).
+    
+    Args:
+        config: MLE-STAR configuration the agent was built from
+        use_cache: Whether the caller allows caching
+        
+    Returns:
+        True if responses may be read from and written to the cache
+    """
+    return use_cache and config.temperature == 0
+
+
+def _get_response_cache_key(agent: Any, prompt: str, config: MLEStarConfig) -> str:
+    """Generate cache key for an agent response."""
+    system_prompt = getattr(agent, "system_prompt", None) or ""
+    key_text = "|".join([
+        repr(_get_model_cache_key(config)),
+        repr(config.temperature),
+        system_prompt,
+        prompt,
+    ])
+    return hashlib.sha256(key_text.encode()).hexdigest()
+
+
+def get_cached_response(agent: Any, prompt: str, config: MLEStarConfig) -> Optional[str]:
+    """Look up a cached response for an agent and prompt.
+    
+    Args:
+        agent: Strands Agent the prompt is sent to
+        prompt: Prompt text
+        config: MLE-STAR configuration the agent was built from
+        
+    Returns:
+        Cached response text, or None on a cache miss or if responses are
+        sampled (see use_response_cache)
+    """
+    if not use_response_cache(config):
+        return None
+    cache_key = _get_response_cache_key(agent, prompt, config)
+    response_text = _response_cache.get(cache_key)
+    if response_text is not None:
+        _response_cache.move_to_end(cache_key)
+    return response_text
+
+
+def cache_response(
+    agent: Any,
+    prompt: str,
+    response_text: str,
+    config: MLEStarConfig,
+) -> None:
+    """Store an agent response for later reuse by the same prompt.
+    
+    The least recently used response is evicted once the cache holds
+    RESPONSE_CACHE_SIZE responses. Sampled responses are not stored (see
+    use_response_cache).
+    
+    Args:
+        agent: Strands Agent the prompt was sent to
+        prompt: Prompt text
+        response_text: Response text to cache
+        config: MLE-STAR configuration the agent was built from
+    """
+    if not use_response_cache(config):
+        return
+    cache_key = _get_response_cache_key(agent, prompt, config)
+    _response_cache[cache_key] = response_text
+    _response_cache.move_to_end(cache_key)
+    if len(_response_cache) > RESPONSE_CACHE_SIZE:
+        _response_cache.popitem(last=False)
+
+
+def response_to_text(response: Any) -> str:
+    """Get the text of an agent response.
+    
+    Strings are returned as is and bytes decoded once; response objects
+    exposing their text as ``content`` or ``text`` are read from there
+    rather than stringified, which may add repr noise around the text.
+    
+    Args:
+        response: Agent invocation result or streamed result
+        
+    Returns:
+        Response text
+    """
+    if isinstance(response, str):
+        return response
+    if isinstance(response, bytes):
+        return response.decode("utf-8", errors="replace")
+    for attribute in ("content", "text"):
+        text = getattr(response, attribute, None)
+        if isinstance(text, str):
+            return text
+    return str(response)
+
+
+async def cached_invoke(
+    agent: Any,
+    prompt: str,
+    config: MLEStarConfig,
+    use_cache: bool = True,
+) -> str:
+    """Invoke an agent, reusing the response for an identical prompt.
+    
+    The cache is keyed by the model, temperature, the agent's system prompt
+    and the prompt, so a hit skips the LLM call entirely and a run with
+    another model or temperature never gets this one's answers. Only
+    answers at temperature 0 are cached (see use_response_cache).
+    
+    Args:
+        agent: Strands Agent to invoke
+        prompt: Prompt text
+        config: MLE-STAR configuration the agent was built from
+        use_cache: Whether to use cache
+        
+    Returns:
+        Response text
+    """
+    if use_cache:
+        cached = get_cached_response(agent, prompt, config)
+        if cached is not None:
+            return cached
+    
+    response_text = response_to_text(await agent.invoke_async(prompt))
+    
+    if use_cache:
+        cache_response(agent, prompt, response_text, config)
+    
+    return response_text
+
+
+def clear_response_cache() -> None:
+    """Clear the agent response cache."""
+    global _response_cache
+    _response_cache = OrderedDict()
+
+
+def _get_agent_pool_key(config: MLEStarConfig, create_agent: Callable) -> tuple:
+    """Generate pool key for agents built by a factory from a config."""
+    return (
+        create_agent,
+        *_get_model_cache_key(config),
+        config.temperature,
+        config.max_tokens,
+        config.filter_framework_logs,
+        config.max_concurrent_evals,
+    )
+
+
+@contextmanager
+def pooled_agent(
+    config: MLEStarConfig,
+    create_agent: Callable[[MLEStarConfig], Any],
+) -> Iterator[Any]:
+    """Check out a reusable agent, creating one only when none is idle.
+    
+    Agents are checked out exclusively, so concurrent callers each get
+    their own instance. On return the conversation history is reset, so
+    every checkout starts from a fresh conversation.
+    
+    Args:
+        config: MLE-STAR configuration passed to the factory
+        create_agent: Agent factory, e.g. create_ablation_study_agent
+        
+    Yields:
+        Agent built by create_agent for an equivalent config
+    """
+    idle_agents = _agent_pool.setdefault(_get_agent_pool_key(config, create_agent), [])
+    agent = idle_agents.pop() if idle_agents else create_agent(config)
+    try:
+        yield agent
+    finally:
+        agent.messages = []
+        idle_agents.append(agent)
+
+
+def clear_agent_pool() -> None:
+    """Clear the pool of idle agents."""
+    global _agent_pool
+    _agent_pool = {}
@@ -3,6 +3,8 @@
 from mle_star.tools.execute_python import (
     ExecutionResult,
     execute_python,
+    execute_python_async,
+    filter_framework_logs,
     parse_validation_score,
 )
 from mle_star.tools.web_search import (
@@ -15,6 +17,7 @@ from mle_star.tools.web_search import (
     web_search_with_cache,
     clear_search_cache,
     FALLBACK_MODELS,
+    FALLBACK_CATALOG,
 )
 from mle_star.tools.file_utils import (
     DatasetValidationResult,
@@ -32,6 +35,8 @@ __all__ = [
     # execute_python
     "ExecutionResult",
     "execute_python",
+    "execute_python_async",
+    "filter_framework_logs",
     "parse_validation_score",
     # web_search
     "SearchResult",
@@ -43,6 +48,7 @@ __all__ = [
     "web_search_with_cache",
     "clear_search_cache",
     "FALLBACK_MODELS",
+    "FALLBACK_CATALOG",
     # file_utils
     "DatasetValidationResult",
     "validate_dataset_path",
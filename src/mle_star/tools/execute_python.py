@@ -1,5 +1,6 @@
 """Python code execution tool for MLE-STAR agents."""
 
+import asyncio
 import subprocess
 import sys
 import tempfile
@@ -8,6 +9,8 @@ from dataclasses import dataclass
 from typing import Optional
 from pathlib import Path
 
+from mle_star.tools import worker_pool
+
 
 @dataclass
 class ExecutionResult:
@@ -20,6 +23,31 @@ class ExecutionResult:
     error_message: Optional[str] = None
 
 
+# Informational lines ML frameworks print on every fit; they carry no signal
+# for the agents and only inflate the output returned to them
+_FRAMEWORK_LOG_PATTERN = re.compile(
+    r"^(?:\[LightGBM\] \[(?:Info|Debug)\]|\[XGBoost\]).*(?:\n|$)",
+    re.MULTILINE,
+)
+
+
+def filter_framework_logs(output: str) -> str:
+    """Remove LightGBM/XGBoost informational log lines from execution output.
+    
+    Warnings, errors and the script's own output, including score lines,
+    are kept.
+    
+    Args:
+        output: The stdout from code execution
+        
+    Returns:
+        The output without framework log lines
+    """
+    if "[LightGBM]" not in output and "[XGBoost]" not in output:
+        return output
+    return _FRAMEWORK_LOG_PATTERN.sub("", output)
+
+
 def parse_validation_score(output: str) -> Optional[float]:
     """Parse 'Final Validation Performance:' from execution output.
     
@@ -42,78 +70,194 @@ def parse_validation_score(output: str) -> Optional[float]:
 def execute_python(
     code: str,
     timeout: int = 300,
-    working_dir: Optional[str] = None
+    working_dir: Optional[str] = None,
+    warm_start: bool = True
 ) -> ExecutionResult:
     """Execute Python code in a subprocess with timeout.
     
+    By default the code runs in a process forked from a warm worker that has
+    already imported the common ML libraries, skipping their import cost.
+    
     Args:
         code: Python code to execute
         timeout: Maximum execution time in seconds (default: 300)
         working_dir: Working directory for execution (default: temp dir)
+        warm_start: Whether to run in a warm worker when the platform
+            supports it (default: True)
         
     Returns:
         ExecutionResult containing stdout, stderr, return code, and parsed score
     """
-    # Create a temporary file for the code
-    with tempfile.NamedTemporaryFile(
-        mode='w',
-        suffix='.py',
-        delete=False,
-        encoding='utf-8'
-    ) as f:
-        f.write(code)
-        script_path = f.name
+    script_path = _write_script(code)
     
     try:
         # Determine working directory
         cwd = working_dir if working_dir else Path(script_path).parent
         
         # Execute the script
-        result = subprocess.run(
-            [sys.executable, script_path],
-            capture_output=True,
-            text=True,
-            timeout=timeout,
-            cwd=cwd
-        )
+        stdout, stderr, return_code = _run_script(script_path, timeout, cwd, warm_start)
+        return _execution_result(stdout, stderr, return_code)
         
-        stdout = result.stdout
-        stderr = result.stderr
-        return_code = result.returncode
+    except subprocess.TimeoutExpired:
+        return _failed_result(f"Execution timed out after {timeout} seconds")
+    except Exception as e:
+        return _failed_result(str(e))
+    finally:
+        _remove_script(script_path)
+
+
+async def execute_python_async(
+    code: str,
+    timeout: int = 300,
+    working_dir: Optional[str] = None,
+    warm_start: bool = True
+) -> ExecutionResult:
+    """Execute Python code like execute_python without blocking the event loop.
+    
+    A fresh interpreter is awaited as an asyncio subprocess, so concurrent
+    executions overlap on one event loop. Warm workers are joined with a
+    blocking call, so they are waited on in a thread. Either way, the
+    process is killed if the awaiting task is cancelled.
+    
+    Args:
+        code: Python code to execute
+        timeout: Maximum execution time in seconds (default: 300)
+        working_dir: Working directory for execution (default: temp dir)
+        warm_start: Whether to run in a warm worker when the platform
+            supports it (default: True)
         
-        # Parse validation score from output
-        validation_score = parse_validation_score(stdout)
+    Returns:
+        ExecutionResult containing stdout, stderr, return code, and parsed score
+    """
+    script_path = _write_script(code)
+    
+    try:
+        cwd = working_dir if working_dir else Path(script_path).parent
         
-        return ExecutionResult(
-            stdout=stdout,
-            stderr=stderr,
-            return_code=return_code,
-            validation_score=validation_score,
-            success=(return_code == 0),
-            error_message=stderr if return_code != 0 else None
-        )
+        stdout, stderr, return_code = await _run_script_async(script_path, timeout, cwd, warm_start)
+        return _execution_result(stdout, stderr, return_code)
         
     except subprocess.TimeoutExpired:
-        return ExecutionResult(
-            stdout="",
-            stderr=f"Execution timed out after {timeout} seconds",
-            return_code=-1,
-            validation_score=None,
-            success=False,
-            error_message=f"Execution timed out after {timeout} seconds"
-        )
+        return _failed_result(f"Execution timed out after {timeout} seconds")
     except Exception as e:
-        return ExecutionResult(
-            stdout="",
-            stderr=str(e),
-            return_code=-1,
-            validation_score=None,
-            success=False,
-            error_message=str(e)
-        )
+        return _failed_result(str(e))
     finally:
-        # Clean up temporary file
+        _remove_script(script_path)
+
+
+def _write_script(code: str) -> str:
+    """Write code to a temporary script file and return its path."""
+    with tempfile.NamedTemporaryFile(
+        mode='w',
+        suffix='.py',
+        delete=False,
+        encoding='utf-8'
+    ) as f:
+        f.write(code)
+        return f.name
+
+
+def _remove_script(script_path: str) -> None:
+    """Clean up a temporary script file."""
+    try:
+        Path(script_path).unlink()
+    except OSError:
+        pass
+
+
+def _execution_result(stdout: str, stderr: str, return_code: int) -> ExecutionResult:
+    """Build the result of a script that ran, parsing its validation score."""
+    return ExecutionResult(
+        stdout=stdout,
+        stderr=stderr,
+        return_code=return_code,
+        validation_score=parse_validation_score(stdout),
+        success=(return_code == 0),
+        error_message=stderr if return_code != 0 else None
+    )
+
+
+def _failed_result(message: str) -> ExecutionResult:
+    """Build the result of a script that could not run to completion."""
+    return ExecutionResult(
+        stdout="",
+        stderr=message,
+        return_code=-1,
+        validation_score=None,
+        success=False,
+        error_message=message
+    )
+
+
+def _run_script(
+    script_path: str,
+    timeout: int,
+    cwd: str,
+    warm_start: bool,
+) -> tuple[str, str, int]:
+    """Run a script in a warm worker, or a fresh interpreter otherwise.
+    
+    Returns:
+        Tuple of (stdout, stderr, return code)
+    """
+    if warm_start and worker_pool.is_available():
+        try:
+            return worker_pool.run_script(script_path, timeout, cwd)
+        except subprocess.TimeoutExpired:
+            raise
+        except Exception:
+            # The worker could not be started; run the script cold instead
+            pass
+    
+    result = subprocess.run(
+        [sys.executable, script_path],
+        capture_output=True,
+        text=True,
+        timeout=timeout,
+        cwd=cwd
+    )
+    return result.stdout, result.stderr, result.returncode
+
+
+async def _run_script_async(
+    script_path: str,
+    timeout: int,
+    cwd: str,
+    warm_start: bool,
+) -> tuple[str, str, int]:
+    """Run a script like _run_script, awaiting it instead of blocking.
+    
+    Returns:
+        Tuple of (stdout, stderr, return code)
+    """
+    if warm_start and worker_pool.is_available():
         try:
-            Path(script_path).unlink()
-        except OSError:
+            return await worker_pool.run_script_async(script_path, timeout, cwd)
+        except subprocess.TimeoutExpired:
+            raise
+        except Exception:
+            # The worker could not be started; run the script cold instead
             pass
+    
+    process = await asyncio.create_subprocess_exec(
+        sys.executable,
+        script_path,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        cwd=cwd,
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+    except asyncio.TimeoutError:
+        raise subprocess.TimeoutExpired([sys.executable, script_path], timeout)
+    finally:
+        # Do not leave the script running on timeout or cancellation
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+    
+    return (
+        stdout.decode("utf-8", errors="replace"),
+        stderr.decode("utf-8", errors="replace"),
+        process.returncode,
+    )
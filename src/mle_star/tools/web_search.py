@@ -5,6 +5,7 @@ Includes caching to reduce API calls for identical queries.
 """
 
 import os
+import copy
 import json
 import hashlib
 import time
@@ -19,8 +20,14 @@ from pathlib import Path
 _search_cache: dict[str, tuple[float, "WebSearchResponse"]] = {}
 _CACHE_TTL_SECONDS = 3600  # 1 hour cache
 
+# Cache for model searches keyed by (task_type, data_modality, num_results,
+# api_key, search_engine_id)
+_model_search_cache: dict[
+    tuple[str, str, int, Optional[str], Optional[str]], tuple[float, "WebSearchResponse"]
+] = {}
 
-@dataclass
+
+@dataclass(frozen=True)
 class SearchResult:
     """A single search result with model information."""
     title: str
@@ -392,6 +399,15 @@ model = Wav2Vec2ForSequenceClassification.from_pretrained('facebook/wav2vec2-bas
 }
 
 
+# Flattened (modality, task) -> models lookup, built once at import time.
+# Tuples share the frozen SearchResult entries across every fallback response.
+FALLBACK_CATALOG: dict[tuple[str, str], tuple[SearchResult, ...]] = {
+    (modality, task): tuple(models)
+    for modality, tasks in FALLBACK_MODELS.items()
+    for task, models in tasks.items()
+}
+
+
 def get_fallback_models(
     task_type: str,
     data_modality: str,
@@ -417,16 +433,17 @@ def get_fallback_models(
     elif "regress" in task:
         task = "regression"
     
-    # Get fallback models
-    modality_models = FALLBACK_MODELS.get(modality, FALLBACK_MODELS.get("tabular", {}))
-    task_models = modality_models.get(task, modality_models.get("classification", []))
-    
-    if not task_models:
+    # Get fallback models, defaulting unknown modalities to tabular
+    catalog_modality = modality if modality in FALLBACK_MODELS else "tabular"
+    task_models = (
+        FALLBACK_CATALOG.get((catalog_modality, task))
+        or FALLBACK_CATALOG.get((catalog_modality, "classification"))
         # Ultimate fallback: tabular classification
-        task_models = FALLBACK_MODELS["tabular"]["classification"]
+        or FALLBACK_CATALOG[("tabular", "classification")]
+    )
     
     return WebSearchResponse(
-        results=task_models[:num_results],
+        results=list(task_models[:num_results]),
         query=f"fallback:{modality}:{task}",
         success=True,
         error_message=None
@@ -480,12 +497,15 @@ def search_ml_models_with_fallback(
     data_modality: str,
     num_results: int = 4,
     api_key: Optional[str] = None,
-    search_engine_id: Optional[str] = None
+    search_engine_id: Optional[str] = None,
+    use_cache: bool = True
 ) -> WebSearchResponse:
     """Search for ML models with fallback to curated recommendations.
     
     First attempts Google Custom Search. If that fails, returns curated
     fallback models appropriate for the task type and data modality.
+    Successful searches are cached per (task_type, data_modality, num_results)
+    and credentials, so repeated lookups skip the network round-trip.
     
     Args:
         task_type: Type of ML task
@@ -493,10 +513,22 @@ def search_ml_models_with_fallback(
         num_results: Number of results
         api_key: Google API key
         search_engine_id: Search engine ID
+        use_cache: Whether to use cache
         
     Returns:
         WebSearchResponse with model recommendations
     """
+    # Resolve credentials as web_search does, so another key or engine misses
+    api_key = api_key or os.environ.get("GOOGLE_API_KEY")
+    search_engine_id = search_engine_id or os.environ.get("GOOGLE_SEARCH_ENGINE_ID")
+    cache_key = (task_type, data_modality, num_results, api_key, search_engine_id)
+    
+    # Check cache (copies keep callers from mutating the cached entry)
+    if use_cache and cache_key in _model_search_cache:
+        cached_time, cached_response = _model_search_cache[cache_key]
+        if time.time() - cached_time < _CACHE_TTL_SECONDS:
+            return copy.deepcopy(cached_response)
+    
     # Try web search first
     response = search_ml_models(
         task_type=task_type,
@@ -506,8 +538,10 @@ def search_ml_models_with_fallback(
         search_engine_id=search_engine_id
     )
     
-    # If search succeeded, return results
+    # If search succeeded, cache and return results
     if response.success and response.results:
+        if use_cache:
+            _model_search_cache[cache_key] = (time.time(), copy.deepcopy(response))
         return response
     
     # Fall back to curated models
@@ -518,5 +552,6 @@ def search_ml_models_with_fallback(
 
 def clear_search_cache() -> None:
     """Clear the search results cache."""
-    global _search_cache
+    global _search_cache, _model_search_cache
     _search_cache = {}
+    _model_search_cache = {}
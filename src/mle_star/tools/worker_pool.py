@@ -0,0 +1,235 @@
+"""Warm worker processes for executing generated Python code.
+
+Generated solutions import the same heavy ML libraries on every run, and a
+cold ``python script.py`` pays that import cost each time. Scripts run here
+are forked from a multiprocessing fork server that has already imported
+those libraries, so each run starts warm while still getting a fresh,
+isolated process that can be killed on timeout. The host program's entry
+script is not preloaded, so it need not guard its top-level code, and each
+script gets the host's environment as it is when the script starts.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import runpy
+import subprocess
+import sys
+import tempfile
+import traceback
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Optional
+
+
+# Libraries generated code commonly imports; preloaded once in the fork
+# server (missing ones are skipped)
+WARM_IMPORTS = ("numpy", "pandas", "sklearn", "lightgbm", "xgboost")
+
+# Fork server context, configured on first use
+_context: Optional[Any] = None
+
+
+def is_available() -> bool:
+    """Check whether warm workers are supported on this platform.
+    
+    Returns:
+        True if the fork server start method is available
+    """
+    return "forkserver" in multiprocessing.get_all_start_methods()
+
+
+def _get_context() -> Any:
+    """Get the fork server context, preloading WARM_IMPORTS."""
+    global _context
+    if _context is None:
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload([__name__, *WARM_IMPORTS])
+        _context = context
+    return _context
+
+
+def run_script(script_path: str, timeout: int, cwd: str) -> tuple[str, str, int]:
+    """Run a Python script in a warm worker process.
+    
+    Behaves like ``subprocess.run([sys.executable, script_path])`` with
+    captured output: the script runs as ``__main__`` in its own process,
+    and its stdout, stderr and exit code are returned.
+    
+    Args:
+        script_path: Path to the script to run
+        timeout: Maximum execution time in seconds
+        cwd: Working directory for the script
+    
+    Returns:
+        Tuple of (stdout, stderr, return code)
+    
+    Raises:
+        subprocess.TimeoutExpired: If the script did not finish in time
+    """
+    with tempfile.TemporaryDirectory() as output_dir:
+        process = _start_worker(script_path, output_dir, cwd)
+        process.join(timeout)
+        
+        if process.is_alive():
+            _kill_worker(process)
+            raise subprocess.TimeoutExpired([sys.executable, script_path], timeout)
+        
+        return _read_output(output_dir, process)
+
+
+async def run_script_async(script_path: str, timeout: int, cwd: str) -> tuple[str, str, int]:
+    """Run a Python script in a warm worker process without blocking.
+    
+    Like run_script, but the worker is waited on in a thread, and it is
+    killed if the awaiting task is cancelled.
+    
+    Args:
+        script_path: Path to the script to run
+        timeout: Maximum execution time in seconds
+        cwd: Working directory for the script
+    
+    Returns:
+        Tuple of (stdout, stderr, return code)
+    
+    Raises:
+        subprocess.TimeoutExpired: If the script did not finish in time
+    """
+    with tempfile.TemporaryDirectory() as output_dir:
+        process = _start_worker(script_path, output_dir, cwd)
+        try:
+            await asyncio.to_thread(process.join, timeout)
+        except BaseException:
+            _kill_worker(process)
+            raise
+        
+        if process.is_alive():
+            _kill_worker(process)
+            raise subprocess.TimeoutExpired([sys.executable, script_path], timeout)
+        
+        return _read_output(output_dir, process)
+
+
+def _start_worker(script_path: str, output_dir: str, cwd: str) -> Any:
+    """Start a worker running the script, with its output in output_dir."""
+    process = _get_context().Process(
+        target=_run_script_in_worker,
+        args=(
+            script_path,
+            os.path.join(output_dir, "stdout"),
+            os.path.join(output_dir, "stderr"),
+            str(cwd),
+            list(_get_default_sys_path()),
+            dict(os.environ),
+        ),
+    )
+    process.start()
+    return process
+
+
+@lru_cache(maxsize=1)
+def _get_default_sys_path() -> tuple[str, ...]:
+    """Get the standard library and site directories of a fresh interpreter.
+    
+    Probed once from a new interpreter without PYTHONPATH, whose entries
+    depend on the working directory and are added per run (see
+    _get_python_path). The fork server's own sys.path, with this program's
+    entry directory, is not inherited.
+    """
+    env = {key: value for key, value in os.environ.items() if key != "PYTHONPATH"}
+    try:
+        output = subprocess.run(
+            [sys.executable, "-c", "import sys; print('\\n'.join(sys.path[1:]))"],
+            capture_output=True,
+            text=True,
+            check=True,
+            env=env,
+        ).stdout
+    except (OSError, subprocess.SubprocessError):
+        return tuple(sys.path[1:])
+    return tuple(output.splitlines())
+
+
+def _get_python_path() -> list[str]:
+    """Get the PYTHONPATH entries, made absolute as the interpreter does."""
+    entries = os.environ.get("PYTHONPATH", "").split(os.pathsep)
+    return [os.path.abspath(entry) for entry in entries if entry]
+
+
+def _kill_worker(process: Any) -> None:
+    """Kill a worker if it is still running and wait for it to exit."""
+    if process.is_alive():
+        process.kill()
+    process.join()
+
+
+def _read_output(output_dir: str, process: Any) -> tuple[str, str, int]:
+    """Read the stdout, stderr and exit code of a finished worker."""
+    stdout = Path(output_dir, "stdout").read_text(encoding="utf-8", errors="replace")
+    stderr = Path(output_dir, "stderr").read_text(encoding="utf-8", errors="replace")
+    return stdout, stderr, process.exitcode
+
+
+def _run_script_in_worker(
+    script_path: str,
+    stdout_path: str,
+    stderr_path: str,
+    cwd: str,
+    default_sys_path: list[str],
+    environ: dict[str, str],
+) -> None:
+    """Run a script as __main__ in this (forked) worker process."""
+    # Redirect at the file-descriptor level so output of child processes
+    # started by the script is captured too
+    sys.stdout.flush()
+    sys.stderr.flush()
+    with open(stdout_path, "wb") as stdout_file, open(stderr_path, "wb") as stderr_file:
+        os.dup2(stdout_file.fileno(), 1)
+        os.dup2(stderr_file.fileno(), 2)
+    
+    # The fork server's environment is a snapshot from its start; use the
+    # host's current one, as a cold subprocess would
+    os.environ.clear()
+    os.environ.update(environ)
+    os.chdir(cwd)
+    sys.argv = [script_path]
+    # Start from the sys.path of a cold "python script.py" in cwd
+    script_dir = os.path.dirname(os.path.abspath(script_path))
+    sys.path[:] = [script_dir, *_get_python_path(), *default_sys_path]
+    
+    exit_code = 0
+    try:
+        runpy.run_path(script_path, run_name="__main__")
+    except SystemExit as e:
+        exit_code = _get_exit_code(e)
+    except BaseException as e:
+        traceback.print_exception(type(e), e, _strip_runner_frames(e.__traceback__))
+        exit_code = 1
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+    
+    sys.exit(exit_code)
+
+
+def _strip_runner_frames(tb: Optional[Any]) -> Optional[Any]:
+    """Skip the traceback frames of this module and runpy.
+    
+    What remains starts at the script, as in a traceback printed by a cold
+    ``python script.py``; a syntax error in the script leaves no frames.
+    """
+    # Matched by module, as runpy may be frozen and have no real file name
+    runner_modules = {__name__, runpy.__name__}
+    while tb is not None and tb.tb_frame.f_globals.get("__name__") in runner_modules:
+        tb = tb.tb_next
+    return tb
+
+
+def _get_exit_code(exit: SystemExit) -> int:
+    """Map SystemExit to a process exit code as the interpreter does."""
+    if exit.code is None:
+        return 0
+    if isinstance(exit.code, int):
+        return exit.code
+    print(exit.code, file=sys.stderr)
+    return 1
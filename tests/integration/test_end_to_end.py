@@ -62,6 +62,124 @@ class TestOrchestratorConfiguration:
         assert orchestrator.state is None
 
 
+class TestModelSharing:
+    """Test model instances are shared across agents."""
+    
+    def test_equal_configs_share_one_model(self, monkeypatch):
+        """Test agents with the same endpoint reuse one model instance."""
+        import importlib
+        
+        factory = importlib.import_module("mle_star.models.model_factory")
+        monkeypatch.setattr(factory, "_build_model", lambda config: object())
+        factory.clear_model_cache()
+        
+        first = factory.create_model(MLEStarConfig(temperature=0.2))
+        second = factory.create_model(MLEStarConfig(temperature=0.9))
+        other = factory.create_model(MLEStarConfig(model_id="other-model"))
+        uncached = factory.create_model(MLEStarConfig(), use_cache=False)
+        factory.clear_model_cache()
+        
+        assert first is second
+        assert other is not first
+        assert uncached is not first
+    
+    def test_pooled_agent_is_reused_with_fresh_history(self):
+        """Test pooled agents are reused sequentially and exclusive when nested."""
+        from mle_star.models.model_factory import pooled_agent, clear_agent_pool
+        
+        class FakeAgent:
+            def __init__(self, config):
+                self.messages = []
+        
+        created = []
+        
+        def create_agent(config):
+            created.append(FakeAgent(config))
+            return created[-1]
+        
+        config = MLEStarConfig()
+        clear_agent_pool()
+        with pooled_agent(config, create_agent) as first:
+            first.messages.append({"role": "user"})
+            with pooled_agent(config, create_agent) as concurrent:
+                pass
+        with pooled_agent(config, create_agent) as reused:
+            pass
+        clear_agent_pool()
+        
+        assert concurrent is not first
+        assert len(created) == 2
+        assert reused in created
+        assert first.messages == []
+    
+    def test_response_cache_evicts_least_recently_used(self, monkeypatch):
+        """Test the response cache stays bounded and keeps recently used prompts."""
+        import importlib
+        
+        factory_module = importlib.import_module("mle_star.models.model_factory")
+        monkeypatch.setattr(factory_module, "RESPONSE_CACHE_SIZE", 2)
+        factory_module.clear_response_cache()
+        agent = object()
+        config = MLEStarConfig(temperature=0.0)
+        
+        factory_module.cache_response(agent, "a", "response a", config)
+        factory_module.cache_response(agent, "b", "response b", config)
+        assert factory_module.get_cached_response(agent, "a", config) == "response a"
+        factory_module.cache_response(agent, "c", "response c", config)
+        
+        assert factory_module.get_cached_response(agent, "b", config) is None
+        assert factory_module.get_cached_response(agent, "a", config) == "response a"
+        assert factory_module.get_cached_response(agent, "c", config) == "response c"
+        factory_module.clear_response_cache()
+    
+    def test_response_cache_is_keyed_by_model_and_temperature(self):
+        """Test a cached response is not reused by another model or temperature, or when sampled."""
+        import importlib
+        
+        factory_module = importlib.import_module("mle_star.models.model_factory")
+        factory_module.clear_response_cache()
+        agent = object()
+        config = MLEStarConfig(model_id="model-a", temperature=0.0)
+        
+        factory_module.cache_response(agent, "prompt", "response", config)
+        
+        assert factory_module.get_cached_response(agent, "prompt", config) == "response"
+        assert factory_module.get_cached_response(
+            agent, "prompt", MLEStarConfig(model_id="model-b", temperature=0.0)
+        ) is None
+        assert factory_module.get_cached_response(
+            agent, "prompt", MLEStarConfig(model_id="model-a", temperature=0.7)
+        ) is None
+        # Sampled responses are neither stored nor replayed
+        sampled = MLEStarConfig(model_id="model-a", temperature=0.7)
+        factory_module.cache_response(agent, "prompt", "sampled", sampled)
+        assert factory_module.get_cached_response(agent, "prompt", sampled) is None
+        factory_module.clear_response_cache()
+    
+    def test_response_to_text_reads_text_without_repr(self):
+        """Test response text is taken from strings, bytes and text attributes."""
+        from mle_star.models.model_factory import response_to_text
+        
+        class ContentResponse:
+            content = "```python\nx = 1\n```"
+            
+            def __str__(self):
+                return f"ContentResponse(content={self.content!r}, usage=...)"
+        
+        class MessageResponse:
+            content = [{"text": "not a string"}]
+            
+            def __str__(self):
+                return "message text"
+        
+        text = "plain"
+        
+        assert response_to_text(text) is text
+        assert response_to_text("caf\u00e9".encode()) == "caf\u00e9"
+        assert response_to_text(ContentResponse()) == "```python\nx = 1\n```"
+        assert response_to_text(MessageResponse()) == "message text"
+
+
 class TestTaskDescriptionParsing:
     """Test TaskDescription parsing from text."""
     
@@ -107,6 +225,18 @@ class TestTaskDescriptionParsing:
         assert task.task_type == "multiclass_classification"
         assert task.data_modality == "image"
         assert task.evaluation_metric == "accuracy"
+    
+    def test_parse_keeps_original_description(self):
+        """Test memoized parsing still returns the caller's exact text."""
+        text = "Regression on tabular data. Evaluation metric: MAE"
+        padded = f"\n   {text}\n"
+        
+        task = TaskDescription.parse_from_text(text)
+        padded_task = TaskDescription.parse_from_text(padded)
+        
+        assert padded_task.description == padded
+        assert padded_task.task_type == task.task_type == "regression"
+        assert padded_task.evaluation_metric == task.evaluation_metric == "mae"
 
 
 class TestCheckpointRecovery:
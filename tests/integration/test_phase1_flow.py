@@ -7,7 +7,7 @@ Requirements: 2.1, 3.1, 4.1
 import pytest
 
 from mle_star.models.config import MLEStarConfig
-from mle_star.models.data_models import TaskDescription, ModelCandidate
+from mle_star.models.data_models import TaskDescription, ModelCandidate, CandidateBatch
 from mle_star.graphs.initial_solution import (
     InitialSolutionGraph,
     InitialSolutionState,
@@ -19,8 +19,11 @@ from mle_star.agents.retriever import (
     _extract_code_example,
 )
 from mle_star.agents.candidate_evaluator import (
+    evaluate_all_candidates,
+    clear_evaluation_cache,
     sort_candidates_by_score,
-    _extract_score_from_response,
+    _extract_generated_code,
+    extract_validation_score,
 )
 from mle_star.agents.merger import MergeResult
 
@@ -111,19 +114,425 @@ More text after.
         # None scores should be at the end
         assert sorted_candidates[3].name == "D"
     
+    def test_candidate_batch_score_operations(self):
+        """Test ranking and score statistics on the struct-of-arrays view."""
+        candidates = [
+            ModelCandidate(name="A", description="", example_code="", validation_score=0.7),
+            ModelCandidate(name="B", description="", example_code="", validation_score=None),
+            ModelCandidate(name="C", description="", example_code="", validation_score=0.9),
+            ModelCandidate(name="D", description="", example_code="", validation_score=0.7),
+        ]
+        
+        batch = CandidateBatch.from_list(candidates)
+        
+        assert [c.name for c in batch.ranked()] == ["C", "A", "D", "B"]
+        assert [c.name for c in batch.ranked(descending=False)] == ["A", "D", "C", "B"]
+        assert [c.name for c in batch.top_k(2)] == ["C", "A"]
+        assert batch.top_k(2)[0] is candidates[2]
+        assert batch.mean_score() == pytest.approx(2.3 / 3)
+        assert batch.std_score() == pytest.approx(0.0942809, rel=1e-5)
+        assert CandidateBatch.from_list([]).mean_score() is None
+    
+    def test_evaluate_all_candidates_runs_concurrently_in_order(self, monkeypatch):
+        """Test candidates are evaluated concurrently up to the limit, keeping order."""
+        import asyncio
+        import importlib
+        
+        evaluator_module = importlib.import_module("mle_star.agents.candidate_evaluator")
+        running = 0
+        peak = 0
+        
+        async def fake_evaluate(task, candidate, config, use_cache=True):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            if candidate.name == "broken":
+                raise RuntimeError("evaluation failed")
+            return ModelCandidate(
+                name=candidate.name,
+                description=candidate.description,
+                example_code=None,
+                validation_score=0.5,
+            )
+        
+        monkeypatch.setattr(evaluator_module, "evaluate_candidate", fake_evaluate)
+        
+        task = TaskDescription(
+            description="Test task",
+            task_type="classification",
+            data_modality="tabular",
+            evaluation_metric="accuracy",
+            dataset_path="/data/test.csv",
+        )
+        names = ["a", "broken", "c", "d", "e"]
+        candidates = [ModelCandidate(name=n, description=n, example_code=None) for n in names]
+        config = MLEStarConfig(max_concurrent_evals=2)
+        
+        evaluated = asyncio.run(evaluate_all_candidates(task, candidates, config))
+        
+        assert [c.name for c in evaluated] == names
+        assert evaluated[1].validation_score is None
+        assert evaluated[0].validation_score == 0.5
+        assert peak == 2
+    
+    def test_evaluate_all_candidates_stops_at_score_threshold(self, monkeypatch):
+        """Test remaining evaluations are cancelled once the threshold is reached."""
+        import asyncio
+        import importlib
+        
+        evaluator_module = importlib.import_module("mle_star.agents.candidate_evaluator")
+        scores = {"slow": 0.99, "winner": 0.9, "weak": 0.4, "late": 0.95}
+        delays = {"slow": 0.2, "weak": 0.005, "winner": 0.01, "late": 0.5}
+        
+        async def fake_evaluate(task, candidate, config, use_cache=True):
+            await asyncio.sleep(delays[candidate.name])
+            return ModelCandidate(
+                name=candidate.name,
+                description=candidate.description,
+                example_code=None,
+                validation_score=scores[candidate.name],
+            )
+        
+        monkeypatch.setattr(evaluator_module, "evaluate_candidate", fake_evaluate)
+        
+        task = TaskDescription(
+            description="Test task",
+            task_type="classification",
+            data_modality="tabular",
+            evaluation_metric="accuracy",
+            dataset_path="/data/test.csv",
+        )
+        names = ["slow", "weak", "winner", "late"]
+        candidates = [ModelCandidate(name=n, description=n, example_code=None) for n in names]
+        config = MLEStarConfig(max_concurrent_evals=3)
+        
+        evaluated = asyncio.run(
+            evaluate_all_candidates(task, candidates, config, early_stop_score=0.85)
+        )
+        
+        assert [c.name for c in evaluated] == names
+        assert [c.validation_score for c in evaluated] == [None, 0.4, 0.9, None]
+        
+        # With patience, the next finished evaluation may still win
+        evaluated = asyncio.run(
+            evaluate_all_candidates(task, candidates, config, early_stop_score=0.85, patience=1)
+        )
+        
+        assert [c.validation_score for c in evaluated] == [0.99, 0.4, 0.9, None]
+        
+        # For error metrics the threshold is reached from below
+        task.evaluation_metric = "rmse"
+        evaluated = asyncio.run(
+            evaluate_all_candidates(task, candidates, config, early_stop_score=0.5)
+        )
+        
+        assert [c.validation_score for c in evaluated] == [None, 0.4, None, None]
+    
+    def test_identical_candidates_are_evaluated_once(self, monkeypatch):
+        """Test duplicate and previously scored candidates skip the agent."""
+        import asyncio
+        import importlib
+        
+        evaluator_module = importlib.import_module("mle_star.agents.candidate_evaluator")
+        prompts = []
+        
+        class FakeAgent:
+            async def stream_async(self, prompt):
+                prompts.append(prompt)
+                yield {"result": "Final Validation Performance: 0.9"}
+        
+        monkeypatch.setattr(evaluator_module, "create_candidate_evaluator_agent", lambda config: FakeAgent())
+        clear_evaluation_cache()
+        
+        task = TaskDescription(
+            description="Dedup task",
+            task_type="classification",
+            data_modality="tabular",
+            evaluation_metric="accuracy",
+            dataset_path="/data/test.csv",
+        )
+        candidates = [
+            ModelCandidate(name="xgb", description="boosting", example_code="import xgboost"),
+            ModelCandidate(name="xgb", description="boosting", example_code="import xgboost"),
+            ModelCandidate(name="rf", description="forest", example_code=""),
+        ]
+        config = MLEStarConfig()
+        
+        first = asyncio.run(evaluate_all_candidates(task, candidates, config))
+        second = asyncio.run(evaluate_all_candidates(task, candidates[:1], config))
+        clear_evaluation_cache()
+        
+        assert len(prompts) == 2
+        assert [c.validation_score for c in first] == [0.9, 0.9, 0.9]
+        assert first[0] is not first[1]
+        assert second[0].validation_score == 0.9
+    
+    def test_evaluate_candidate_reuses_pooled_agent(self, monkeypatch):
+        """Test sequential candidate evaluations share one evaluator agent."""
+        import asyncio
+        import importlib
+        from mle_star.agents.candidate_evaluator import evaluate_candidate
+        
+        evaluator_module = importlib.import_module("mle_star.agents.candidate_evaluator")
+        created = []
+        
+        class FakeAgent:
+            async def stream_async(self, prompt):
+                yield {"data": "Final Validation Performance: 0.8"}
+                yield {"result": "Final Validation Performance: 0.8"}
+        
+        def create_agent(config):
+            created.append(FakeAgent())
+            return created[-1]
+        
+        monkeypatch.setattr(evaluator_module, "create_candidate_evaluator_agent", create_agent)
+        clear_evaluation_cache()
+        
+        task = TaskDescription(
+            description="Test task",
+            task_type="classification",
+            data_modality="tabular",
+            evaluation_metric="accuracy",
+            dataset_path="/data/test.csv",
+        )
+        config = MLEStarConfig()
+        
+        for name in ["a", "b", "c"]:
+            candidate = ModelCandidate(name=name, description=name, example_code=None)
+            evaluated = asyncio.run(evaluate_candidate(task, candidate, config))
+            assert evaluated.validation_score == pytest.approx(0.8)
+        clear_evaluation_cache()
+        
+        assert len(created) == 1
+    
+    def test_evaluate_candidate_rejects_unparseable_example_code(self, monkeypatch):
+        """Test broken or empty candidates fail fast without invoking the agent."""
+        import asyncio
+        import importlib
+        from mle_star.agents.candidate_evaluator import evaluate_candidate
+        
+        evaluator_module = importlib.import_module("mle_star.agents.candidate_evaluator")
+        
+        def create_agent(config):
+            raise AssertionError("agent should not be created")
+        
+        monkeypatch.setattr(evaluator_module, "create_candidate_evaluator_agent", create_agent)
+        
+        task = TaskDescription(
+            description="Test task",
+            task_type="classification",
+            data_modality="tabular",
+            evaluation_metric="accuracy",
+            dataset_path="/data/test.csv",
+        )
+        candidates = [
+            ModelCandidate(name="broken", description="RF", example_code="model = RandomForest(("),
+            ModelCandidate(name="empty", description="  ", example_code=None),
+        ]
+        
+        for candidate in candidates:
+            evaluated = asyncio.run(evaluate_candidate(task, candidate, MLEStarConfig()))
+            assert evaluated.name == candidate.name
+            assert evaluated.validation_score is None
+            assert evaluated.generated_code is None
+    
+    def test_generated_scripts_share_the_cores_between_concurrent_runs(self, monkeypatch):
+        """Test script-writing agents are given a per-script thread budget."""
+        import importlib
+        import os
+        
+        evaluator_module = importlib.import_module("mle_star.agents.candidate_evaluator")
+        merger_module = importlib.import_module("mle_star.agents.merger")
+        monkeypatch.setattr(os, "cpu_count", lambda: 16)
+        
+        guidelines = evaluator_module.build_performance_guidelines(MLEStarConfig(max_concurrent_evals=4))
+        
+        assert "n_jobs=4" in guidelines
+        assert "n_jobs=1" in evaluator_module.build_performance_guidelines(
+            MLEStarConfig(max_concurrent_evals=32)
+        )
+        for prompt in (evaluator_module.CANDIDATE_EVAL_SYSTEM_PROMPT, merger_module.MERGER_SYSTEM_PROMPT):
+            assert "n_jobs=-1" not in prompt
+    
+    def test_extract_generated_code_returns_longest_block(self):
+        """Test the longest fenced code block is returned, first on ties."""
+        fence = "`" * 3
+        response = (
+            f"{fence}python\nprint(1)\n{fence}\n"
+            f"{fence}python\nimport numpy as np\nprint(np.pi)\n{fence}\n"
+            f"{fence}\nprint(2)\n{fence}\n"
+        )
+        
+        assert _extract_generated_code(response) == "import numpy as np\nprint(np.pi)"
+        assert _extract_generated_code("no code here") is None
+    
+    def test_stream_evaluation_response_scores_the_code_that_ran(self):
+        """Test the score comes from the tool run, not from streamed code."""
+        import asyncio
+        from mle_star.agents.candidate_evaluator import _stream_evaluation_response
+        
+        fence = "`" * 3
+        chunks = [
+            f"{fence}python\ntry:\n    fit()\nexcept Exception:\n",
+            '    print("Final Validation Performance: -1.0")\n',
+            f"{fence}\n",
+            "Running the code now.",
+        ]
+        tool_output = "Execution successful!\n\nStdout:\nFinal Validation Performance: 0.8731"
+        consumed = []
+        
+        class FakeAgent:
+            async def stream_async(self, prompt):
+                for chunk in chunks:
+                    consumed.append(chunk)
+                    yield {"data": chunk}
+                yield {"message": {"role": "user", "content": [
+                    {"toolResult": {"toolUseId": "1", "content": [{"text": tool_output}]}},
+                ]}}
+                yield {"data": "Done."}
+                yield {"result": "".join(chunks) + "Done."}
+        
+        text, score = asyncio.run(_stream_evaluation_response(FakeAgent(), "prompt"))
+        
+        assert score == pytest.approx(0.8731)
+        assert consumed == chunks
+        assert "fit()" in _extract_generated_code(text)
+    
+    def test_data_file_extraction_finds_provided_and_used_files(self):
+        """Test data files are found in task text and loading calls in one scan each."""
+        from mle_star.agents.data_usage_checker import (
+            extract_data_files_from_task,
+            extract_used_files_from_code,
+            find_missing_files,
+        )
+        
+        task = TaskDescription(
+            description='Files: "train.csv", test.csv, "extra/meta.JSON" and sample_submission.csv',
+            task_type="classification",
+            data_modality="tabular",
+            evaluation_metric="accuracy",
+            dataset_path="/data/train.csv",
+        )
+        code = (
+            'train = pd.read_csv("data/train.csv")\n'
+            "weights = np.loadtxt('weights.txt')\n"
+            'meta = json.load(open("meta.json"))\n'
+            'blob = open("model.bin")\n'
+        )
+        
+        provided = extract_data_files_from_task(task)
+        used = extract_used_files_from_code(code)
+        
+        assert provided == [
+            "train.csv", "test.csv", "extra/meta.JSON", "sample_submission.csv", "/data/train.csv",
+        ]
+        assert used == ["data/train.csv", "weights.txt", "meta.json"]
+        assert find_missing_files(provided, used) == ["test.csv", "sample_submission.csv"]
+    
+    def test_used_files_scan_is_cached_per_code(self, monkeypatch):
+        """Test repeated scans of the same code reuse the first result."""
+        import importlib
+        
+        checker_module = importlib.import_module("mle_star.agents.data_usage_checker")
+        scans = []
+        pattern = checker_module._USED_FILE_PATTERN
+        
+        class CountingPattern:
+            def finditer(self, text):
+                scans.append(text)
+                return pattern.finditer(text)
+        
+        monkeypatch.setattr(checker_module, "_USED_FILE_PATTERN", CountingPattern())
+        checker_module.clear_used_files_cache()
+        code = 'train = pd.read_csv("train.csv")\n'
+        
+        first = checker_module.extract_used_files_from_code(code)
+        first.append("mutated.csv")
+        second = checker_module.extract_used_files_from_code(code)
+        checker_module.extract_used_files_from_code(code, use_cache=False)
+        checker_module.clear_used_files_cache()
+        
+        assert second == ["train.csv"]
+        assert len(scans) == 2
+    
+    def test_auxiliary_csv_is_merged_without_the_agent(self, tmp_path):
+        """Test certain merges are done locally and uncertain ones go to the agent."""
+        import asyncio
+        from mle_star.agents.data_usage_checker import check_data_usage
+        
+        prompts = []
+        
+        class FakeAgent:
+            messages = []
+            
+            async def invoke_async(self, prompt):
+                prompts.append(prompt)
+                return "REVISED_CODE:\n```python\nprint('revised')\n```"
+        
+        (tmp_path / "train.csv").write_text("row,store_id,sales\n1,1,5\n2,2,7\n")
+        (tmp_path / "test.csv").write_text("row,store_id\n3,1\n")
+        (tmp_path / "stores.csv").write_text("store_id,size\n1,big\n2,small\n")
+        task = TaskDescription(
+            description='Use "train.csv", "test.csv" and "stores.csv"; rows share a store_id.',
+            task_type="regression",
+            data_modality="tabular",
+            evaluation_metric="rmse",
+            dataset_path="",
+        )
+        code = (
+            f'train = pd.read_csv("{tmp_path}/train.csv")\n'
+            f'test = pd.read_csv("{tmp_path}/test.csv")\n'
+            "model.fit(train)\n"
+        )
+        
+        def check(code):
+            return asyncio.run(
+                check_data_usage(code, task, MLEStarConfig(), agent=FakeAgent(), use_cache=False)
+            )
+        
+        result = check(code)
+        
+        assert prompts == []
+        assert result.all_files_used
+        assert result.revised_code == (
+            f'train = pd.read_csv("{tmp_path}/train.csv")\n'
+            f"df_stores = pd.read_csv({str(tmp_path / 'stores.csv')!r})\n"
+            'train = train.merge(df_stores, on="store_id", how="left")\n'
+            f'test = pd.read_csv("{tmp_path}/test.csv")\n'
+            'test = test.merge(df_stores, on="store_id", how="left")\n'
+            "model.fit(train)\n"
+        )
+        
+        # A load the pattern cannot follow leaves the other frames unmerged
+        assert check(code.replace('pd.read_csv("', 'pd.read_csv(f"')).revised_code == "print('revised')"
+        
+        # Relative paths do not say which directory the file is in
+        assert check(code.replace(f"{tmp_path}/", "")).revised_code == "print('revised')"
+        
+        # A repeated key would duplicate rows in the left join
+        (tmp_path / "stores.csv").write_text("store_id,size\n1,big\n1,small\n")
+        assert check(code).revised_code == "print('revised')"
+        
+        # No column shared by every file
+        (tmp_path / "stores.csv").write_text("shop,size\n1,big\n2,small\n")
+        assert check(code).revised_code == "print('revised')"
+        assert len(prompts) == 4
+    
     def test_extract_validation_score_from_response(self):
         """Test extraction of validation score from various response formats."""
         # Standard format
         response1 = "Final Validation Performance: 0.8523"
-        assert _extract_score_from_response(response1) == pytest.approx(0.8523)
+        assert extract_validation_score(response1) == pytest.approx(0.8523)
         
         # Alternative format
         response2 = "Validation Score: 0.91"
-        assert _extract_score_from_response(response2) == pytest.approx(0.91)
+        assert extract_validation_score(response2) == pytest.approx(0.91)
         
         # Parsed format from tool output
         response3 = "Parsed Validation Score: 0.7654"
-        assert _extract_score_from_response(response3) == pytest.approx(0.7654)
+        assert extract_validation_score(response3) == pytest.approx(0.7654)
 
 
 class TestInitialSolutionGraphStructure:
@@ -7,6 +7,7 @@ Requirements: 5.1, 6.1, 7.1
 import pytest
 
 from mle_star.models.config import MLEStarConfig
+from mle_star.models.model_factory import clear_response_cache
 from mle_star.models.data_models import (
     TaskDescription,
     SolutionState,
@@ -17,7 +18,14 @@ from mle_star.graphs.refinement import (
     RefinementState,
     RefinementLoopNode,
 )
-from mle_star.agents.ablation_study import parse_ablation_results, AblationResult
+from mle_star.agents.ablation_study import (
+    parse_ablation_results,
+    extract_component_blocks,
+    run_ablation_variations,
+    run_ablation_study,
+    clear_ablation_cache,
+    AblationResult,
+)
 from mle_star.agents.summarizer import parse_ablation_summary, AblationSummary
 from mle_star.agents.extractor import ExtractedBlock
 from mle_star.tools.refinement_utils import select_best_attempt, InnerLoopResult
@@ -59,6 +67,682 @@ Ablation Results:
         assert impacts["normalization"] == pytest.approx(0.05)
         assert impacts["feature_selection"] == pytest.approx(0.03)
     
+    def test_ablation_result_most_impactful_component(self):
+        """Test impacts are mirrored in parallel arrays and ranked by magnitude."""
+        result = AblationResult(
+            baseline_score=0.85,
+            component_impacts={"scaling": 0.02, "feature_engineering": -0.07, "tuning": 0.03},
+            raw_output="",
+            success=True,
+        )
+        
+        assert result.component_names == ("scaling", "feature_engineering", "tuning")
+        assert list(result.impact_array) == [0.02, -0.07, 0.03]
+        assert result.most_impactful_index == 1
+        assert result.most_impactful_component == "feature_engineering"
+        
+        empty = AblationResult(baseline_score=0.0, component_impacts={}, raw_output="", success=False)
+        assert empty.most_impactful_component is None
+    
+    def test_parse_ablation_results_without_keywords(self):
+        """Test responses without result keywords parse to empty results."""
+        assert parse_ablation_results("Traceback: ValueError") == (0.0, {})
+        assert parse_ablation_results("bAsElInE: 0.7")[0] == pytest.approx(0.7)
+    
+    def test_keyword_prescan_matches_full_scan(self):
+        """Test matching only at keyword offsets finds the same results as finditer."""
+        import importlib
+        import re
+        
+        ablation_module = importlib.import_module("mle_star.agents.ablation_study")
+        response = (
+            "[LightGBM] training without early stopping\n" * 50
+            + "BASELINE: 0.91 without\n- Without scaling: 0.85 (impact: 0.06)\n"
+            + "- without Baseline: 0.5\n- Without pca: 0.88\n"
+        )
+        starts = [m.start() for m in re.finditer("baseline|without", response, re.IGNORECASE)]
+        
+        prescanned = list(ablation_module._match_from_starts(response, starts))
+        full = list(ablation_module._ABLATION_RESULT_PATTERN.finditer(response))
+        
+        assert [m.span() for m in prescanned] == [m.span() for m in full]
+    
+    def test_large_outputs_use_re2_when_available(self, monkeypatch):
+        """Test large outputs are scanned with the RE2 pattern and parse the same."""
+        import importlib
+        import re
+        
+        ablation_module = importlib.import_module("mle_star.agents.ablation_study")
+        response = (
+            "[LightGBM] [Warning] no further splits\n" * 1000
+            + "- BASELINE: 0.91\n- without scaling: 0.85 (impact: 0.06)\n"
+        )
+        expected = parse_ablation_results(response)
+        
+        # Stand in for RE2 with the same inline-flag pattern it would compile
+        scanned = []
+        inline_pattern = re.compile("(?i)" + ablation_module._ABLATION_RESULT_REGEX)
+        
+        class FakeRe2Pattern:
+            def finditer(self, text):
+                scanned.append(len(text))
+                return inline_pattern.finditer(text)
+        
+        monkeypatch.setattr(ablation_module, "_get_hyperscan_database", lambda: None)
+        monkeypatch.setattr(ablation_module, "_get_re2_pattern", lambda: FakeRe2Pattern())
+        
+        assert parse_ablation_results(response) == expected
+        assert expected == (pytest.approx(0.91), {"scaling": pytest.approx(0.06)})
+        assert scanned == [len(response)]
+        
+        parse_ablation_results("Baseline: 0.5")
+        assert len(scanned) == 1
+    
+    def test_ablation_code_reloading_data_per_run_is_rejected(self, monkeypatch):
+        """Test single-script studies must read the data once."""
+        import asyncio
+        import importlib
+        
+        ablation_module = importlib.import_module("mle_star.agents.ablation_study")
+        batched = """
+import pandas as pd
+from sklearn.model_selection import train_test_split
+df = pd.read_csv("train.csv")
+X_train, X_val, y_train, y_val = train_test_split(df.drop(columns="y"), df.y)
+for name, model in configs.items():
+    model.fit(X_train, y_train)
+"""
+        per_run = """
+def run(config):
+    df = pd.read_csv("train.csv")
+    X_train, X_val, y_train, y_val = train_test_split(df.drop(columns="y"), df.y)
+    return make_model(config).fit(X_train, y_train).score(X_val, y_val)
+
+for config in configs:
+    print(run(config))
+"""
+        multi_file = """
+frames = [pd.read_csv(path) for path in paths]
+for path in paths:
+    frames.append(pd.read_csv(path))
+model.fit(X, y)
+"""
+        cross_validated = """
+df = pd.read_csv("train.csv")
+for seed in range(5):
+    X_train, X_val, y_train, y_val = train_test_split(X, y, random_state=seed)
+    model.fit(X_train, y_train)
+"""
+        
+        assert not ablation_module._loads_data_in_loop(batched)
+        assert ablation_module._loads_data_in_loop(per_run)
+        assert not ablation_module._loads_data_in_loop(multi_file)
+        assert not ablation_module._loads_data_in_loop(cross_validated)
+        assert not ablation_module._loads_data_in_loop("for x in (:")
+        
+        async def fail_execute(*args, **kwargs):
+            raise AssertionError("rejected code should not run")
+        
+        monkeypatch.setattr(ablation_module, "execute_python_async", fail_execute)
+        output = asyncio.run(ablation_module._run_ablation_code(per_run, 60, filter_logs=True))
+        assert "load the data once" in output
+    
+    def test_extract_component_blocks(self):
+        """Test per-component ablation scripts are extracted by name."""
+        response = """Here is the study.
+
+```python
+# COMPONENT: baseline
+print("Final Validation Performance: 0.9")
+```
+
+```python
+# COMPONENT: scaling
+print("Final Validation Performance: 0.8")
+```
+
+```python
+print("untagged block is ignored")
+```
+"""
+        blocks = extract_component_blocks(response)
+        
+        assert list(blocks) == ["Baseline", "scaling"]
+        assert blocks["scaling"] == 'print("Final Validation Performance: 0.8")'
+    
+    def test_run_ablation_variations_formats_parseable_results(self):
+        """Test concurrently executed variations produce parseable results."""
+        import asyncio
+        
+        blocks = {
+            "Baseline": 'print("Final Validation Performance: 0.9")',
+            "scaling": 'print("Final Validation Performance: 0.7")',
+            "broken": 'raise SystemExit(1)',
+        }
+        
+        results_text = asyncio.run(run_ablation_variations(blocks, timeout=60))
+        baseline, impacts = parse_ablation_results(results_text)
+        
+        assert baseline == pytest.approx(0.9)
+        assert impacts == {"scaling": pytest.approx(0.2)}
+        assert "Without broken: -inf" in results_text
+    
+    def test_run_ablation_study_executes_streamed_component_blocks(self, monkeypatch):
+        """Test component blocks streamed by the agent are executed and scored."""
+        import asyncio
+        import importlib
+        
+        ablation_module = importlib.import_module("mle_star.agents.ablation_study")
+        fence = "`" * 3
+        chunks = [
+            f"{fence}python\n# COMPONENT: Baseline\nprint('Final Validation ",
+            f"Performance: 0.9')\n{fence}\n\n{fence}python\n# COMPONENT: scaling\n",
+            f"print('Final Validation Performance: 0.75')\n{fence}\n",
+        ]
+        
+        class FakeAgent:
+            async def stream_async(self, prompt):
+                for chunk in chunks:
+                    yield {"data": chunk}
+                yield {"result": "".join(chunks)}
+        
+        monkeypatch.setattr(ablation_module, "create_ablation_study_agent", lambda config: FakeAgent())
+        
+        task = TaskDescription(
+            description="Streamed ablation task",
+            task_type="classification",
+            data_modality="tabular",
+            evaluation_metric="accuracy",
+            dataset_path="/data/test.csv",
+        )
+        solution_state = SolutionState(current_code="print('streamed')", validation_score=0.9)
+        
+        result = asyncio.run(run_ablation_study(task, solution_state, MLEStarConfig(), use_cache=False))
+        
+        assert result.success
+        assert result.baseline_score == pytest.approx(0.9)
+        assert result.component_impacts == {"scaling": pytest.approx(0.15)}
+    
+    def test_run_ablation_study_reuses_cached_result(self, monkeypatch):
+        """Test an unchanged prompt does not re-run the ablation agent."""
+        import asyncio
+        import importlib
+        
+        ablation_module = importlib.import_module("mle_star.agents.ablation_study")
+        calls = []
+        
+        class FakeAgent:
+            async def stream_async(self, prompt):
+                calls.append(prompt)
+                yield {"data": "Ablation Results:\n- Baseline: 0.9\n"}
+                yield {"data": "- Without scaling: 0.8 (impact: 0.1)"}
+        
+        monkeypatch.setattr(ablation_module, "create_ablation_study_agent", lambda config: FakeAgent())
+        clear_ablation_cache()
+        clear_response_cache()
+        
+        task = TaskDescription(
+            description="Test task",
+            task_type="classification",
+            data_modality="tabular",
+            evaluation_metric="accuracy",
+            dataset_path="/data/test.csv",
+        )
+        solution_state = SolutionState(current_code="print('test')", validation_score=0.9)
+        config = MLEStarConfig(temperature=0.0)
+        
+        first = asyncio.run(run_ablation_study(task, solution_state, config))
+        second = asyncio.run(run_ablation_study(task, solution_state, config))
+        # A new summary asks the agent to explore other components
+        solution_state.ablation_summaries.append("summary")
+        asyncio.run(run_ablation_study(task, solution_state, config))
+        solution_state.current_code = "print('refined')"
+        asyncio.run(run_ablation_study(task, solution_state, config))
+        
+        assert len(calls) == 3
+        assert "summary" in calls[1]
+        assert second.component_impacts == first.component_impacts
+        assert second is not first
+        
+        # A sampled study is run again rather than replayed
+        sampled = MLEStarConfig(temperature=0.7)
+        for _ in range(2):
+            asyncio.run(run_ablation_study(task, solution_state, sampled))
+        clear_ablation_cache()
+        clear_response_cache()
+        assert len(calls) == 5
+    
+    def test_single_script_ablation_stops_started_blocks(self, monkeypatch):
+        """Test blocks started while streaming are stopped before a single-script study returns."""
+        import asyncio
+        import importlib
+        
+        ablation_module = importlib.import_module("mle_star.agents.ablation_study")
+        fence = "`" * 3
+        response = (
+            f"{fence}python\n# COMPONENT: Baseline\nprint('Final Validation Performance: 0.9')\n{fence}\n"
+            "Ablation Results:\n- Baseline: 0.9\n- Without scaling: 0.8 (impact: 0.1)"
+        )
+        stopped = []
+        
+        class FakeAgent:
+            async def stream_async(self, prompt):
+                yield {"data": response}
+                # Let the baseline block start while the response finishes
+                await asyncio.sleep(0.01)
+                yield {"result": response}
+        
+        async def slow_execute(code, timeout=300):
+            try:
+                await asyncio.sleep(30)
+            except asyncio.CancelledError:
+                stopped.append(code)
+                raise
+        
+        monkeypatch.setattr(ablation_module, "create_ablation_study_agent", lambda config: FakeAgent())
+        monkeypatch.setattr(ablation_module, "execute_python_async", slow_execute)
+        task = TaskDescription(
+            description="Single-script ablation task",
+            task_type="classification",
+            data_modality="tabular",
+            evaluation_metric="accuracy",
+            dataset_path="/data/test.csv",
+        )
+        solution_state = SolutionState(current_code="print('single')", validation_score=0.9)
+        
+        async def run():
+            result = await run_ablation_study(task, solution_state, MLEStarConfig(), use_cache=False)
+            return result, list(stopped)
+        
+        result, stopped_on_return = asyncio.run(run())
+        
+        assert result.component_impacts == {"scaling": pytest.approx(0.1)}
+        assert len(stopped_on_return) == 1
+    
+    def test_run_ablation_study_replays_cached_response(self, monkeypatch):
+        """Test an identical prompt re-executes the cached response without the LLM."""
+        import asyncio
+        import importlib
+        
+        ablation_module = importlib.import_module("mle_star.agents.ablation_study")
+        fence = "`" * 3
+        response = (
+            f"{fence}python\n# COMPONENT: Baseline\nprint('Final Validation Performance: 0.9')\n{fence}\n"
+            f"{fence}python\n# COMPONENT: scaling\nprint('Final Validation Performance: 0.8')\n{fence}\n"
+        )
+        calls = []
+        
+        class FakeAgent:
+            system_prompt = "ablation"
+            
+            async def stream_async(self, prompt):
+                calls.append(prompt)
+                yield {"data": response}
+                yield {"result": response}
+        
+        monkeypatch.setattr(ablation_module, "create_ablation_study_agent", lambda config: FakeAgent())
+        clear_ablation_cache()
+        clear_response_cache()
+        
+        task = TaskDescription(
+            description="Replayed ablation task",
+            task_type="classification",
+            data_modality="tabular",
+            evaluation_metric="accuracy",
+            dataset_path="/data/test.csv",
+        )
+        solution_state = SolutionState(current_code="print('replayed')", validation_score=0.9)
+        
+        config = MLEStarConfig(temperature=0.0)
+        
+        first = asyncio.run(run_ablation_study(task, solution_state, config))
+        clear_ablation_cache()
+        second = asyncio.run(run_ablation_study(task, solution_state, config))
+        clear_ablation_cache()
+        clear_response_cache()
+        
+        assert len(calls) == 1
+        assert second.success
+        assert second.component_impacts == first.component_impacts
+    
+    def test_substitute_code_block_fuzzy_matches_reformatted_block(self):
+        """Test a block with whitespace differences is located and replaced."""
+        from mle_star.agents.coder import substitute_code_block
+        
+        solution = "\n".join([
+            "import pandas as pd",
+            "df = pd.read_csv('train.csv')",
+            "scaler = StandardScaler()   ",
+            "X = scaler.fit_transform(X)",
+            "model = RandomForestClassifier()",
+            "model.fit(X, y)",
+        ])
+        original_block = "scaler = StandardScaler()\nX = scaler.fit_transform(X)\nmodel = RandomForestClassifier()"
+        refined_block = "scaler = RobustScaler()\nX = scaler.fit_transform(X)\nmodel = RandomForestClassifier()\n"
+        
+        updated = substitute_code_block(solution, original_block, refined_block)
+        
+        assert updated.startswith("import pandas as pd\ndf = pd.read_csv('train.csv')\nscaler = RobustScaler()")
+        assert "StandardScaler" not in updated
+        assert "could not locate original" not in updated
+    
+    def test_code_fences_are_paired_without_regex(self):
+        """Test fenced blocks are found in order and other languages skipped."""
+        from mle_star.agents.coder import extract_code_from_response, iter_code_fences
+        
+        response = (
+            "Install first:\n```bash\npip install lightgbm\n```\n"
+            "```python  \nimport lightgbm\nmodel = lightgbm.LGBMRegressor()\n```\n"
+            "```\nprint('done')\n```\n```python\nunclosed = True\n"
+        )
+        
+        assert list(iter_code_fences(response)) == [
+            "import lightgbm\nmodel = lightgbm.LGBMRegressor()\n",
+            "print('done')\n",
+        ]
+        assert extract_code_from_response(response) == (
+            "import lightgbm\nmodel = lightgbm.LGBMRegressor()"
+        )
+    
+    def test_code_block_is_split_and_scanned_once(self):
+        """Test analyzers accept a shared CodeBlock and get the string results."""
+        from mle_star.agents.coder import identify_changes, _find_fuzzy_match
+        from mle_star.agents.data_usage_checker import (
+            _USED_FILE_PATTERN,
+            extract_used_files_from_code,
+        )
+        from mle_star.models.data_models import CodeBlock
+        
+        original = "\nimport pandas as pd\ndf = pd.read_csv('train.csv')\n  model.fit(df)\n"
+        refined = original + "try:\n    log = logging.getLogger()\nexcept ImportError:\n    pass\n"
+        block = CodeBlock(original)
+        
+        assert CodeBlock.of(block) is block
+        assert block.stripped[2] == "df = pd.read_csv('train.csv')"
+        assert block.trimmed_lines[0] == "import pandas as pd"
+        assert block.matches(_USED_FILE_PATTERN) is block.matches(_USED_FILE_PATTERN)
+        
+        assert extract_used_files_from_code(block) == extract_used_files_from_code(original)
+        assert identify_changes(block, CodeBlock(refined)) == identify_changes(original, refined)
+        assert _find_fuzzy_match(CodeBlock(refined), block) == _find_fuzzy_match(refined, original)
+    
+    def test_fuzzy_match_numba_kernel_matches_python_search(self, monkeypatch):
+        """Test the Numba search finds the same offsets as the Python one."""
+        import importlib
+        import random
+        
+        pytest.importorskip("numba")
+        coder_module = importlib.import_module("mle_star.agents.coder")
+        
+        rng = random.Random(0)
+        lines = ["a = 1", "b = 2", "    c = 3", "print(x)", "", "for i in y:", "return z"]
+        for _ in range(200):
+            text = "\n".join(rng.choice(lines) for _ in range(rng.randint(1, 30)))
+            pattern = "\n".join(rng.choice(lines) for _ in range(rng.randint(1, 5)))
+            threshold = rng.choice([0.3, 0.5, 0.8])
+            
+            monkeypatch.setattr(coder_module, "_NUMBA_MIN_LINES", 10**9)
+            expected = coder_module._find_fuzzy_match(text, pattern, threshold)
+            monkeypatch.setattr(coder_module, "_NUMBA_MIN_LINES", 0)
+            
+            assert coder_module._find_fuzzy_match(text, pattern, threshold) == expected
+    
+    def test_refine_code_block_reuses_pooled_agent(self, monkeypatch):
+        """Test sequential refinements share one coder agent."""
+        import asyncio
+        import importlib
+        from mle_star.agents.coder import refine_code_block
+        
+        coder_module = importlib.import_module("mle_star.agents.coder")
+        created = []
+        
+        prompts = []
+        
+        class FakeAgent:
+            messages = []
+            
+            async def invoke_async(self, prompt):
+                prompts.append(prompt)
+                return "```python\nscaler = RobustScaler()\n```"
+        
+        def create_agent(config):
+            created.append(FakeAgent())
+            return created[-1]
+        
+        monkeypatch.setattr(coder_module, "create_coder_agent", create_agent)
+        clear_response_cache()
+        config = MLEStarConfig(temperature=0.0)
+        
+        for plan in ["Use RobustScaler", "Use RobustScaler", "Switch to RobustScaler"]:
+            result = asyncio.run(refine_code_block("scaler = StandardScaler()", plan, config))
+            assert result.success
+            assert result.refined_code == "scaler = RobustScaler()"
+        
+        assert len(created) == 1
+        # The repeated plan is answered from the response cache
+        assert len(prompts) == 2
+        
+        # Sampled answers are never replayed
+        sampled = MLEStarConfig(temperature=0.7)
+        for _ in range(2):
+            asyncio.run(refine_code_block("scaler = StandardScaler()", "Use RobustScaler", sampled))
+        clear_response_cache()
+        assert len(prompts) == 4
+    
+    def test_templated_fast_path_skips_agent_for_simple_plans(self, monkeypatch):
+        """Test swap and parameter plans are applied locally when enabled."""
+        import asyncio
+        import importlib
+        import types
+        from mle_star.agents.coder import refine_code_block
+        
+        coder_module = importlib.import_module("mle_star.agents.coder")
+        prompts = []
+        
+        class FakeAgent:
+            messages = []
+            
+            async def invoke_async(self, prompt):
+                prompts.append(prompt)
+                return "```python\nscaler = QuantileTransformer()\n```"
+        
+        class RobustScaler:
+            def __init__(self, with_centering=True):
+                pass
+        
+        class GradientBoostingRegressor:
+            def __init__(self, n_estimators=100):
+                pass
+        
+        preprocessing = types.SimpleNamespace(
+            RobustScaler=RobustScaler, GradientBoostingRegressor=GradientBoostingRegressor
+        )
+        modules = {"sklearn.preprocessing": preprocessing}
+        monkeypatch.setattr(coder_module, "_import_swap_module", modules.get)
+        monkeypatch.setattr(coder_module, "create_coder_agent", lambda config: FakeAgent())
+        config = MLEStarConfig(temperature=0.789, fast_path_mode="templated")
+        code = (
+            "from sklearn.preprocessing import StandardScaler\n"
+            "scaler = StandardScaler(with_centering=False)\n"
+            "model = LGBMRegressor(n_estimators=100, verbose=-1, C=1.0)"
+        )
+        plan = (
+            "Steps:\n1. Replace StandardScaler with RobustScaler\n"
+            "2. Set n_estimators to 500.\n\nRationale: more trees"
+        )
+        
+        result = asyncio.run(refine_code_block(code, plan, config, use_cache=False))
+        
+        assert prompts == []
+        assert result.success
+        assert result.refined_code == (
+            "from sklearn.preprocessing import RobustScaler\n"
+            "scaler = RobustScaler(with_centering=False)\n"
+            "model = LGBMRegressor(n_estimators=500, verbose=-1, C=1.0)"
+        )
+        
+        # Steps with more than one edit, classes from another module or not
+        # accepting the arguments passed, or steps changing nothing need the agent
+        plans = [
+            "1. Replace StandardScaler with RobustScaler to limit outlier impact",
+            "Set n_estimators to 1000 and C to 0.1",
+            "Swap model for an ensemble of LightGBM and XGBoost",
+            "Replace StandardScaler with MinMaxScaler",
+            "Replace LGBMRegressor with GradientBoostingRegressor",
+            "Replace StandardScaler with GradientBoostingRegressor",
+            "Set learning_rate to 0.05",
+        ]
+        for plan in plans:
+            result = asyncio.run(refine_code_block(code, plan, config, use_cache=False))
+            assert result.refined_code == "scaler = QuantileTransformer()"
+        assert len(prompts) == len(plans)
+        
+        # Only call keywords and the class's names are edited, whatever
+        # their values contain; strings, comments and assignments are kept
+        tricky = (
+            "    from sklearn.preprocessing import StandardScaler\n"
+            "    n_estimators = 100  # n_estimators=100 is the default\n"
+            "    note = \"StandardScaler, n_estimators=10 is good\"\n"
+            "    model = LGBMRegressor(n_estimators=int(n * 2), max_depth=3)\n"
+            "    scaler = StandardScaler()"
+        )
+        plan = "1. Set n_estimators to 500\n2. Replace StandardScaler with RobustScaler"
+        result = asyncio.run(refine_code_block(tricky, plan, config, use_cache=False))
+        assert result.refined_code == (
+            "    from sklearn.preprocessing import RobustScaler\n"
+            "    n_estimators = 100  # n_estimators=100 is the default\n"
+            "    note = \"StandardScaler, n_estimators=10 is good\"\n"
+            "    model = LGBMRegressor(n_estimators=500, max_depth=3)\n"
+            "    scaler = RobustScaler()"
+        )
+        # Values that are not literals, and code that does not parse, need the agent
+        for code_block, plan in [
+            (tricky, "Set n_estimators to auto"),
+            ("model = LGBMRegressor(n_estimators=100", "Set n_estimators to 500"),
+        ]:
+            asyncio.run(refine_code_block(code_block, plan, config, use_cache=False))
+        assert len(prompts) == len(plans) + 2
+        
+        disabled = MLEStarConfig(temperature=0.789)
+        asyncio.run(refine_code_block(code, "Use RobustScaler instead of StandardScaler", disabled, use_cache=False))
+        assert len(prompts) == len(plans) + 3
+    
+    def test_refine_code_block_retries_transient_errors(self, monkeypatch):
+        """Test throttling is retried on the same agent and prompt."""
+        import asyncio
+        import importlib
+        from strands.types.exceptions import ModelThrottledException
+        from mle_star.agents.coder import refine_code_block
+        
+        coder_module = importlib.import_module("mle_star.agents.coder")
+        prompts = []
+        failures = [ModelThrottledException("slow down"), ConnectionError("reset")]
+        
+        class FakeAgent:
+            messages = []
+            
+            async def invoke_async(self, prompt):
+                prompts.append(prompt)
+                if failures:
+                    raise failures.pop(0)
+                return "```python\nscaler = RobustScaler()\n```"
+        
+        created = []
+        
+        def create_agent(config):
+            created.append(FakeAgent())
+            return created[-1]
+        
+        monkeypatch.setattr(coder_module, "create_coder_agent", create_agent)
+        monkeypatch.setattr(coder_module, "REFINE_RETRY_BACKOFF", 0)
+        config = MLEStarConfig(temperature=0.456)
+        
+        result = asyncio.run(refine_code_block("x = 1", "Use RobustScaler", config, use_cache=False))
+        
+        assert result.success
+        assert len(created) == 1
+        assert len(prompts) == 3
+        assert len(set(prompts)) == 1
+        
+        # Other errors and exhausted retries fail the refinement
+        failures.extend([ValueError("bad request"), TimeoutError()])
+        result = asyncio.run(refine_code_block("x = 1", "Use RobustScaler", config, use_cache=False))
+        assert not result.success
+        assert result.error_message == "bad request"
+        
+        failures[:] = [TimeoutError("timed out")] * 3
+        result = asyncio.run(refine_code_block("x = 1", "Use RobustScaler", config, use_cache=False))
+        assert result.error_message == "timed out"
+        assert len(prompts) == 7
+    
+    def test_refine_code_block_stops_streaming_after_code_block(self, monkeypatch):
+        """Test the coder stream is closed once the refined block is complete."""
+        import asyncio
+        import importlib
+        from mle_star.agents.coder import refine_code_block
+        
+        coder_module = importlib.import_module("mle_star.agents.coder")
+        fence = "`" * 3
+        chunks = [f"{fence}py", "thon\nscaler = Robust", "Scaler()\n`", "``", "\n\nThis change", " improves..."]
+        consumed = []
+        
+        class FakeAgent:
+            messages = []
+            
+            async def stream_async(self, prompt):
+                for chunk in chunks:
+                    consumed.append(chunk)
+                    yield {"data": chunk}
+                yield {"result": "".join(chunks)}
+        
+        monkeypatch.setattr(coder_module, "create_coder_agent", lambda config: FakeAgent())
+        
+        result = asyncio.run(refine_code_block(
+            "scaler = StandardScaler()", "Use RobustScaler", MLEStarConfig(temperature=0.456),
+            use_cache=False,
+        ))
+        
+        assert result.success
+        assert result.refined_code == "scaler = RobustScaler()"
+        assert consumed == chunks[:4]
+    
+    def test_refine_code_blocks_batch_runs_concurrently_in_order(self, monkeypatch):
+        """Test batched refinements overlap up to the limit and keep input order."""
+        import asyncio
+        import importlib
+        from mle_star.agents.coder import refine_code_blocks_batch
+        
+        coder_module = importlib.import_module("mle_star.agents.coder")
+        running = 0
+        peak = 0
+        
+        class FakeAgent:
+            messages = []
+            
+            async def invoke_async(self, prompt):
+                nonlocal running, peak
+                running += 1
+                peak = max(peak, running)
+                await asyncio.sleep(0.01)
+                running -= 1
+                if "broken" in prompt:
+                    raise RuntimeError("model unavailable")
+                plan = prompt.split("## Refinement Plan\n")[1].split("\n")[0]
+                return f"```python\n# {plan}\n```"
+        
+        monkeypatch.setattr(coder_module, "create_coder_agent", lambda config: FakeAgent())
+        blocks = [(f"block_{i} = {i}", f"plan {i}", None) for i in range(4)]
+        blocks.append(("x = 1", "broken plan", None))
+        
+        results = asyncio.run(refine_code_blocks_batch(
+            blocks, MLEStarConfig(temperature=0.321), max_concurrency=2, use_cache=False
+        ))
+        
+        assert [r.refined_code for r in results[:4]] == [f"# plan {i}" for i in range(4)]
+        assert results[4].success is False
+        assert results[4].error_message == "model unavailable"
+        assert peak == 2
+    
     def test_parse_ablation_summary_identifies_most_impactful(self):
         """Test that summary parsing identifies the most impactful component."""
         response = """
@@ -256,6 +940,24 @@ class TestRefinementState:
         assert state.outer_iteration == 0
         assert state.completed is False
         assert state.error is None
+    
+    def test_refined_block_previews_track_refined_blocks(self):
+        """Test previews are added for appended blocks and rebuilt on replacement."""
+        solution_state = SolutionState(current_code="print('test')", validation_score=0.8)
+        long_block = "x = 1\n" * 30
+        
+        assert solution_state.refined_block_previews == []
+        
+        solution_state.refined_blocks.append("short\nblock")
+        solution_state.refined_blocks.append(long_block)
+        previews = solution_state.refined_block_previews
+        
+        assert previews[0] == "short\nblock"
+        assert previews[1] == long_block[:100].replace("\n", " ") + "..."
+        
+        solution_state.refined_blocks = ["a", "b", "c"]
+        
+        assert solution_state.refined_block_previews == ["a", "b", "c"]
 
 
 class TestRefinementLoopNode:
@@ -267,6 +969,426 @@ class TestRefinementLoopNode:
         node = RefinementLoopNode(config)
         
         assert node.config.inner_loop_iterations == 3
+    
+    def test_evaluate_solution_uses_debugged_score(self, monkeypatch):
+        """Test failed solutions are debugged and scored from the debug run."""
+        import asyncio
+        import importlib
+        from mle_star.agents.debugger import DebugResult
+        from mle_star.tools.execute_python import ExecutionResult
+        
+        refinement_module = importlib.import_module("mle_star.graphs.refinement")
+        
+        def fake_execute_python(code, timeout=300):
+            return ExecutionResult(stdout="", stderr="NameError", return_code=1)
+        
+        async def fake_debug_with_retries(code, config, dataset_path=""):
+            return DebugResult(
+                success=True,
+                corrected_code="fixed",
+                execution_result=ExecutionResult(
+                    stdout="", stderr="", return_code=0, validation_score=0.91, success=True
+                ),
+                attempts_made=1,
+                error_history=["NameError"],
+            )
+        
+        monkeypatch.setattr(refinement_module, "execute_python", fake_execute_python)
+        monkeypatch.setattr(refinement_module, "debug_with_retries", fake_debug_with_retries)
+        
+        node = RefinementLoopNode(MLEStarConfig())
+        score = asyncio.run(node._evaluate_solution("broken"))
+        
+        assert score == pytest.approx(0.91)
+    
+    def test_debug_prompt_is_stable_across_runs_of_the_same_error(self):
+        """Test run-specific paths and addresses do not change the prompt."""
+        import os
+        import tempfile
+        from mle_star.agents.debugger import build_debug_prompt
+        
+        def traceback_from(script, address):
+            path = os.path.join(tempfile.gettempdir(), script)
+            return (
+                f'Traceback (most recent call last):\n  File "{path}", line 12, in <module>\n'
+                f"TypeError: <lightgbm.basic.Booster object at {address}> is not callable"
+            )
+        
+        first = build_debug_prompt("model()", traceback_from("tmpab12cd34.py", "0x7f3a2c1b9d60"))
+        second = build_debug_prompt("model()", traceback_from("tmpzz98yy76.py", "0x7f11aa22bb30"))
+        retry = build_debug_prompt("model()", traceback_from("tmpzz98yy76.py", "0x1"), [("a", "b")])
+        
+        assert first == second
+        assert 'File "solution.py", line 12' in first
+        assert "Booster object at 0xADDR" in first
+        assert retry.startswith(first.rstrip())
+        assert retry.endswith("Error: b\n")
+    
+    def test_retry_prompts_match_build_debug_prompt(self, monkeypatch):
+        """Test incrementally built retry prompts equal a full rebuild."""
+        import asyncio
+        import importlib
+        import threading
+        from mle_star.tools.execute_python import ExecutionResult
+        
+        debugger_module = importlib.import_module("mle_star.agents.debugger")
+        prompts = []
+        execution_threads = set()
+        
+        class FakeAgent:
+            messages = []
+            
+            async def invoke_async(self, prompt):
+                prompts.append(prompt)
+                return f"```python\nprint({len(prompts)})\n```"
+        
+        def fake_execute_python(code, timeout=300):
+            execution_threads.add(threading.get_ident())
+            return ExecutionResult(stdout="", stderr=f"Error in {code}", return_code=1, success=False)
+        
+        monkeypatch.setattr(debugger_module, "create_debugger_agent", lambda config: FakeAgent())
+        monkeypatch.setattr(debugger_module, "execute_python", fake_execute_python)
+        config = MLEStarConfig(max_debug_retries=3, temperature=0.5)
+        
+        asyncio.run(debugger_module.debug_with_retries("print(x)", config))
+        
+        attempts = [("print(x)", "Error in print(x)"), ("print(1)", "Error in print(1)")]
+        assert prompts == [
+            debugger_module.build_debug_prompt("print(x)", "Error in print(x)"),
+            debugger_module.build_debug_prompt("print(1)", "Error in print(1)", attempts[:1]),
+            debugger_module.build_debug_prompt("print(2)", "Error in print(2)", attempts),
+        ]
+        # Code runs off the event loop thread, which stays free for other runs
+        assert threading.get_ident() not in execution_threads
+    
+    def test_retry_history_keeps_latest_attempt_per_distinct_error(self, monkeypatch):
+        """Test repeated errors are shown once and old attempts are dropped."""
+        import asyncio
+        import importlib
+        from mle_star.tools.execute_python import ExecutionResult
+        
+        debugger_module = importlib.import_module("mle_star.agents.debugger")
+        errors = {
+            "print(x)": "NameError: x",
+            "print(1)": "TypeError: one",
+            "print(2)": "NameError: x",
+            "print(3)": "KeyError: three",
+            "print(4)": "IndexError: four",
+            "print(5)": "ValueError: five",
+            "print(6)": "ZeroDivisionError: six",
+        }
+        prompts = []
+        
+        class FakeAgent:
+            messages = []
+            
+            async def invoke_async(self, prompt):
+                prompts.append(prompt)
+                return f"```python\nprint({len(prompts)})\n```"
+        
+        def fake_execute_python(code, timeout=300):
+            return ExecutionResult(stdout="", stderr=errors[code], return_code=1, success=False)
+        
+        monkeypatch.setattr(debugger_module, "create_debugger_agent", lambda config: FakeAgent())
+        monkeypatch.setattr(debugger_module, "execute_python", fake_execute_python)
+        config = MLEStarConfig(max_debug_retries=6, temperature=0.5)
+        
+        asyncio.run(debugger_module.debug_with_retries("print(x)", config))
+        
+        history = prompts[-1].split("Previous debugging attempts that also failed:\n")[1]
+        assert [line for line in history.splitlines() if line.startswith("Attempt")] == [
+            "Attempt 3:", "Attempt 4:", "Attempt 5:",
+        ]
+        assert history.count("NameError: x") == 1
+        assert "Attempt 1:" not in prompts[-2] and "Attempt 2:" in prompts[-2]
+    
+    def test_fixes_that_already_failed_are_not_rerun(self, monkeypatch):
+        """Test an agent oscillating between two fixes does not rerun them."""
+        import asyncio
+        import importlib
+        from itertools import cycle
+        from mle_star.tools.execute_python import ExecutionResult
+        
+        debugger_module = importlib.import_module("mle_star.agents.debugger")
+        answers = cycle(["print(1)", "print(2)"])
+        executed = []
+        prompts = []
+        
+        class FakeAgent:
+            messages = []
+            
+            async def invoke_async(self, prompt):
+                prompts.append(prompt)
+                return f"```python\n{next(answers)}\n```"
+        
+        def fake_execute_python(code, timeout=300):
+            executed.append(code)
+            return ExecutionResult(stdout="", stderr="NameError", return_code=1, success=False)
+        
+        monkeypatch.setattr(debugger_module, "create_debugger_agent", lambda config: FakeAgent())
+        monkeypatch.setattr(debugger_module, "execute_python", fake_execute_python)
+        config = MLEStarConfig(max_debug_retries=5, temperature=0.5)
+        
+        result = asyncio.run(debugger_module.debug_with_retries("print(x)", config))
+        
+        assert not result.success
+        assert executed == ["print(x)", "print(1)", "print(2)"]
+        # Each repeated fix is added to the history, so no prompt is asked twice
+        assert len(prompts) == 5
+        assert len(set(prompts)) == 5
+        assert prompts[-1].rstrip().endswith("```python\nprint(2)\n```\nError: NameError")
+    
+    def test_trivial_errors_are_fixed_without_the_agent(self, monkeypatch, tmp_path):
+        """Test allowlisted packages and misplaced dataset files skip the debugger agent."""
+        import asyncio
+        import importlib
+        from mle_star.tools.execute_python import ExecutionResult
+        
+        debugger_module = importlib.import_module("mle_star.agents.debugger")
+        data_dir = tmp_path / "input"
+        (data_dir / "raw").mkdir(parents=True)
+        (data_dir / "raw" / "train.csv").write_text("id\n1\n")
+        config = MLEStarConfig(auto_install_packages=True)
+        code = "import sklearn\nopen('train.csv')"
+        errors = iter([
+            "ModuleNotFoundError: No module named 'sklearn.ensemble'",
+            "FileNotFoundError: [Errno 2] No such file or directory: 'train.csv'",
+        ])
+        executed = []
+        
+        class FakeAgent:
+            messages = []
+            
+            async def invoke_async(self, prompt):
+                raise AssertionError("the agent should not be asked")
+        
+        def fake_execute_python(code, timeout=300):
+            executed.append(code)
+            error = next(errors, None)
+            return ExecutionResult(
+                stdout="", stderr=error or "", return_code=1 if error else 0, success=error is None
+            )
+        
+        monkeypatch.setattr(debugger_module, "create_debugger_agent", lambda config: FakeAgent())
+        monkeypatch.setattr(debugger_module, "execute_python", fake_execute_python)
+        
+        result = asyncio.run(
+            debugger_module.debug_with_retries(code, config, dataset_path=str(data_dir))
+        )
+        
+        assert result.success
+        assert result.attempts_made == 2
+        assert "'pip', 'install', 'scikit-learn'" in executed[1].splitlines()[0]
+        assert repr(str(data_dir / "raw" / "train.csv")) in executed[2]
+        
+        trivial_fix = debugger_module._try_trivial_fix
+        missing_sklearn = "ModuleNotFoundError: No module named 'sklearn'"
+        missing_file = "FileNotFoundError: [Errno 2] No such file or directory: 'train.csv'"
+        assert trivial_fix(code, "KeyError: 'target'", config, str(data_dir)) is None
+        # Installs need the opt-in and an allowlisted package
+        assert trivial_fix(code, missing_sklearn, MLEStarConfig(), str(data_dir)) is None
+        assert trivial_fix(
+            code, "ModuleNotFoundError: No module named 'utils'", config, str(data_dir)
+        ) is None
+        # Files are only looked for in the dataset directory, and must be unambiguous
+        assert trivial_fix(code, missing_file, config, None) is None
+        (data_dir / "train.csv").write_text("id\n2\n")
+        assert trivial_fix(code, missing_file, config, str(data_dir)) is None
+    
+    def test_debug_fixes_that_run_persist_across_restarts(self, monkeypatch, tmp_path):
+        """Test a fix that ran is reused from disk after the memory cache is lost."""
+        import asyncio
+        import importlib
+        from mle_star.tools.execute_python import ExecutionResult
+        
+        debugger_module = importlib.import_module("mle_star.agents.debugger")
+        prompts = []
+        
+        class FakeAgent:
+            messages = []
+            system_prompt = "debugger"
+            
+            async def invoke_async(self, prompt):
+                prompts.append(prompt)
+                return "```python\nprint(1)\n```"
+        
+        def fake_execute_python(code, timeout=300):
+            ok = code == "print(1)"
+            return ExecutionResult(
+                stdout="", stderr="" if ok else "NameError", return_code=0 if ok else 1, success=ok
+            )
+        
+        monkeypatch.setattr(debugger_module, "create_debugger_agent", lambda config: FakeAgent())
+        monkeypatch.setattr(debugger_module, "execute_python", fake_execute_python)
+        
+        for temperature in (0.0, 0.0, 0.7):
+            clear_response_cache()
+            config = MLEStarConfig(temperature=temperature, debug_cache_dir=str(tmp_path))
+            result = asyncio.run(debugger_module.debug_with_retries("print(x)", config))
+            assert result.corrected_code == "print(1)"
+        clear_response_cache()
+        
+        assert len(prompts) == 2
+        assert (tmp_path / "debugger.sqlite3").exists()
+    
+    def test_debug_response_without_code_block_drops_explanations(self):
+        """Test explanation lines and leading comments are removed from bare code."""
+        from mle_star.agents.debugger import extract_code_from_debug_response
+        
+        response = (
+            "# Debugger output\n"
+            "Here is the corrected code:\n"
+            "import pandas as pd\n"
+            "# FIX: corrected the column name\n"
+            "df = pd.read_csv('train.csv')\n"
+            "The fix renames the column.\n"
+        )
+        
+        assert extract_code_from_debug_response(response) == (
+            "import pandas as pd\n"
+            "# FIX: corrected the column name\n"
+            "df = pd.read_csv('train.csv')"
+        )
+    
+    def test_debug_sessions_reuse_pooled_debugger_agent(self, monkeypatch):
+        """Test consecutive debugging sessions build the debugger agent once."""
+        import asyncio
+        import importlib
+        from mle_star.models.model_factory import clear_agent_pool
+        from mle_star.tools.execute_python import ExecutionResult
+        
+        debugger_module = importlib.import_module("mle_star.agents.debugger")
+        created = []
+        
+        class FakeAgent:
+            messages = []
+            
+            async def invoke_async(self, prompt):
+                self.messages = self.messages + [prompt]
+                return "```python\nprint(1)\n```"
+        
+        def create_agent(config):
+            created.append(FakeAgent())
+            return created[-1]
+        
+        def fake_execute_python(code, timeout=300):
+            ok = code == "print(1)"
+            return ExecutionResult(
+                stdout="", stderr="" if ok else "NameError", return_code=0 if ok else 1, success=ok
+            )
+        
+        monkeypatch.setattr(debugger_module, "create_debugger_agent", create_agent)
+        monkeypatch.setattr(debugger_module, "execute_python", fake_execute_python)
+        clear_agent_pool()
+        config = MLEStarConfig(temperature=0.5)
+        
+        for code in ("print(x)", "print(y)"):
+            result = asyncio.run(debugger_module.debug_with_retries(code, config))
+            assert result.success
+        fixed, changed = asyncio.run(debugger_module.debug_code("print(z)", "NameError", config))
+        clear_agent_pool()
+        
+        assert (fixed, changed) == ("print(1)", True)
+        assert len(created) == 1
+        assert created[0].messages == []
+    
+    def test_parallel_debug_keeps_first_fix_that_runs(self, monkeypatch):
+        """Test concurrent debug attempts stop once one fix executes."""
+        import asyncio
+        import importlib
+        from mle_star.models.model_factory import clear_agent_pool
+        from mle_star.tools.execute_python import ExecutionResult
+        
+        debugger_module = importlib.import_module("mle_star.agents.debugger")
+        answers = iter([("print('slow')", 0.5), ("print('bad')", 0.0), ("print('ok')", 0.01)])
+        cancelled = []
+        executed = []
+        
+        class FakeAgent:
+            messages = []
+            
+            async def invoke_async(self, prompt):
+                code, delay = next(answers)
+                try:
+                    await asyncio.sleep(delay)
+                except asyncio.CancelledError:
+                    cancelled.append(code)
+                    raise
+                return f"```python\n{code}\n```"
+        
+        def fake_execute_python(code, timeout=300):
+            executed.append(code)
+            ok = code == "print('ok')"
+            return ExecutionResult(
+                stdout="", stderr="" if ok else "NameError", return_code=0 if ok else 1, success=ok
+            )
+        
+        monkeypatch.setattr(debugger_module, "create_debugger_agent", lambda config: FakeAgent())
+        monkeypatch.setattr(debugger_module, "execute_python", fake_execute_python)
+        clear_agent_pool()
+        config = MLEStarConfig(parallel_debug=True, max_debug_retries=3, temperature=0.321)
+        
+        result = asyncio.run(debugger_module.debug_with_retries("print(x)", config))
+        clear_agent_pool()
+        
+        assert result.success
+        assert result.corrected_code == "print('ok')"
+        assert result.attempts_made == 2
+        assert result.error_history == ["NameError", "NameError"]
+        assert executed == ["print(x)", "print('bad')", "print('ok')"]
+        assert cancelled == ["print('slow')"]
+    
+    def test_debug_with_retries_sync_reuses_one_event_loop(self, monkeypatch):
+        """Test synchronous debugging calls share a background event loop."""
+        import asyncio
+        import importlib
+        from mle_star.tools.execute_python import ExecutionResult
+        
+        debugger_module = importlib.import_module("mle_star.agents.debugger")
+        loops = []
+        
+        debug_with_retries = debugger_module.debug_with_retries
+        
+        def fake_execute_python(code, timeout=300):
+            return ExecutionResult(stdout="", stderr="", return_code=0, success=True)
+        
+        async def recording_debug_with_retries(*args, **kwargs):
+            loops.append(asyncio.get_running_loop())
+            return await debug_with_retries(*args, **kwargs)
+        
+        monkeypatch.setattr(debugger_module, "execute_python", fake_execute_python)
+        monkeypatch.setattr(debugger_module, "debug_with_retries", recording_debug_with_retries)
+        
+        for _ in range(2):
+            result = debugger_module.debug_with_retries_sync("print(1)", MLEStarConfig())
+            assert result.success
+        
+        assert loops[0] is loops[1]
+        assert loops[0].is_running()
+    
+    def test_debug_responses_are_cached_only_at_temperature_zero(self):
+        """Test deterministic debugger answers are reused and sampled ones are not."""
+        import asyncio
+        from mle_star.agents.debugger import debug_code
+        
+        prompts = []
+        
+        class FakeAgent:
+            system_prompt = "debugger"
+            messages = []
+            
+            async def invoke_async(self, prompt):
+                prompts.append(prompt)
+                return "```python\nprint(1)\n```"
+        
+        clear_response_cache()
+        for temperature in (0.0, 0.0, 0.7, 0.7):
+            config = MLEStarConfig(temperature=temperature)
+            fixed, changed = asyncio.run(debug_code("print(x)", "NameError", config, FakeAgent()))
+            assert (fixed, changed) == ("print(1)", True)
+        clear_response_cache()
+        
+        assert len(prompts) == 3
 
 
 class TestPhase2Integration:
@@ -77,6 +77,30 @@ Implementation Steps
         assert any("load" in step.lower() for step in plan.implementation_steps)
         assert any("average" in step.lower() for step in plan.implementation_steps)
     
+    def test_parse_ensemble_plan_reads_bold_headers(self):
+        """Test bold, colon-terminated headers are parsed like headings."""
+        response = """
+**Strategy Name:** Stacking
+
+**Description:**
+Use a ridge meta-learner on out-of-fold predictions.
+
+**Implementation Steps:**
+1. Generate OOF predictions with 5 folds
+2. Fit Ridge on the OOF predictions
+
+**Weight Assignment:** Learned by the meta-learner
+"""
+        plan = parse_ensemble_plan(response)
+        
+        assert plan.strategy_name == "Stacking"
+        assert plan.description == "Use a ridge meta-learner on out-of-fold predictions."
+        assert plan.implementation_steps == [
+            "Generate OOF predictions with 5 folds",
+            "Fit Ridge on the OOF predictions",
+        ]
+        assert plan.weight_assignment == "Learned by the meta-learner"
+    
     def test_select_best_ensemble_returns_highest_score(self):
         """Test that select_best_ensemble returns the attempt with highest score."""
         attempts = [
@@ -158,7 +182,369 @@ Implementation Steps
         
         # Should allow different strategy
         assert not is_strategy_similar_to_previous(new_plan, previous_attempts, similarity_threshold=0.8)
-
+    
+    
+    def test_is_strategy_similar_to_previous_ignores_casing_and_plurals(self):
+        """Test near-duplicate strategies differing only in form are detected."""
+        new_plan = EnsemblePlan(
+            strategy_name="Weighted Averages of Model Predictions",
+            description="", implementation_steps=[], weight_assignment=None,
+            expected_benefit="", success=True,
+        )
+        
+        previous_attempts = [
+            EnsembleResult(
+                strategy="strategy: weighted average of model prediction",
+                merged_code="code",
+                validation_score=0.8,
+                iteration=1,
+            ),
+        ]
+        
+        assert is_strategy_similar_to_previous(new_plan, previous_attempts)
+    
+    def test_explore_ensemble_strategies_plans_in_one_call(self, monkeypatch):
+        """Test strategies are proposed together and only missing ones are re-planned."""
+        import asyncio
+        import importlib
+        
+        planner_module = importlib.import_module("mle_star.agents.ensemble_planner")
+        ensembler_module = importlib.import_module("mle_star.agents.ensembler")
+        prompts = []
+        responses = iter([
+            "## Strategy [1]\n### Strategy Name: Soft Voting\n### Implementation Steps\n"
+            "1. Average the class probabilities\n\n"
+            "## Strategy [2]\n### Strategy Name: Stacking\n### Implementation Steps\n"
+            "1. Fit a logistic meta-learner on OOF predictions\n",
+            "### Strategy Name: Rank Average\n### Implementation Steps\n1. Average prediction ranks\n",
+        ])
+        scores = {"Soft Voting": 0.81, "Stacking": 0.84, "Rank Average": 0.82}
+        
+        class FakeAgent:
+            async def invoke_async(self, prompt):
+                prompts.append(prompt)
+                return next(responses)
+        
+        async def fake_implement_ensemble(task, solutions, ensemble_plan, config):
+            return EnsembleImplementationResult(
+                merged_code=ensemble_plan.strategy_name,
+                validation_score=scores[ensemble_plan.strategy_name],
+                strategy_name=ensemble_plan.strategy_name,
+                success=True,
+            )
+        
+        monkeypatch.setattr(planner_module, "create_ensemble_planner_agent", lambda config: FakeAgent())
+        monkeypatch.setattr(ensembler_module, "implement_ensemble", fake_implement_ensemble)
+        task = TaskDescription(
+            description="", task_type="classification", data_modality="tabular",
+            evaluation_metric="accuracy", dataset_path="",
+        )
+        
+        best = asyncio.run(ensembler_module.explore_ensemble_strategies(
+            task, [("a", 0.8), ("b", 0.79)], MLEStarConfig(), num_iterations=3
+        ))
+        
+        assert best.strategy == "Stacking"
+        assert best.iteration == 2
+        assert len(prompts) == 2
+        assert prompts[0].startswith("Propose 3 different ensemble strategies")
+        assert "Previous Ensemble Attempts" in prompts[1]
+    
+    def test_explore_ensemble_strategies_implements_plans_concurrently(self, monkeypatch):
+        """Test planned strategies are implemented concurrently up to the limit."""
+        import asyncio
+        import importlib
+        
+        planner_module = importlib.import_module("mle_star.agents.ensemble_planner")
+        ensembler_module = importlib.import_module("mle_star.agents.ensembler")
+        running = []
+        peak = []
+        
+        strategies = {
+            "Soft Voting": ("Average the class probabilities", 1.0),
+            "Stacking": ("Fit a ridge meta-learner on out-of-fold outputs", 2.0),
+            "Hill Climbing": ("Greedily add models that improve the validation metric", 3.0),
+        }
+        
+        class FakeAgent:
+            async def invoke_async(self, prompt):
+                return "".join(
+                    f"## Strategy [{i}]\n### Strategy Name: {name}\n"
+                    f"### Implementation Steps\n1. {step}\n"
+                    for i, (name, (step, _)) in enumerate(strategies.items(), 1)
+                )
+        
+        async def fake_implement_ensemble(task, solutions, ensemble_plan, config):
+            running.append(ensemble_plan.strategy_name)
+            peak.append(len(running))
+            await asyncio.sleep(0.01)
+            running.remove(ensemble_plan.strategy_name)
+            return EnsembleImplementationResult(
+                merged_code="",
+                validation_score=strategies[ensemble_plan.strategy_name][1],
+                strategy_name=ensemble_plan.strategy_name,
+                success=True,
+            )
+        
+        monkeypatch.setattr(planner_module, "create_ensemble_planner_agent", lambda config: FakeAgent())
+        monkeypatch.setattr(ensembler_module, "implement_ensemble", fake_implement_ensemble)
+        task = TaskDescription(
+            description="", task_type="regression", data_modality="tabular",
+            evaluation_metric="rmse", dataset_path="",
+        )
+        config = MLEStarConfig(ensemble_iterations=3, max_concurrent_evals=2)
+        
+        best = asyncio.run(ensembler_module.explore_ensemble_strategies(task, [("a", 1.0), ("b", 2.0)], config))
+        
+        assert best.strategy == "Hill Climbing"
+        assert best.iteration == 3
+        assert max(peak) == 2
+    
+    def test_explore_ensemble_strategies_replans_repeats_within_a_batch(self, monkeypatch):
+        """Test a near-duplicate in the planned batch is re-planned, not implemented."""
+        import asyncio
+        import importlib
+        from mle_star.models.model_factory import clear_agent_pool
+        
+        planner_module = importlib.import_module("mle_star.agents.ensemble_planner")
+        ensembler_module = importlib.import_module("mle_star.agents.ensembler")
+        average = (
+            "### Strategy Name: Weighted Average\n"
+            "### Description\nAverage the predictions weighted by validation score.\n"
+            "### Implementation Steps\n1. Collect out-of-fold predictions\n"
+            "2. Weight each model by its score\n"
+        )
+        stacking = (
+            "### Strategy Name: Stacking\n"
+            "### Description\nFit a ridge meta-learner on the base model outputs.\n"
+            "### Implementation Steps\n1. Build out-of-fold predictions\n2. Fit a ridge model on them\n"
+        )
+        batch = f"## Strategy [1]\n{average}\n## Strategy [2]\n{average.replace('Average the', 'Average all')}"
+        responses = iter([batch, stacking])
+        prompts = []
+        implemented = []
+        
+        class FakeAgent:
+            messages = []
+            
+            async def invoke_async(self, prompt):
+                prompts.append(prompt)
+                return next(responses)
+        
+        async def fake_implement(task, solutions, ensemble_plan, config):
+            implemented.append(ensemble_plan.strategy_name)
+            return EnsembleImplementationResult(
+                merged_code="merged", validation_score=0.9, strategy_name=ensemble_plan.strategy_name, success=True,
+            )
+        
+        monkeypatch.setattr(planner_module, "create_ensemble_planner_agent", lambda config: FakeAgent())
+        monkeypatch.setattr(ensembler_module, "implement_ensemble", fake_implement)
+        clear_agent_pool()
+        task = TaskDescription(
+            description="", task_type="regression", data_modality="tabular",
+            evaluation_metric="rmse", dataset_path="",
+        )
+        
+        asyncio.run(ensembler_module.explore_ensemble_strategies(
+            task, [("a", 1.0), ("b", 2.0)], MLEStarConfig(), num_iterations=2
+        ))
+        clear_agent_pool()
+        
+        assert implemented == ["Weighted Average", "Stacking"]
+        assert len(prompts) == 2
+        assert "Previous Ensemble Attempts" in prompts[1]
+    
+    def test_repeated_strategies_are_replanned_not_implemented(self, monkeypatch):
+        """Test a strategy repeating a previous attempt is never implemented."""
+        import asyncio
+        import importlib
+        from mle_star.models.model_factory import clear_agent_pool
+        
+        planner_module = importlib.import_module("mle_star.agents.ensemble_planner")
+        ensembler_module = importlib.import_module("mle_star.agents.ensembler")
+        average = (
+            "### Strategy Name: Weighted Average\n"
+            "### Description\nAverage the predictions weighted by validation score.\n"
+            "### Implementation Steps\n1. Collect out-of-fold predictions\n"
+            "2. Weight each model by its score\n"
+        )
+        stacking = (
+            "### Strategy Name: Stacking\n"
+            "### Description\nFit a ridge meta-learner on the base model outputs.\n"
+            "### Implementation Steps\n1. Build out-of-fold predictions\n2. Fit a ridge model on them\n"
+        )
+        responses = iter([average, average, stacking])
+        prompts = []
+        implemented = []
+        
+        class FakeAgent:
+            messages = []
+            
+            async def invoke_async(self, prompt):
+                prompts.append(prompt)
+                return next(responses)
+        
+        async def fake_implement(task, solutions, ensemble_plan, config):
+            implemented.append(ensemble_plan.strategy_name)
+            return EnsembleImplementationResult(
+                merged_code="merged", validation_score=0.9, strategy_name=ensemble_plan.strategy_name, success=True,
+            )
+        
+        monkeypatch.setattr(planner_module, "create_ensemble_planner_agent", lambda config: FakeAgent())
+        monkeypatch.setattr(ensembler_module, "implement_ensemble", fake_implement)
+        clear_agent_pool()
+        task = TaskDescription(
+            description="", task_type="regression", data_modality="tabular",
+            evaluation_metric="rmse", dataset_path="",
+        )
+        config = MLEStarConfig()
+        
+        def run_iteration(previous):
+            return asyncio.run(ensembler_module.run_ensemble_iteration(task, [("a", 1.0)], previous, config))
+        
+        first = run_iteration([])
+        second = run_iteration([first])
+        
+        assert [first.strategy, second.strategy] == ["Weighted Average", "Stacking"]
+        assert implemented == ["Weighted Average", "Stacking"]
+        assert "Do not propose Weighted Average again" in prompts[2]
+        
+        responses = iter([average] * 3)
+        skipped = run_iteration([first, second])
+        clear_agent_pool()
+        
+        assert skipped.validation_score == float("-inf")
+        assert implemented == ["Weighted Average", "Stacking"]
+    
+    def test_ensembler_prompt_truncates_long_solutions(self):
+        """Test long solution code is cut to its head and tail in the prompt."""
+        from mle_star.agents.ensembler import build_ensembler_prompt
+        
+        task = TaskDescription(
+            description="", task_type="regression", data_modality="tabular",
+            evaluation_metric="rmse", dataset_path="",
+        )
+        plan = EnsemblePlan(
+            strategy_name="Average", description="", implementation_steps=["Average the predictions"],
+            weight_assignment=None, expected_benefit="", success=True,
+        )
+        long_code = "import numpy\n" + "x = 1\n" * 1000 + "print(score)"
+        
+        prompt = build_ensembler_prompt(task, [(long_code, 0.5), ("short()", 0.4)], plan, 200)
+        
+        assert "import numpy\n" in prompt and "print(score)" in prompt
+        assert "# ... [truncated] ...\n" in prompt
+        assert "```python\nshort()\n```" in prompt
+        assert len(prompt) < len(long_code)
+        assert long_code in build_ensembler_prompt(task, [(long_code, 0.5)], plan)
+    
+    def test_ensemble_agents_are_reused_across_iterations(self, monkeypatch):
+        """Test planner and ensembler agents are built once for repeated calls."""
+        import asyncio
+        import importlib
+        from mle_star.models.model_factory import clear_agent_pool
+        
+        planner_module = importlib.import_module("mle_star.agents.ensemble_planner")
+        ensembler_module = importlib.import_module("mle_star.agents.ensembler")
+        created = []
+        
+        class FakeAgent:
+            messages = []
+            
+            async def invoke_async(self, prompt):
+                return (
+                    "### Strategy Name: Average\n### Implementation Steps\n1. Average the predictions\n"
+                    "```python\nprint('Final Validation Performance: 0.9')\n```\n"
+                    "Final Validation Performance: 0.9"
+                )
+        
+        def create_planner_agent(config):
+            created.append("planner")
+            return FakeAgent()
+        
+        def create_ensembler_agent(config):
+            created.append("ensembler")
+            return FakeAgent()
+        
+        monkeypatch.setattr(planner_module, "create_ensemble_planner_agent", create_planner_agent)
+        monkeypatch.setattr(ensembler_module, "create_ensembler_agent", create_ensembler_agent)
+        clear_agent_pool()
+        task = TaskDescription(
+            description="", task_type="regression", data_modality="tabular",
+            evaluation_metric="rmse", dataset_path="",
+        )
+        config = MLEStarConfig()
+        
+        for _ in range(2):
+            plan = asyncio.run(planner_module.propose_ensemble_strategy(
+                [("a", 1.0), ("b", 2.0)], "regression", "rmse", [], config
+            ))
+            result = asyncio.run(ensembler_module.implement_ensemble(task, [("a", 1.0)], plan, config))
+            assert result.validation_score == 0.9
+        clear_agent_pool()
+        
+        assert created == ["planner", "ensembler"]
+    
+    def test_ensembler_streams_response_and_parses_score(self):
+        """Test the score is read from the final message and the full code kept."""
+        import asyncio
+        from mle_star.agents.ensembler import implement_ensemble
+        
+        # Streamed chunks of each turn; the result is the final turn's message
+        turns = [
+            ["First try. Final Validation Performance: 0.5\n"],
+            [
+                "Running the ensemble...\nFinal Valid", "ation Performance: 0.8",
+                "75\nDone.\n```python\nprint('merged')\n```",
+            ],
+        ]
+        
+        class StreamingAgent:
+            messages = []
+            
+            async def stream_async(self, prompt):
+                for turn in turns:
+                    for chunk in turn:
+                        yield {"data": chunk}
+                yield {"result": "".join(turns[-1])}
+        
+        task = TaskDescription(
+            description="", task_type="regression", data_modality="tabular",
+            evaluation_metric="rmse", dataset_path="",
+        )
+        plan = EnsemblePlan(
+            strategy_name="Average", description="", implementation_steps=["Average the predictions"],
+            weight_assignment=None, expected_benefit="", success=True,
+        )
+        
+        result = asyncio.run(implement_ensemble(
+            task, [("a", 1.0)], plan, MLEStarConfig(), agent=StreamingAgent()
+        ))
+        
+        assert result.validation_score == 0.875
+        assert result.merged_code == "print('merged')"
+        
+        # A final message without a score is not credited with an earlier turn's
+        turns = [["Final Validation Performance: 0.9\n"], ["The rerun crashed, no score."]]
+        unscored = asyncio.run(implement_ensemble(
+            task, [("a", 1.0)], plan, MLEStarConfig(), agent=StreamingAgent()
+        ))
+        assert unscored.validation_score is None
+    
+    def test_ensembler_score_is_the_last_reported(self):
+        """Test a score reported after a rerun supersedes the first one."""
+        from mle_star.agents.candidate_evaluator import extract_validation_score
+        
+        response = (
+            "Final Validation Performance: 0.71\nFixed the weights and reran.\n"
+            + "log line\n" * 1000
+            + "Parsed Validation Score: 0.83\nThe ensemble beats every solution."
+        )
+        
+        assert extract_validation_score(response) == 0.83
+        assert extract_validation_score(response[:40]) == 0.71
+        assert extract_validation_score(response + "\nfinal validation performance: 0.85") == 0.85
+        assert extract_validation_score("No score was printed.") is None
 
 class TestEnsembleGraphStructure:
     """Test the EnsembleGraph structure and configuration."""
@@ -286,6 +672,27 @@ class TestPhase3Integration:
         assert state.best_result.validation_score == pytest.approx(0.85)
         assert "single" in state.best_result.strategy.lower()
     
+    def test_graph_dedupes_identical_solutions(self):
+        """Test identical solutions collapse to one entry with the best score."""
+        import asyncio
+        from mle_star.agents.ensembler import dedupe_solutions
+        
+        graph = EnsembleGraph(MLEStarConfig())
+        task = TaskDescription(
+            description="Test task",
+            task_type="classification",
+            data_modality="tabular",
+            evaluation_metric="accuracy",
+            dataset_path="/data/test.csv",
+        )
+        
+        state = asyncio.run(graph.run(task=task, solutions=[("a()", 0.8), ("a()", 0.85)]))
+        
+        assert state.best_result is not None
+        assert state.best_result.validation_score == pytest.approx(0.85)
+        assert "single" in state.best_result.strategy.lower()
+        assert dedupe_solutions([("b()", 0.1), ("a()", 0.2), ("b()", 0.3)]) == [("b()", 0.3), ("a()", 0.2)]
+    
     def test_graph_handles_empty_solutions(self):
         """Test that graph handles empty solutions list."""
         import asyncio
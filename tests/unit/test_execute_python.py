@@ -0,0 +1,151 @@
+"""Unit tests for the Python code execution tool."""
+
+import asyncio
+import re
+import time
+
+import pytest
+
+from mle_star.tools import worker_pool
+from mle_star.tools.execute_python import execute_python, execute_python_async, filter_framework_logs
+
+
+@pytest.mark.skipif(
+    not worker_pool.is_available(),
+    reason="warm workers need the forkserver start method",
+)
+class TestWarmExecution:
+    """Tests that warm workers behave like a fresh interpreter."""
+    
+    @pytest.mark.parametrize("code", [
+        'import sys\nprint("Final Validation Performance: 0.75")\nprint("warn", file=sys.stderr)',
+        'import sys\nsys.exit(3)',
+        'import sys\nsys.exit("fatal")',
+        'raise ValueError("boom")',
+        'if __name__ == "__main__":\n    print(__file__.endswith(".py"))',
+        'def fit():\n    raise ValueError("nested")\n\nfit()',
+        'print("unclosed"',
+        'import sys\nprint(sys.path)',
+    ])
+    def test_matches_cold_execution(self, code):
+        """Test output, return code, score and tracebacks match a cold subprocess run."""
+        warm = execute_python(code, timeout=60)
+        cold = execute_python(code, timeout=60, warm_start=False)
+        
+        assert warm.stdout == cold.stdout
+        assert warm.return_code == cold.return_code
+        assert warm.success == cold.success
+        assert warm.validation_score == cold.validation_score
+        assert _mask_script_paths(warm.stderr) == _mask_script_paths(cold.stderr)
+    
+    def test_cancellation_kills_worker(self, tmp_path):
+        """Test cancelling an async warm run stops the script."""
+        _assert_cancellation_kills_script(tmp_path, warm_start=True)
+    
+    def test_sees_environment_changes(self, monkeypatch):
+        """Test a script sees environment changes made after the pool started."""
+        code = 'import os\nprint(os.environ.get("MLE_STAR_TEST_VAR"))'
+        execute_python(code, timeout=60)
+        monkeypatch.setenv("MLE_STAR_TEST_VAR", "set later")
+        
+        result = execute_python(code, timeout=60)
+        
+        assert result.stdout.strip() == "set later"
+    
+    def test_timeout_kills_worker(self):
+        """Test a script exceeding the timeout is reported as timed out."""
+        result = execute_python("import time\ntime.sleep(30)", timeout=1)
+        
+        assert result.success is False
+        assert result.error_message == "Execution timed out after 1 seconds"
+
+
+class TestAsyncExecution:
+    """Tests that async execution behaves like execute_python."""
+    
+    @pytest.mark.parametrize("code", [
+        'import sys\nprint("Final Validation Performance: 0.75")\nprint("warn", file=sys.stderr)',
+        'import sys\nsys.exit(3)',
+    ])
+    def test_matches_sync_execution(self, code):
+        """Test output, return code and score match a blocking run."""
+        result = asyncio.run(execute_python_async(code, timeout=60, warm_start=False))
+        expected = execute_python(code, timeout=60, warm_start=False)
+        
+        assert result == expected
+    
+    def test_concurrent_runs_overlap(self):
+        """Test concurrent executions run at the same time rather than in turn."""
+        async def run_both():
+            return await asyncio.gather(*(
+                execute_python_async("import time\ntime.sleep(2)", timeout=10, warm_start=False)
+                for _ in range(2)
+            ))
+        
+        start = time.monotonic()
+        results = asyncio.run(run_both())
+        
+        assert all(result.success for result in results)
+        assert time.monotonic() - start < 3.5
+    
+    def test_timeout_kills_process(self):
+        """Test a script exceeding the timeout is reported as timed out."""
+        result = asyncio.run(execute_python_async("import time\ntime.sleep(30)", timeout=1, warm_start=False))
+        
+        assert result.success is False
+        assert result.error_message == "Execution timed out after 1 seconds"
+    
+    def test_cancellation_kills_process(self, tmp_path):
+        """Test cancelling an async run stops the script."""
+        _assert_cancellation_kills_script(tmp_path, warm_start=False)
+
+
+def _mask_script_paths(stderr):
+    """Replace the per-run temporary script paths in tracebacks."""
+    return re.sub(r'File "[^"]+\.py"', 'File "<script>"', stderr)
+
+
+def _assert_cancellation_kills_script(tmp_path, warm_start):
+    """Cancel a run of a script that writes a file if it is not killed."""
+    marker = tmp_path / "finished"
+    code = f"import time\ntime.sleep(1.5)\nopen({str(marker)!r}, 'w').close()"
+    
+    async def cancel_run():
+        run = asyncio.create_task(execute_python_async(code, timeout=60, warm_start=warm_start))
+        await asyncio.sleep(0.5)
+        run.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await run
+    
+    asyncio.run(cancel_run())
+    time.sleep(2)
+    
+    assert not marker.exists()
+
+
+class TestFrameworkLogFilter:
+    """Tests for stripping framework log noise from execution output."""
+    
+    def test_removes_info_lines_and_keeps_scores(self):
+        """Test LightGBM info lines are dropped while results are kept."""
+        output = (
+            "[LightGBM] [Info] Number of positive: 50, number of negative: 50\n"
+            "[LightGBM] [Info] Auto-choosing col-wise multi-threading\n"
+            "[LightGBM] [Warning] No further splits with positive gain\n"
+            "Baseline: 0.812000\n"
+            "[XGBoost] training started\n"
+            "Final Validation Performance: 0.812000\n"
+            "[LightGBM] [Info] Start training from score 0.000000"
+        )
+        
+        assert filter_framework_logs(output) == (
+            "[LightGBM] [Warning] No further splits with positive gain\n"
+            "Baseline: 0.812000\n"
+            "Final Validation Performance: 0.812000\n"
+        )
+    
+    def test_output_without_framework_logs_is_unchanged(self):
+        """Test plain output is returned as is."""
+        output = "Baseline: 0.5\nWithout scaling: 0.4"
+        
+        assert filter_framework_logs(output) is output
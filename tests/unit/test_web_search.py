@@ -1,5 +1,7 @@
 """Unit tests for web search tool with fallback functionality."""
 
+import importlib
+
 import pytest
 from mle_star.tools.web_search import (
     SearchResult,
@@ -11,6 +13,7 @@ from mle_star.tools.web_search import (
     web_search_with_cache,
     clear_search_cache,
     FALLBACK_MODELS,
+    FALLBACK_CATALOG,
     _get_cache_key,
 )
 
@@ -167,6 +170,15 @@ class TestGetFallbackModels:
         response = get_fallback_models("classification", "tabular", num_results=2)
         
         assert len(response.results) == 2
+    
+    def test_responses_do_not_share_catalog_list(self):
+        """Test each response gets its own results list backed by the shared catalog."""
+        first = get_fallback_models("regression", "tabular", num_results=4)
+        first.results.clear()
+        second = get_fallback_models("regression", "tabular", num_results=4)
+        
+        assert list(FALLBACK_CATALOG[("tabular", "regression")][:4]) == second.results
+        assert second.results[0] is FALLBACK_MODELS["tabular"]["regression"][0]
 
 
 class TestSearchWithFallback:
@@ -204,6 +216,10 @@ class TestSearchCache:
         """Clear cache before each test."""
         clear_search_cache()
     
+    def teardown_method(self):
+        """Clear cache so cached fakes do not leak into other tests."""
+        clear_search_cache()
+    
     def test_cache_key_generation(self):
         """Test cache key is generated consistently."""
         key1 = _get_cache_key("test query", 4)
@@ -219,6 +235,69 @@ class TestSearchCache:
         """Test cache clearing."""
         # This should not raise any errors
         clear_search_cache()
+    
+    def test_model_search_cache_hit_skips_search(self, monkeypatch):
+        """Test repeated model searches are served from the cache."""
+        web_search_module = importlib.import_module("mle_star.tools.web_search")
+        
+        calls = []
+        
+        def fake_search_ml_models(**kwargs):
+            calls.append(kwargs)
+            return WebSearchResponse(
+                results=[SearchResult(title="Model", url="http://example.com", snippet="Test")],
+                query="q",
+                success=True,
+            )
+        
+        monkeypatch.setattr(web_search_module, "search_ml_models", fake_search_ml_models)
+        
+        first = search_ml_models_with_fallback("classification", "tabular", num_results=1)
+        first.results.clear()
+        second = search_ml_models_with_fallback("classification", "tabular", num_results=1)
+        
+        assert len(calls) == 1
+        assert len(second.results) == 1
+    
+    def test_model_search_cache_is_per_credentials(self, monkeypatch):
+        """Test searches with other credentials do not share cached results."""
+        web_search_module = importlib.import_module("mle_star.tools.web_search")
+        
+        calls = []
+        
+        def fake_search_ml_models(**kwargs):
+            calls.append(kwargs)
+            return WebSearchResponse(
+                results=[SearchResult(title="Model", url="http://example.com", snippet="Test")],
+                query="q",
+                success=True,
+            )
+        
+        monkeypatch.setattr(web_search_module, "search_ml_models", fake_search_ml_models)
+        
+        search_ml_models_with_fallback("classification", "tabular", api_key="a", search_engine_id="cx")
+        search_ml_models_with_fallback("classification", "tabular", api_key="b", search_engine_id="cx")
+        search_ml_models_with_fallback("classification", "tabular", api_key="b", search_engine_id="cx2")
+        search_ml_models_with_fallback("classification", "tabular", api_key="b", search_engine_id="cx2")
+        
+        assert len(calls) == 3
+    
+    def test_model_search_cache_skips_failed_searches(self, monkeypatch):
+        """Test fallback responses are not cached."""
+        web_search_module = importlib.import_module("mle_star.tools.web_search")
+        
+        calls = []
+        
+        def fake_search_ml_models(**kwargs):
+            calls.append(kwargs)
+            return WebSearchResponse(success=False, error_message="offline")
+        
+        monkeypatch.setattr(web_search_module, "search_ml_models", fake_search_ml_models)
+        
+        search_ml_models_with_fallback("classification", "tabular", num_results=2)
+        search_ml_models_with_fallback("classification", "tabular", num_results=2)
+        
+        assert len(calls) == 2
 
 
 class TestWebSearchWithoutCredentials: